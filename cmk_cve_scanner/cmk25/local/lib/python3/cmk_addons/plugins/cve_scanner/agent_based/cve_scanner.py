@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# =============================================================================
+# License: GNU General Public License v2
+#
+# Author: Bernd Holzhauer
+# Date  : 2026-10-19
+# File  : cve_scanner.py
+#
+# Description:
+#   Checkmk check plugin for the per-host summary written by
+#   checkmk_cve_scanner.py ([checkmk_output] mode = spool).
+#   The scanner delivers a precomputed section per host, so no report
+#   files have to be read on the check cycle:
+#
+#       <<<cve_scanner:sep(124)>>>
+#       scan_time|1760850000
+#       total|12
+#       critical|1
+#       high|4
+#       medium|5
+#       low|2
+#       none|0
+#       kev|1
+#       top_cve|CVE-2024-6387|8.1
+#
+#   One service "CVE Scan" per host: findings per severity, CISA KEV
+#   count, top CVE and scan age, each with WARN/CRIT levels (ruleset
+#   cve_scanner_levels).
+# =============================================================================
+
+from typing import Any, Dict, Iterable, Mapping, Optional
+import time
+
+from cmk.agent_based.v2 import (
+    AgentSection,
+    CheckPlugin,
+    CheckResult,
+    DiscoveryResult,
+    Metric,
+    Result,
+    Service,
+    State,
+    StringTable,
+)
+
+SEVERITIES = ("critical", "high", "medium", "low", "none")
+
+
+# ---------------------------------------------------------------------
+# PARSE – key|value lines into a dict
+# ---------------------------------------------------------------------
+def parse_cve_scanner(string_table: StringTable) -> Optional[Mapping[str, Any]]:
+    if not string_table:
+        return None
+
+    section: Dict[str, Any] = {}
+    for line in string_table:
+        if not line or not line[0]:
+            continue
+        key = line[0].strip().lower()
+        if key == "top_cve" and len(line) >= 2:
+            section["top_cve"] = line[1].strip()
+            try:
+                section["top_score"] = float(line[2]) if len(line) > 2 else 0.0
+            except ValueError:
+                section["top_score"] = 0.0
+            continue
+        if len(line) < 2:
+            continue
+        try:
+            section[key] = int(line[1])
+        except ValueError:
+            section[key] = line[1].strip()
+    return section or None
+
+
+agent_section_cve_scanner = AgentSection(
+    name="cve_scanner",
+    parse_function=parse_cve_scanner,
+)
+
+
+# ---------------------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------------------
+def _fmt_age(seconds: float) -> str:
+    seconds = int(max(seconds, 0))
+    days, rest = divmod(seconds, 86400)
+    hours, rest = divmod(rest, 3600)
+    if days:
+        return f"{days}d {hours}h"
+    return f"{hours}h {rest // 60}m"
+
+
+def _eval_upper(value: float, warn: Optional[float], crit: Optional[float]) -> State:
+    """WARN/CRIT if value >= level; a level of 0/None disables it."""
+    if crit and value >= crit:
+        return State.CRIT
+    if warn and value >= warn:
+        return State.WARN
+    return State.OK
+
+
+# ---------------------------------------------------------------------
+# DISCOVERY – one service per host with scanner data
+# ---------------------------------------------------------------------
+def discover_cve_scanner(section: Mapping[str, Any]) -> DiscoveryResult:
+    if section:
+        yield Service()
+
+
+# ---------------------------------------------------------------------
+# CHECK – severity counts, KEV, top CVE and scan age
+# ---------------------------------------------------------------------
+def check_cve_scanner(
+    params: Mapping[str, Any],
+    section: Mapping[str, Any],
+) -> Iterable[CheckResult]:
+    if not section:
+        yield Result(state=State.UNKNOWN, summary="No CVE scanner data available")
+        return
+
+    params = params or {}
+    total  = int(section.get("total", 0))
+
+    # Severity counts – levels only for critical and high by default
+    for sev in SEVERITIES:
+        count = int(section.get(sev, 0))
+        state = _eval_upper(count, params.get(f"{sev}_warn"), params.get(f"{sev}_crit"))
+        if count or state != State.OK:
+            yield Result(state=state, summary=f"{sev.capitalize()}: {count}")
+        yield Metric(f"cve_{sev}", count)
+
+    kev = int(section.get("kev", 0))
+    yield Result(
+        state=_eval_upper(kev, params.get("kev_warn"), params.get("kev_crit")),
+        summary=f"CISA KEV: {kev}" if kev else "No actively exploited CVEs (CISA KEV)",
+    )
+    yield Metric("cve_kev", kev)
+    yield Metric("cve_total", total)
+
+    if section.get("top_cve"):
+        yield Result(
+            state=State.OK,
+            summary=f"Top: {section['top_cve']} (CVSS {section.get('top_score', 0.0)})",
+        )
+    elif not total:
+        yield Result(state=State.OK, summary="No known vulnerabilities")
+
+    scan_time = section.get("scan_time")
+    if isinstance(scan_time, int) and scan_time > 0:
+        age = time.time() - scan_time
+        state = _eval_upper(age, params.get("age_warn"), params.get("age_crit"))
+        yield Result(state=state, summary=f"Scan age: {_fmt_age(age)}")
+        yield Metric("cve_scan_age", age)
+    else:
+        yield Result(state=State.UNKNOWN, summary="Scan time missing")
+
+    yield Result(
+        state=State.OK,
+        notice=f"Findings total: {total}",
+        details="\n".join(
+            f"- {sev.capitalize()}: {int(section.get(sev, 0))}" for sev in SEVERITIES
+        ),
+    )
+
+
+# ---------------------------------------------------------------------
+# REGISTRATION
+# ---------------------------------------------------------------------
+check_plugin_cve_scanner = CheckPlugin(
+    name="cve_scanner",
+    service_name="CVE Scan",
+    discovery_function=discover_cve_scanner,
+    check_function=check_cve_scanner,
+    check_default_parameters={
+        "critical_warn": 1,
+        "critical_crit": 1,
+        "high_warn": 1,
+        "high_crit": 0,            # 0 = no CRIT level
+        "kev_warn": 1,
+        "kev_crit": 1,
+        "age_warn": 2 * 86400,     # 2 days
+        "age_crit": 4 * 86400,     # 4 days
+    },
+    check_ruleset_name="cve_scanner_levels",
+)
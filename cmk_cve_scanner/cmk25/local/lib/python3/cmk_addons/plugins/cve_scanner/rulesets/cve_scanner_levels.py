@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Checkmk Rulesets API v1 – CVE Scanner levels (findings per severity, KEV, scan age)
+
+from cmk.rulesets.v1 import Title, Help
+from cmk.rulesets.v1.rule_specs import (
+    CheckParameters,
+    HostCondition,
+    Topic,
+)
+from cmk.rulesets.v1.form_specs import (
+    Dictionary,
+    DictElement,
+    Integer,
+    DefaultValue,
+)
+
+# --------------------------------------------------------------------
+# TOPIC
+# --------------------------------------------------------------------
+def _topic() -> Topic:
+    return Topic.OPERATING_SYSTEM
+
+
+def _count(title: str, help_text: str, default: int) -> DictElement:
+    return DictElement(
+        required=True,
+        parameter_form=Integer(
+            title=Title(title),
+            help_text=Help(help_text),
+            prefill=DefaultValue(default),
+        ),
+    )
+
+
+# --------------------------------------------------------------------
+# PARAMETER FORM
+# --------------------------------------------------------------------
+def _parameter_form() -> Dictionary:
+    return Dictionary(
+        title=Title("Thresholds for CVE Scan"),
+        help_text=Help(
+            "WARN/CRIT when a host has at least this many findings of a "
+            "severity, actively exploited CVEs (CISA KEV) or when the last "
+            "scan is too old. A value of 0 disables the level."
+        ),
+        elements={
+            "critical_warn": _count("Critical findings: warning at", "WARN if critical findings >= this value.", 1),
+            "critical_crit": _count("Critical findings: critical at", "CRIT if critical findings >= this value.", 1),
+            "high_warn": _count("High findings: warning at", "WARN if high findings >= this value.", 1),
+            "high_crit": _count("High findings: critical at", "CRIT if high findings >= this value.", 0),
+            "medium_warn": _count("Medium findings: warning at", "WARN if medium findings >= this value.", 0),
+            "medium_crit": _count("Medium findings: critical at", "CRIT if medium findings >= this value.", 0),
+            "kev_warn": _count("CISA KEV: warning at", "WARN if actively exploited CVEs >= this value.", 1),
+            "kev_crit": _count("CISA KEV: critical at", "CRIT if actively exploited CVEs >= this value.", 1),
+            "age_warn": DictElement(
+                required=True,
+                parameter_form=Integer(
+                    title=Title("Scan age: warning at (seconds)"),
+                    help_text=Help("WARN if the last scan is older than this."),
+                    prefill=DefaultValue(2 * 86400),  # 2 days
+                    unit_symbol="s",
+                ),
+            ),
+            "age_crit": DictElement(
+                required=True,
+                parameter_form=Integer(
+                    title=Title("Scan age: critical at (seconds)"),
+                    help_text=Help("CRIT if the last scan is older than this."),
+                    prefill=DefaultValue(4 * 86400),  # 4 days
+                    unit_symbol="s",
+                ),
+            ),
+        },
+    )
+
+
+# --------------------------------------------------------------------
+# REGISTRATION
+# --------------------------------------------------------------------
+rule_spec_cve_scanner_levels = CheckParameters(
+    name="cve_scanner_levels",                  # MUST MATCH check_ruleset_name
+    title=Title("CVE Scan – findings, CISA KEV and scan age"),
+    topic=_topic(),
+    parameter_form=_parameter_form,
+    condition=HostCondition(),
+)
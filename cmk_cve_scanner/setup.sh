@@ -235,7 +235,7 @@ min_cvss_score = 0.0
 
 [cache]
 enabled   = true
-file      = /var/cache/cve_scanner/api_cache.json
+file      = /var/cache/cve_scanner/api_cache.sqlite
 ttl_hours = 24
 
 [package_map]
@@ -293,14 +293,14 @@ fi
 # ── 8. Cache-Datei vorbereiten ────────────────────────────────────────────────
 section "Cache"
 
-cache_file="$CACHE_DIR/api_cache.json"
+cache_file="$CACHE_DIR/api_cache.sqlite"
 if [[ -f "$cache_file" ]]; then
     info "Cache-Datei existiert bereits: $cache_file"
 else
     if ! $DRY_RUN; then
-        echo '{}' > "$cache_file"
+        touch "$cache_file"   # leere Datei = leere SQLite-DB
     else
-        dry "echo '{}' > '$cache_file'"
+        dry "touch '$cache_file'"
     fi
     run "chmod 640 '$cache_file'"
     run "chown '$SCANNER_USER':'$SCANNER_USER' '$cache_file'"
@@ -387,7 +387,7 @@ echo "  $SCANNER_DIR/checkmk_cve_scanner.py   (750, root:$SCANNER_USER)"
 echo "  $CONFIG_DIR/scanner.conf              (640, root:$SCANNER_USER)"
 echo "  $CONFIG_DIR/package_map_custom.json   (640, root:$SCANNER_USER)"
 echo "  $LOG_DIR/scanner.log                  (644, $SCANNER_USER:$SCANNER_USER)"
-echo "  $CACHE_DIR/api_cache.json             (640, $SCANNER_USER:$SCANNER_USER)"
+echo "  $CACHE_DIR/api_cache.sqlite           (640, $SCANNER_USER:$SCANNER_USER)"
 echo "  /etc/cron.d/cve_scanner               (644, root:root)"
 echo ""
 echo -e "${BOLD}Verzeichnisse:${NC}"
@@ -26,15 +26,28 @@ import ast
 import configparser
 import csv
 import gzip
+import hashlib
 import json
 import logging
 import os
+import random
+import re
+import sqlite3
 import sys
+import tempfile
+import threading
 import time
-from dataclasses import asdict, dataclass, field
-from datetime import datetime
+import zipfile
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import cmp_to_key, partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+from urllib.parse import quote, urlsplit
 
 import requests
 
@@ -54,17 +67,32 @@ log = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 OMD_ROOT        = Path("/omd/sites")
-NVD_DELAY_NO_KEY  = 6.5
-NVD_DELAY_WITH_KEY = 0.7
+HTTP_POOL_SIZE      = 16    # Verbindungen je Host (≥ größter Worker-Pool)
+HTTP_RETRIES        = 3     # Wiederholungen bei 429/5xx/Verbindungsfehlern
+HTTP_BACKOFF        = 1.0   # Sekunden, verdoppelt je Versuch (+ Jitter)
+HTTP_MAX_BACKOFF    = 120.0 # Obergrenze, auch für Retry-After
+HTTP_USER_AGENT     = "checkmk-cve-scanner/4.0"
+
+NVD_RATE_NO_KEY     = 5     # Requests je NVD_RATE_WINDOW ohne API-Key
+NVD_RATE_WITH_KEY   = 50    # Requests je NVD_RATE_WINDOW mit API-Key
+NVD_RATE_WINDOW     = 30.0  # Sekunden (rollierendes Fenster laut NVD)
+NVD_WORKERS         = 4     # parallele NVD-Abfragen (teilen sich das Limit)
+NVD_PAGE_SIZE       = 2000  # Maximum der CVE-API 2.0 pro Seite
+NVD_SYNC_WINDOW    = 120    # max. Tage zwischen lastModStartDate und -EndDate
+INV_CHUNK_SIZE      = 256 * 1024   # Lese-Blockgröße des Subtree-Loaders (Zeichen)
+
 OSV_QUERYBATCH_URL  = "https://api.osv.dev/v1/querybatch"
 OSV_VULNS_URL       = "https://api.osv.dev/v1/vulns"
 OSV_BATCH_SIZE      = 100
+OSV_DETAIL_WORKERS  = 8     # parallele GET /v1/vulns/<id>
+OSV_DUMP_URL        = "https://osv-vulnerabilities.storage.googleapis.com"
 
 OSS_INDEX_URL       = "https://ossindex.sonatype.org/api/v3/component-report"
 OSS_INDEX_BATCH     = 128   # max. Pakete pro Request laut API-Doku
+OSS_WORKERS         = 2     # parallele Batch-Requests (Rate-Limit beachten)
 
 CISA_KEV_URL        = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
-CISA_KEV_CACHE_TTL  = 3600  # Sekunden – Feed wird max. 1x pro Stunde neu geladen
+CISA_KEV_CACHE_TTL  = 3600  # Sekunden – Feed wird max. 1x pro Stunde geprüft (bedingt, 304)
 
 # Pakettyp / OS-Name → OSV Ecosystem
 OSV_ECOSYSTEM_MAP: dict[str, str] = {
@@ -314,6 +342,191 @@ PACKAGE_NAME_MAP: dict[str, tuple[str, Optional[str]]] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Binär- → Quell-Paket
+# ---------------------------------------------------------------------------
+# Debian/Ubuntu bauen aus einem Quell-Paket viele Binär-Pakete (openssl →
+# openssl, libssl3, libssl-dev, ...). Advisories gelten für das Quell-Paket,
+# OSV führt Debian/Ubuntu/Alpine sogar nur unter dem Quell-Namen. Der Scanner
+# fragt deshalb je (Quell-Paket, Version) einmal ab und verteilt die
+# Ergebnisse auf alle Binär-Pakete.
+#
+# Vorrang hat die Quelle aus dem Inventory (Spalte "source"), sonst gilt
+# dieses Mapping (erweiterbar per Package-Map-Datei, Schlüssel
+# "source_packages"), sonst die Regeln unten, sonst der Binär-Name.
+# ---------------------------------------------------------------------------
+
+SOURCE_PACKAGE_MAP: dict[str, str] = {
+    # Krypto / TLS
+    "libssl3":                  "openssl",
+    "libssl3t64":               "openssl",
+    "libssl1.1":                "openssl",
+    "libssl-dev":               "openssl",
+    "openssl-provider-legacy":  "openssl",
+    "libgnutls30":              "gnutls28",
+    "libgnutls30t64":           "gnutls28",
+    "libgcrypt20":              "libgcrypt20",
+    "libgpg-error0":            "libgpg-error",
+    "libnettle8":               "nettle",
+    "libhogweed6":              "nettle",
+    "libgmp10":                 "gmp",
+    "libp11-kit0":              "p11-kit",
+    "libtasn1-6":               "libtasn1-6",
+    "libkrb5-3":                "krb5",
+    "libkrb5support0":          "krb5",
+    "libk5crypto3":             "krb5",
+    "libgssapi-krb5-2":         "krb5",
+    "libsasl2-2":               "cyrus-sasl2",
+    "libsasl2-modules-db":      "cyrus-sasl2",
+    "libsasl2-modules":         "cyrus-sasl2",
+    "openssh-client":           "openssh",
+    "openssh-server":           "openssh",
+    "openssh-sftp-server":      "openssh",
+    "libssh2-1":                "libssh2",
+    "libssh-4":                 "libssh",
+    # glibc / Toolchain
+    "libc6":                    "glibc",
+    "libc-bin":                 "glibc",
+    "libc-l10n":                "glibc",
+    "libc6-dev":                "glibc",
+    "libc-dev-bin":             "glibc",
+    "locales":                  "glibc",
+    "locales-all":              "glibc",
+    # libstdc++6 / libgcc-s1 stammen je nach Release aus gcc-10 … gcc-14 –
+    # ohne Inventory-Spalte "source" bleiben sie beim Binär-Namen
+    # systemd / Basis-System
+    "libsystemd0":              "systemd",
+    "libsystemd-shared":        "systemd",
+    "libudev1":                 "systemd",
+    "udev":                     "systemd",
+    "systemd-sysv":             "systemd",
+    "systemd-timesyncd":        "systemd",
+    "systemd-resolved":         "systemd",
+    "libpam-systemd":           "systemd",
+    "libnss-systemd":           "systemd",
+    "libpam0g":                 "pam",
+    "libpam-modules":           "pam",
+    "libpam-modules-bin":       "pam",
+    "libpam-runtime":           "pam",
+    "libaudit1":                "audit",
+    "libaudit-common":          "audit",
+    "libselinux1":              "libselinux",
+    "libblkid1":                "util-linux",
+    "libmount1":                "util-linux",
+    "libsmartcols1":            "util-linux",
+    "libuuid1":                 "util-linux",
+    "libfdisk1":                "util-linux",
+    "bsdutils":                 "util-linux",
+    "fdisk":                    "util-linux",
+    "mount":                    "util-linux",
+    "util-linux-extra":         "util-linux",
+    "libncursesw6":             "ncurses",
+    "libtinfo6":                "ncurses",
+    "ncurses-base":             "ncurses",
+    "ncurses-bin":              "ncurses",
+    "libreadline8":             "readline",
+    "libdbus-1-3":              "dbus",
+    "dbus-bin":                 "dbus",
+    "dbus-daemon":              "dbus",
+    "dbus-session-bus-common":  "dbus",
+    "dbus-system-bus-common":   "dbus",
+    "dbus-user-session":        "dbus",
+    "libpolkit-gobject-1-0":    "policykit-1",
+    "libpolkit-agent-1-0":      "policykit-1",
+    "polkitd":                  "policykit-1",
+    "pkexec":                   "policykit-1",
+    "vim-common":               "vim",
+    "vim-tiny":                 "vim",
+    "vim-runtime":              "vim",
+    "xxd":                      "vim",
+    # Kompression / Libraries
+    "zlib1g":                   "zlib",
+    "zlib1g-dev":               "zlib",
+    "liblzma5":                 "xz-utils",
+    "libbz2-1.0":               "bzip2",
+    "libzstd1":                 "libzstd",
+    "liblz4-1":                 "lz4",
+    "libarchive13":             "libarchive",
+    "libpcre3":                 "pcre3",
+    "libpcre2-8-0":             "pcre2",
+    "libglib2.0-0":             "glib2.0",
+    "libexpat1":                "expat",
+    "libxml2-utils":            "libxml2",
+    "libxslt1.1":               "libxslt",
+    "libsqlite3-0":             "sqlite3",
+    "libffi8":                  "libffi",
+    "libdb5.3":                 "db5.3",
+    "libgdbm6":                 "gdbm",
+    "libpng16-16":              "libpng1.6",
+    "libjpeg62-turbo":          "libjpeg-turbo",
+    "libtiff6":                 "tiff",
+    "libfreetype6":             "freetype",
+    # Netzwerk
+    "libcurl4":                 "curl",
+    "libcurl3-gnutls":          "curl",
+    "libcurl4-openssl-dev":     "curl",
+    "libnghttp2-14":            "nghttp2",
+    "libidn2-0":                "libidn2",
+    "libpsl5":                  "libpsl",
+    "librtmp1":                 "rtmpdump",
+    "libldap-2.5-0":            "openldap",
+    "libldap-common":           "openldap",
+    "dnsutils":                 "bind9",
+    "libsnmp40":                "net-snmp",
+    "snmp":                     "net-snmp",
+    "snmpd":                    "net-snmp",
+    # Server
+    "apache2-bin":              "apache2",
+    "apache2-data":             "apache2",
+    "apache2-utils":            "apache2",
+    "libapr1":                  "apr",
+    "libaprutil1":              "apr-util",
+    "nginx-common":             "nginx",
+    "nginx-core":               "nginx",
+    "nginx-full":               "nginx",
+    "nginx-light":              "nginx",
+    "libmariadb3":              "mariadb",
+    "mariadb-client":           "mariadb",
+    "mariadb-server":           "mariadb",
+    "mariadb-server-core":      "mariadb",
+    "mariadb-common":           "mariadb",
+    "perl-base":                "perl",
+    "sudo-ldap":                "sudo",
+}
+
+# Regeln für versionierte Binär-Namen: (Regex, Quell-Paket mit \1-Referenzen)
+SOURCE_PACKAGE_RULES: list[tuple[re.Pattern, str]] = [
+    (re.compile(r"^linux-(?:image|headers|modules|modules-extra|tools|kbuild)-.+"), "linux"),
+    (re.compile(r"^libnginx-mod-.+"),                       "nginx"),
+    (re.compile(r"^bind9-.+"),                              "bind9"),
+    (re.compile(r"^gcc-(\d+)-base$"),                       r"gcc-\1"),
+    (re.compile(r"^(?:lib)?python(3\.\d+)(?:-.+)?$"),       r"python\1"),
+    (re.compile(r"^(?:libperl5\.\d+|perl-modules-5\.\d+)$"), "perl"),
+    (re.compile(r"^php(\d\.\d)-.+"),                        r"php\1"),
+    (re.compile(r"^libapache2-mod-php(\d\.\d)$"),           r"php\1"),
+    (re.compile(r"^openjdk-(\d+)-.+"),                      r"openjdk-\1"),
+    (re.compile(r"^postgresql-(?:client-|plpython3-)?(\d+)$"), r"postgresql-\1"),
+]
+
+
+def _read_map_file(path: Path) -> Optional[dict]:
+    """Liest eine JSON/YAML Mapping-Datei (None bei Fehler)."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            if path.suffix.lower() in (".yaml", ".yml"):
+                try:
+                    import yaml  # type: ignore
+                    return yaml.safe_load(fh) or {}
+                except ImportError:
+                    log.warning("PyYAML nicht installiert – YAML-Mapping ignoriert. "
+                                "pip install pyyaml")
+                    return None
+            return json.load(fh)
+    except Exception as e:
+        log.warning(f"Package-Map konnte nicht geladen werden: {e}")
+        return None
+
+
 def load_package_map(extra_file: Optional[str] = None) -> dict:
     """Lädt das Package-Name-Mapping.
 
@@ -335,43 +548,76 @@ def load_package_map(extra_file: Optional[str] = None) -> dict:
         log.warning(f"Package-Map-Datei nicht gefunden: {path}")
         return mapping
 
-    try:
-        with open(path, encoding="utf-8") as fh:
-            if path.suffix.lower() in (".yaml", ".yml"):
-                try:
-                    import yaml  # type: ignore
-                    data = yaml.safe_load(fh)
-                except ImportError:
-                    log.warning("PyYAML nicht installiert – YAML-Mapping ignoriert. "
-                                "pip install pyyaml")
-                    return mapping
-            else:
-                data = json.load(fh)
+    data = _read_map_file(path)
+    if not data:
+        return mapping
+    added = 0
+    for pkg, val in data.items():
+        if isinstance(val, (list, tuple)) and len(val) == 2:
+            mapping[pkg] = (val[0], val[1] if val[1] else None)
+            added += 1
+    log.info(f"Package-Map: {added} Einträge aus {path} geladen "
+             f"(gesamt: {len(mapping)})")
+    return mapping
 
-        added = 0
-        for pkg, val in data.items():
-            if isinstance(val, (list, tuple)) and len(val) == 2:
-                mapping[pkg] = (val[0], val[1] if val[1] else None)
-                added += 1
-        log.info(f"Package-Map: {added} Einträge aus {path} geladen "
-                 f"(gesamt: {len(mapping)})")
-    except Exception as e:
-        log.warning(f"Package-Map konnte nicht geladen werden: {e}")
 
+def load_source_map(extra_file: Optional[str] = None) -> dict[str, str]:
+    """Binär- → Quell-Paket: eingebautes SOURCE_PACKAGE_MAP plus optional
+    der Schlüssel "source_packages" der Package-Map-Datei:
+      { "source_packages": { "libfoo1": "foo", ... } }
+    """
+    mapping = dict(SOURCE_PACKAGE_MAP)
+    if not extra_file or not Path(extra_file).exists():
+        return mapping
+    data = _read_map_file(Path(extra_file)) or {}
+    extra = data.get("source_packages", {})
+    if isinstance(extra, dict):
+        mapping.update({str(k): str(v) for k, v in extra.items() if v})
+        if extra:
+            log.info(f"Quell-Paket-Map: {len(extra)} Einträge aus {extra_file} geladen")
     return mapping
 
 
 # Aktives Mapping – wird beim Start einmal befüllt (ggf. mit externer Datei)
 _ACTIVE_PACKAGE_MAP: dict = {}
+_ACTIVE_SOURCE_MAP:  dict = {}
 
 
 def init_package_map(extra_file: Optional[str] = None):
     """Initialisiert das aktive Package-Mapping (einmalig beim Start aufrufen)."""
-    global _ACTIVE_PACKAGE_MAP
+    global _ACTIVE_PACKAGE_MAP, _ACTIVE_SOURCE_MAP
     _ACTIVE_PACKAGE_MAP = load_package_map(extra_file)
+    _ACTIVE_SOURCE_MAP  = load_source_map(extra_file)
     log.info(f"Package-Map: {len(_ACTIVE_PACKAGE_MAP)} Einträge geladen")
 
 
+def source_package_name(binary: str, source: str = "",
+                        package_type: str = "deb") -> str:
+    """Quell-Paket eines Binär-Pakets (siehe SOURCE_PACKAGE_MAP).
+
+    Map und Regeln sind Debian/Ubuntu-spezifisch und gelten nur für
+    package_type "deb"; rpm/apk-Pakete behalten ohne "source" ihren Namen.
+    """
+    if source:
+        # dpkg: "Source: openssl (3.0.11-1)" → nur der Name
+        return source.split(" ", 1)[0]
+    if package_type.lower() != "deb":
+        return binary
+    mapped = (_ACTIVE_SOURCE_MAP or SOURCE_PACKAGE_MAP).get(binary)
+    if mapped:
+        return mapped
+    for pattern, repl in SOURCE_PACKAGE_RULES:
+        if pattern.match(binary):
+            return pattern.sub(repl, binary)
+    return binary
+
+
+def nvd_mapped_name(names: list[str]) -> Optional[str]:
+    """Erster Name mit Eintrag in der Package-Map (Quell- oder Binär-Name)."""
+    mapping = _ACTIVE_PACKAGE_MAP or PACKAGE_NAME_MAP
+    return next((n for n in names if n in mapping), None)
+
+
 def map_package_name(debian_name: str) -> tuple[str, Optional[str]]:
     """Gibt (nvd_product, nvd_vendor) für einen Debian-Paketnamen zurück.
     Falls kein Mapping vorhanden: (debian_name, None)."""
@@ -404,6 +650,7 @@ class SoftwareEntry:
     os_name:      str = ""
     os_version:   str = ""   # Major-Version des OS (z.B. "12" für Debian 12)
     path:         str = ""
+    source:       str = ""   # Quell-Paket, falls das Inventory es liefert
 
 
 @dataclass
@@ -463,6 +710,103 @@ def _cvss_score_to_severity(score: float) -> str:
     return "NONE"
 
 
+# ---------------------------------------------------------------------------
+# Subtree-Loader – liest nur software.packages / software.os
+# ---------------------------------------------------------------------------
+# Der Scanner braucht aus dem Inventory-Baum nur zwei Knoten. Statt die ganze
+# Datei (Hardware, Netzwerk, ...) zu parsen, läuft ein Token-Scanner über die
+# entpackten Blöcke, verfolgt nur den Schlüsselpfad und schneidet den Text der
+# beiden Ziel-Subtrees mit. Nur dieser Text wird anschließend mit json.loads
+# bzw. ast.literal_eval geparst.
+#
+# Ein Token ist ein Lauf ohne Klammern (Strings werden dabei komplett
+# übersprungen, auch wenn sie Klammern enthalten) plus die folgende Klammer –
+# oder ein am Blockende abgeschnittener String. Den Lauf erledigt die Regex
+# in C, Python sieht nur die Klammern.
+
+_INV_RUN = (r'[^"\'\[\]{}()]*'
+            r'(?:(?:"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+            r'|\'[^\'\\\n]*(?:\\.[^\'\\\n]*)*\')'
+            r'[^"\'\[\]{}()]*)*')
+_INV_TOKEN_RE = re.compile(_INV_RUN + r'(?:([\[{(])|([\]})])|(["\']))')
+_INV_KEY_RE   = re.compile(r'(?:"([^"\\]*)"|\'([^\'\\]*)\')\s*:\s*$')
+
+SOFTWARE_SUBTREES: dict[tuple, str] = {
+    ("Nodes", "software", "Nodes", "packages"): "packages",
+    ("Nodes", "software", "Nodes", "os"):       "os",
+}
+_SOFTWARE_NODES  = ("Nodes", "software", "Nodes")
+_SOFTWARE_PREFIX = {t[:i] for t in SOFTWARE_SUBTREES for i in range(len(t))}
+
+
+def extract_software_subtrees(fh, chunk_size: int = INV_CHUNK_SIZE) -> dict[str, str]:
+    """Liest einen Inventory-Baum blockweise aus fh (Textmodus) und gibt den
+    Quelltext der Knoten software.packages und software.os zurück.
+
+    Funktioniert für JSON (CMK 2.5) und Python-Literal (CMK 2.0–2.4).
+    Liest nur bis software.Nodes geschlossen ist – nachfolgende Knoten
+    werden gar nicht erst entpackt. Wirft ValueError bei kaputter Struktur.
+    """
+    found: dict[str, str] = {}
+    stack: list[Optional[tuple]] = []   # Pfad je offenem Container (None = egal)
+    capture: Optional[str] = None       # Name des gerade mitgeschnittenen Subtrees
+    capture_depth = 0
+    parts: list[str] = []
+    buf = ""
+    eof = False
+    match = _INV_TOKEN_RE.match
+    while not eof:
+        chunk = fh.read(chunk_size)
+        eof   = not chunk
+        buf  += chunk
+        pos      = 0
+        cap_from = 0
+        while True:
+            m = match(buf, pos)
+            if m is None or m.lastindex == 3:
+                if eof:
+                    if m is None and not stack:
+                        return found   # nur noch Leerraum nach dem Baum
+                    raise ValueError("Datei endet innerhalb eines Strings")
+                break
+            end = m.end()
+            if m.lastindex == 1:
+                path: Optional[tuple] = None
+                if not stack:
+                    path = ()
+                elif stack[-1] is not None:
+                    k = _INV_KEY_RE.search(buf, max(m.start(), end - 200), end - 1)
+                    if k:
+                        path = stack[-1] + (k.group(1) or k.group(2),)
+                if capture is None and path in SOFTWARE_SUBTREES:
+                    capture, capture_depth = SOFTWARE_SUBTREES[path], len(stack)
+                    cap_from, parts = end - 1, []
+                    path = None
+                elif path not in _SOFTWARE_PREFIX:
+                    path = None
+                stack.append(path)
+            else:
+                if not stack:
+                    raise ValueError(f"Unerwartete Klammer bei Zeichen {end}")
+                closed = stack.pop()
+                if capture is not None and len(stack) == capture_depth:
+                    parts.append(buf[cap_from:end])
+                    found[capture] = "".join(parts)
+                    capture = None
+                # Baum zu Ende (z.B. Switch ohne software-Knoten) oder
+                # alles Benötigte gelesen
+                if not stack or closed == _SOFTWARE_NODES \
+                        or len(found) == len(SOFTWARE_SUBTREES):
+                    return found
+            pos = end
+        if capture is not None:
+            parts.append(buf[cap_from:pos])
+        buf = buf[pos:]
+    if stack:
+        raise ValueError("Datei endet innerhalb des Inventory-Baums")
+    return found
+
+
 # ---------------------------------------------------------------------------
 # Checkmk Inventory Reader (Dateisystem – kein HTTP)
 # ---------------------------------------------------------------------------
@@ -476,6 +820,8 @@ class CheckmkInventoryReader:
       /omd/sites/<site>/var/check_mk/inventory/<hostname>.gz    ← komprimiert
 
     Das Format ist Python-Literal-Syntax (kein JSON), parsbar mit ast.literal_eval.
+    Für den Scan wird nur software.packages / software.os gelesen
+    (siehe extract_software_subtrees), der Rest des Baums nicht geparst.
     Checkmk 2.x Struktur:
       {
         "Attributes": {},
@@ -495,8 +841,12 @@ class CheckmkInventoryReader:
       }
     """
 
-    def __init__(self, omd_root: Path = OMD_ROOT):
+    def __init__(self, omd_root: Path = OMD_ROOT, workers: int = 1,
+                 index: Optional["InventoryIndex"] = None):
         self.omd_root = omd_root
+        self.workers  = max(1, workers)
+        self.index    = index
+        self.stats    = {"reused": 0, "parsed": 0}
 
     def discover_sites(self) -> list[str]:
         """Findet alle vorhandenen Checkmk Sites auf diesem Server."""
@@ -525,61 +875,223 @@ class CheckmkInventoryReader:
                 hosts.add(name)
         return sorted(hosts)
 
-    def read_inventory(self, site: str, hostname: str) -> Optional[dict]:
-        """
-        Liest und parst die Inventory-Datei eines Hosts.
+    def _candidates(self, site: str, hostname: str) -> list[tuple[Path, bool]]:
+        """Mögliche Inventory-Dateien eines Hosts als (Pfad, gzip) in Lesereihenfolge.
         Bevorzugt unkomprimierte Datei, fällt auf .gz zurück.
         """
         inv_dir = self.get_inventory_dir(site)
-        plain_file = inv_dir / hostname
-        gz_file    = inv_dir / f"{hostname}.gz"
-
-        raw = None
+        return [
+            (inv_dir / hostname,         False),
+            (inv_dir / f"{hostname}.gz", True),
+        ]
 
-        # 1. Unkomprimierte Datei bevorzugen
-        if plain_file.exists():
+    def inventory_stamp(self, site: str,
+                        hostname: str) -> Optional[tuple[int, int]]:
+        """(mtime_ns, size) der Inventory-Datei, die read_inventory lesen würde."""
+        for path, _ in self._candidates(site, hostname):
             try:
-                raw = plain_file.read_text(encoding="utf-8", errors="replace")
-            except OSError as e:
-                log.warning(f"Lesen fehlgeschlagen {plain_file}: {e}")
+                st = path.stat()
+            except OSError:
+                continue
+            return st.st_mtime_ns, st.st_size
+        return None
 
-        # 2. Komprimierte Datei als Fallback
-        if raw is None and gz_file.exists():
+    def read_inventory_raw(self, site: str, hostname: str) -> Optional[bytes]:
+        """Liest die (ggf. entpackte) Inventory-Datei eines Hosts als Bytes."""
+        for path, is_gz in self._candidates(site, hostname):
+            if not path.exists():
+                continue
             try:
-                with gzip.open(gz_file, "rt", encoding="utf-8",
-                               errors="replace") as fh:
-                    raw = fh.read()
-            except OSError as e:
-                log.warning(f"Lesen fehlgeschlagen {gz_file}: {e}")
-
-        if raw is None:
-            log.debug(f"Keine Inventory-Datei für {site}/{hostname}")
-            return None
+                if is_gz:
+                    with gzip.open(path, "rb") as fh:
+                        return fh.read()
+                return path.read_bytes()
+            except (OSError, EOFError) as e:
+                log.warning(f"Lesen fehlgeschlagen {path}: {e}")
+        return None
 
+    @staticmethod
+    def parse_inventory_raw(site: str, hostname: str,
+                            raw: bytes) -> Optional[dict]:
+        """Parst den Inhalt einer Inventory-Datei (Python-Literal)."""
+        text = raw.decode("utf-8", errors="replace")
         # Python-Literal parsen (sicher, kein eval)
         try:
-            return ast.literal_eval(raw)
+            return ast.literal_eval(text)
         except (ValueError, SyntaxError) as e:
             log.warning(f"Parse-Fehler {site}/{hostname}: {e}")
             return None
 
+    def read_inventory(self, site: str, hostname: str) -> Optional[dict]:
+        """Liest und parst die Inventory-Datei eines Hosts (siehe _candidates)."""
+        raw = self.read_inventory_raw(site, hostname)
+        if raw is None:
+            log.debug(f"Keine Inventory-Datei für {site}/{hostname}")
+            return None
+        return self.parse_inventory_raw(site, hostname, raw)
+
+    def read_software(self, site: str, hostname: str) -> Optional[dict[str, str]]:
+        """Liest nur den Quelltext von software.packages / software.os.
+
+        Streamt aus der (ggf. gzip-komprimierten) Datei, ohne den entpackten
+        Text oder den ganzen Objektbaum im Speicher zu halten.
+        """
+        for path, is_gz in self._candidates(site, hostname):
+            if not path.exists():
+                continue
+            opener = gzip.open if is_gz else open
+            try:
+                with opener(path, "rt", encoding="utf-8", errors="replace") as fh:
+                    return extract_software_subtrees(fh)
+            except (OSError, EOFError) as e:
+                log.warning(f"Lesen fehlgeschlagen {path}: {e}")
+            except ValueError as e:
+                log.warning(f"Parse-Fehler {site}/{hostname}: {e}")
+                return None
+        return None
+
+    @staticmethod
+    def parse_software(site: str, hostname: str,
+                       subtrees: dict[str, str]) -> Optional[dict]:
+        """Baut aus den Subtree-Texten einen minimalen Inventory-Baum,
+        den _parse_inventory wie gewohnt verarbeitet."""
+        nodes: dict = {}
+        for name, text in subtrees.items():
+            try:
+                nodes[name] = ast.literal_eval(text)
+            except (ValueError, SyntaxError) as e:
+                log.warning(f"Parse-Fehler {site}/{hostname} software.{name}: {e}")
+                return None
+        return {"Nodes": {"software": {"Nodes": nodes}}}
+
+    def load_compact(self, site: str, hostname: str,
+                     known_hash: str = "") -> tuple[str, Optional[list[tuple]]]:
+        """Liest einen Host und liefert (hash, rows).
+
+        rows sind kompakte Tupel (name, version, vendor, package_type,
+        os_name, os_version, source). Der Hash läuft nur über die Software-Subtrees –
+        stimmt er mit known_hash überein, wird nicht geparst und rows ist
+        None (Pakete unverändert).
+        """
+        subtrees = self.read_software(site, hostname)
+        if subtrees is None:
+            log.debug(f"Keine Inventory-Daten für {site}/{hostname}")
+            return "", []
+        h = hashlib.blake2b(digest_size=16)
+        for name in sorted(subtrees):
+            h.update(f"{name}\0{subtrees[name]}\0".encode("utf-8"))
+        digest = h.hexdigest()
+        if known_hash and digest == known_hash:
+            return digest, None
+        inv = self.parse_software(site, hostname, subtrees)
+        if inv is None:
+            return digest, []
+        return digest, [(e.name, e.version, e.vendor, e.package_type,
+                         e.os_name, e.os_version, e.source)
+                        for e in self._parse_inventory(site, hostname, inv)]
+
     def iter_software(self, site: str,
                       hosts: Optional[list[str]] = None):
         """Generator: liefert SoftwareEntry-Objekte einzeln (RAM-effizient).
         Anstatt alle 500.000 Einträge in eine Liste zu laden, werden sie
         host-für-host verarbeitet und direkt weitergegeben.
+
+        Mit Inventory-Index werden unveränderte Hosts (gleiche mtime/Größe
+        oder gleicher Inhalts-Hash) nicht neu geparst.
         """
         target_hosts = hosts or self.get_hosts(site)
         log.info(f"[{site}] Lese Inventory für {len(target_hosts)} Hosts...")
-        count = 0
+        count, reused, parsed = 0, 0, 0
+
+        todo: list[tuple[str, str]] = []            # (hostname, known_hash)
+        stamps: dict[str, tuple[int, int]] = {}
         for hostname in target_hosts:
-            inv = self.read_inventory(site, hostname)
-            if inv is None:
+            if self.index is None:
+                todo.append((hostname, ""))
+                continue
+            stamp = self.inventory_stamp(site, hostname)
+            if stamp is None:
+                continue
+            stamps[hostname] = stamp
+            rows = self.index.lookup(site, hostname, stamp)
+            if rows is None:
+                todo.append((hostname, self.index.known_hash(site, hostname)))
                 continue
-            for entry in self._parse_inventory(site, hostname, inv):
+            reused += 1
+            for row in rows:
                 count += 1
-                yield entry
+                yield self._entry(site, hostname, row)
+
+        if self.workers > 1 and len(todo) > 1:
+            results = self._iter_parallel(site, todo)
+        else:
+            results = self._iter_sequential(site, todo)
+        for hostname, digest, rows in results:
+            if rows is None:
+                # Datei neu geschrieben, Inhalt aber gleich → Index übernehmen
+                rows = self.index.touch(site, hostname, stamps[hostname])
+                reused += 1
+            else:
+                parsed += 1
+                if self.index is not None and digest:
+                    self.index.store(site, hostname, stamps[hostname],
+                                     digest, rows)
+            for row in rows:
+                count += 1
+                yield self._entry(site, hostname, row)
+
+        self.stats["reused"] += reused
+        self.stats["parsed"] += parsed
         log.info(f"[{site}] → {count} Software-Einträge")
+        if self.index is not None:
+            if hosts is None:
+                self.index.prune(site, set(target_hosts))
+            self.index.save()
+            log.info(f"[{site}] Inventory-Index: {reused} Hosts wiederverwendet, "
+                     f"{parsed} neu geparst")
+
+    @staticmethod
+    def _entry(site: str, hostname: str, row) -> SoftwareEntry:
+        name, version, vendor, pkg_type, os_name, os_version, source = row
+        return SoftwareEntry(
+            site=site, host=hostname,
+            name=name, version=version, vendor=vendor,
+            package_type=pkg_type,
+            os_name=os_name, os_version=os_version,
+            path="software.os" if pkg_type == "os" else "software.packages",
+            source=source,
+        )
+
+    def _iter_sequential(self, site: str, todo: list[tuple[str, str]]):
+        for hostname, known_hash in todo:
+            digest, rows = self.load_compact(site, hostname, known_hash)
+            yield hostname, digest, rows
+
+    def _iter_parallel(self, site: str, todo: list[tuple[str, str]]):
+        """Verteilt das Lesen + Parsen (load_compact) auf einen Prozess-Pool.
+
+        gzip + ast.literal_eval ist reine CPU-Arbeit – mit --workers N laufen
+        N Hosts gleichzeitig. Die Worker liefern nur kompakte Tupel zurück,
+        die Ergebnisse kommen in Host-Reihenfolge und werden sofort
+        weitergereicht, sobald ein Host fertig ist.
+        """
+        workers   = min(self.workers, len(todo))
+        chunksize = max(1, min(16, len(todo) // (workers * 4)))
+        log.info(f"[{site}] Parse Inventory mit {workers} Prozessen "
+                 f"(chunksize {chunksize})")
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError) as e:
+            log.warning(f"Prozess-Pool nicht verfügbar ({e}) – parse sequentiell")
+            yield from self._iter_sequential(site, todo)
+            return
+        names  = [h for h, _ in todo]
+        hashes = [k for _, k in todo]
+        loader = partial(_load_host_compact, str(self.omd_root), site)
+        with pool:
+            for hostname, (digest, rows) in zip(
+                    names, pool.map(loader, names, hashes, chunksize=chunksize)):
+                yield hostname, digest, rows
 
     def extract_software(self, site: str,
                          hosts: Optional[list[str]] = None) -> list[SoftwareEntry]:
@@ -675,6 +1187,7 @@ class CheckmkInventoryReader:
                 os_name=os_name,
                 os_version=os_version,
                 path="software.packages",
+                source=str(pkg.get("source", pkg.get("source_package", "")) or "").strip(),
             ))
         return entries
 
@@ -705,87 +1218,468 @@ class CheckmkInventoryReader:
         )
 
 
-# ---------------------------------------------------------------------------
-# API Result Cache  (Fix 3: verhindert wiederholte Abfragen gleicher Pakete)
-# ---------------------------------------------------------------------------
+def _load_host_compact(omd_root: str, site: str, hostname: str,
+                       known_hash: str = "") -> tuple[str, Optional[list[tuple]]]:
+    """Worker für --workers: CheckmkInventoryReader.load_compact im Subprozess.
 
-class ApiCache:
-    """Lokaler JSON-Cache für API-Ergebnisse.
+    Der Inventory-Baum und die SoftwareEntry-Objekte werden nicht zwischen
+    den Prozessen gepickelt, nur Hash und kompakte Tupel.
+    """
+    reader = CheckmkInventoryReader(omd_root=Path(omd_root))
+    return reader.load_compact(site, hostname, known_hash)
 
-    Verhindert, dass openssl 3.0.18 bei jedem Scan-Lauf tausende Male
-    neu abgefragt wird. Default TTL: 24h (86400s).
 
-    Struktur der Cache-Datei:
-      { "<source>|<name>|<version>": {"ts": <unix_time>, "cves": [...]} }
+# ---------------------------------------------------------------------------
+# Inventory-Index (verhindert erneutes Parsen unveränderter Hosts)
+# ---------------------------------------------------------------------------
+
+class InventoryIndex:
+    """Persistenter Index der extrahierten Paketlisten pro (site, host).
+
+    Checkmk schreibt die Inventory-Dateien bei jedem HW/SW-Inventory neu,
+    auch wenn sich an den Paketen nichts geändert hat. Deshalb zweistufig:
+      1. mtime + Größe gleich      → gespeicherte Pakete, Datei nicht lesen
+      2. Software-Hash gleich      → gespeicherte Pakete, nicht parsen
+      3. sonst                     → parsen und Index aktualisieren
+    Der Hash läuft nur über software.packages / software.os, Änderungen an
+    Hardware- oder Netzwerk-Knoten lösen kein neues Parsen aus.
+
+    Struktur der Index-Datei:
+      { "version": 3,
+        "hosts": { "<site>|<host>": {"mtime": <ns>, "size": <bytes>,
+                                     "hash": "<blake2b>", "rows": [[...], ...]} } }
     """
 
-    def __init__(self, cache_file: str = "/tmp/cve_scanner_cache.json",
-                 ttl_seconds: int = 86400):
-        self.cache_file = Path(cache_file)
-        self.ttl        = ttl_seconds
-        self._data: dict = {}
+    VERSION = 3   # erhöhen, wenn sich das Parsing ändert → Index wird verworfen
+
+    def __init__(self, index_file: str = "/tmp/cve_scanner_inventory_index.json"):
+        self.index_file = Path(index_file)
+        self._hosts: dict = {}
         self._dirty      = False
         self._load()
 
     def _load(self):
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, encoding="utf-8") as fh:
-                    self._data = json.load(fh)
-                # Abgelaufene Einträge beim Laden entfernen
-                now = time.time()
-                expired = [k for k, v in self._data.items()
-                           if now - v.get("ts", 0) > self.ttl]
-                for k in expired:
-                    del self._data[k]
-                if expired:
-                    self._dirty = True
-                log.debug(f"Cache geladen: {len(self._data)} Einträge "
-                          f"({len(expired)} abgelaufen/entfernt)")
-            except Exception as e:
-                log.debug(f"Cache konnte nicht geladen werden: {e}")
-                self._data = {}
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") != self.VERSION:
+                log.info(f"Inventory-Index {self.index_file}: andere Version – wird neu aufgebaut")
+                self._dirty = True
+                return
+            self._hosts = data.get("hosts", {})
+            log.debug(f"Inventory-Index geladen: {len(self._hosts)} Hosts")
+        except Exception as e:
+            log.debug(f"Inventory-Index konnte nicht geladen werden: {e}")
+            self._hosts = {}
 
     def save(self):
         if not self._dirty:
             return
         try:
-            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_file, "w", encoding="utf-8") as fh:
-                json.dump(self._data, fh, separators=(",", ":"))
-            log.debug(f"Cache gespeichert: {len(self._data)} Einträge → {self.cache_file}")
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_file.with_name(self.index_file.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({"version": self.VERSION, "hosts": self._hosts},
+                          fh, separators=(",", ":"))
+            os.replace(tmp, self.index_file)
+            log.debug(f"Inventory-Index gespeichert: {len(self._hosts)} Hosts → {self.index_file}")
             self._dirty = False
         except Exception as e:
-            log.warning(f"Cache konnte nicht gespeichert werden: {e}")
+            log.warning(f"Inventory-Index konnte nicht gespeichert werden: {e}")
+
+    @staticmethod
+    def _key(site: str, host: str) -> str:
+        return f"{site}|{host}"
+
+    def lookup(self, site: str, host: str,
+               stamp: tuple[int, int]) -> Optional[list]:
+        """Gespeicherte Pakete, wenn mtime und Größe unverändert sind."""
+        entry = self._hosts.get(self._key(site, host))
+        if entry is None or (entry["mtime"], entry["size"]) != tuple(stamp):
+            return None
+        return entry["rows"]
+
+    def known_hash(self, site: str, host: str) -> str:
+        entry = self._hosts.get(self._key(site, host))
+        return entry["hash"] if entry else ""
+
+    def touch(self, site: str, host: str, stamp: tuple[int, int]) -> list:
+        """Inhalt unverändert: neue mtime/Größe übernehmen, Pakete zurückgeben."""
+        entry = self._hosts[self._key(site, host)]
+        entry["mtime"], entry["size"] = stamp
+        self._dirty = True
+        return entry["rows"]
+
+    def store(self, site: str, host: str, stamp: tuple[int, int],
+              digest: str, rows: list[tuple]):
+        self._hosts[self._key(site, host)] = {
+            "mtime": stamp[0], "size": stamp[1], "hash": digest,
+            "rows": [list(r) for r in rows],
+        }
+        self._dirty = True
+
+    def prune(self, site: str, hosts: set[str]) -> int:
+        """Entfernt Hosts einer Site, für die keine Inventory-Datei mehr existiert."""
+        prefix = f"{site}|"
+        stale = [k for k in self._hosts
+                 if k.startswith(prefix) and k[len(prefix):] not in hosts]
+        for k in stale:
+            del self._hosts[k]
+        if stale:
+            self._dirty = True
+            log.info(f"[{site}] Inventory-Index: {len(stale)} entfernte Hosts gelöscht")
+        return len(stale)
+
+
+# ---------------------------------------------------------------------------
+# API Result Cache  (Fix 3: verhindert wiederholte Abfragen gleicher Pakete)
+# ---------------------------------------------------------------------------
+
+class ApiCache:
+    """Lokaler SQLite-Cache (WAL) für API-Ergebnisse.
+
+    Verhindert, dass openssl 3.0.18 bei jedem Scan-Lauf tausende Male
+    neu abgefragt wird. Default TTL: 24h (86400s), pro Eintrag überschreibbar.
+    Leere Listen ("keine Schwachstellen") bekommen die kürzere negative_ttl –
+    so wird nicht jedes unauffällige Paket bei jedem Lauf neu abgefragt,
+    neue Advisories werden aber trotzdem zeitnah gefunden.
+
+    - Lookups über den Primärschlüssel (source, name, version), kein
+      vollständiges Laden beim Start
+    - set() sammelt Einträge und schreibt sie in Batches (save() = flush)
+    - LRU-Obergrenze: über max_entries hinaus fliegen die am längsten
+      nicht mehr gelesenen Einträge raus
+    - WAL + busy_timeout + UPSERT: mehrere Scanner gleichzeitig sind sicher,
+      keiner überschreibt die Einträge des anderen
+    - thread-sicher: die Quellen-Phasen (OSV, OSS, NVD) laufen parallel
+      und teilen sich eine Verbindung hinter einem Lock
+
+    Alte JSON-Caches (*.json) werden beim ersten Start in <name>.sqlite
+    übernommen.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS api_cache (
+            source    TEXT NOT NULL,
+            name      TEXT NOT NULL,
+            version   TEXT NOT NULL,
+            cves      TEXT NOT NULL,
+            expires   REAL NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (source, name, version)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS api_cache_last_used ON api_cache (last_used);
+        CREATE INDEX IF NOT EXISTS api_cache_expires   ON api_cache (expires);
+    """
+
+    def __init__(self, cache_file: str = "/tmp/cve_scanner_cache.sqlite",
+                 ttl_seconds: int = 86400,
+                 negative_ttl_seconds: Optional[int] = None,
+                 max_entries: int = 500_000,
+                 batch_size:  int = 500):
+        path = Path(cache_file)
+        legacy_json = path if path.suffix == ".json" else None
+        if legacy_json:
+            path = path.with_suffix(".sqlite")
+        self.cache_file  = path
+        self.ttl          = ttl_seconds
+        self.negative_ttl = ttl_seconds if negative_ttl_seconds is None \
+                            else negative_ttl_seconds
+        self.max_entries  = max_entries
+        self.batch_size  = batch_size
+        self._pending: dict[tuple, tuple] = {}   # key → (cves_json, expires)
+        self._touched: set[tuple]         = set()
+        self._lock = threading.RLock()
+        self._db = self._connect()
+        if legacy_json and legacy_json.exists():
+            self._import_json(legacy_json)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(self.cache_file), timeout=30,
+                             isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(self.SCHEMA)
+        return db
+
+    def _import_json(self, legacy: Path):
+        """Übernimmt einen alten JSON-Cache einmalig, wenn die DB leer ist."""
+        if self._db.execute("SELECT 1 FROM api_cache LIMIT 1").fetchone():
+            return
+        try:
+            with open(legacy, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except Exception as e:
+            log.debug(f"Alter JSON-Cache nicht lesbar: {e}")
+            return
+        now = time.time()
+        rows = []
+        for k, v in data.items():
+            parts = k.split("|", 2)
+            expires = v.get("ts", 0) + self.ttl
+            if len(parts) == 3 and expires > now:
+                rows.append((*parts, json.dumps(v.get("cves", []),
+                                                separators=(",", ":")),
+                             expires, now))
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.executemany(
+                "INSERT OR IGNORE INTO api_cache VALUES (?, ?, ?, ?, ?, ?)", rows)
+        log.info(f"Cache: {len(rows)} Einträge aus {legacy} übernommen → {self.cache_file}")
 
-    def _key(self, source: str, name: str, version: str) -> str:
-        return f"{source}|{name.lower()}|{version.lower()}"
+    @staticmethod
+    def _key(source: str, name: str, version: str) -> tuple:
+        return source, name.lower(), version.lower()
 
     def get(self, source: str, name: str,
             version: str) -> Optional[list]:
         """Gibt gecachte CVE-Liste zurück oder None wenn kein/abgelaufener Eintrag."""
         k = self._key(source, name, version)
-        entry = self._data.get(k)
-        if entry is None:
-            return None
-        if time.time() - entry.get("ts", 0) > self.ttl:
-            del self._data[k]
-            self._dirty = True
-            return None
-        return entry.get("cves", [])
+        with self._lock:
+            row = self._pending.get(k)
+            if row is None:
+                row = self._db.execute(
+                    "SELECT cves, expires FROM api_cache "
+                    "WHERE source = ? AND name = ? AND version = ?", k).fetchone()
+                if row is None:
+                    return None
+            if row[1] < time.time():
+                return None
+            self._touched.add(k)
+        return json.loads(row[0])
 
     def set(self, source: str, name: str, version: str,
-            cves: list):
-        """Speichert CVE-Liste für ein Paket im Cache."""
+            cves: list, ttl: Optional[int] = None):
+        """Speichert CVE-Liste für ein Paket im Cache.
+
+        ttl in Sekunden; Default self.ttl bzw. self.negative_ttl für [].
+        """
         k = self._key(source, name, version)
-        self._data[k] = {"ts": time.time(), "cves": cves}
-        self._dirty = True
+        if ttl is None:
+            ttl = self.ttl if cves else self.negative_ttl
+        expires = time.time() + ttl
+        data    = json.dumps(cves, separators=(",", ":"))
+        with self._lock:
+            self._pending[k] = (data, expires)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Schreibt gesammelte Einträge und LRU-Zeitstempel in einer Transaktion."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending and not self._touched:
+            return
+        now = time.time()
+        try:
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.executemany(
+                    "INSERT INTO api_cache VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (source, name, version) DO UPDATE SET "
+                    "cves = excluded.cves, expires = excluded.expires, "
+                    "last_used = excluded.last_used",
+                    [(*k, cves, expires, now)
+                     for k, (cves, expires) in self._pending.items()])
+                self._db.executemany(
+                    "UPDATE api_cache SET last_used = ? "
+                    "WHERE source = ? AND name = ? AND version = ?",
+                    [(now, *k) for k in self._touched - self._pending.keys()])
+            self._pending.clear()
+            self._touched.clear()
+        except sqlite3.Error as e:
+            log.warning(f"Cache konnte nicht geschrieben werden: {e}")
+
+    def save(self):
+        """Flush + abgelaufene Einträge löschen + LRU-Obergrenze durchsetzen."""
+        with self._lock:
+            self._flush()
+            self._cleanup()
+
+    def _cleanup(self):
+        try:
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                expired = self._db.execute(
+                    "DELETE FROM api_cache WHERE expires < ?",
+                    (time.time(),)).rowcount
+                total = self._db.execute(
+                    "SELECT COUNT(*) FROM api_cache").fetchone()[0]
+                evicted = 0
+                if self.max_entries and total > self.max_entries:
+                    evicted = self._db.execute(
+                        "DELETE FROM api_cache WHERE (source, name, version) IN ("
+                        " SELECT source, name, version FROM api_cache"
+                        " ORDER BY last_used LIMIT ?)",
+                        (total - self.max_entries,)).rowcount
+            log.debug(f"Cache gespeichert: {total - evicted} Einträge "
+                      f"({expired} abgelaufen, {evicted} LRU) → {self.cache_file}")
+        except sqlite3.Error as e:
+            log.warning(f"Cache konnte nicht bereinigt werden: {e}")
 
     def stats(self) -> dict:
-        now = time.time()
-        fresh = sum(1 for v in self._data.values()
-                    if now - v.get("ts", 0) <= self.ttl)
-        return {"total": len(self._data), "fresh": fresh}
+        with self._lock:
+            total, fresh, empty = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expires >= ?), 0), "
+                "COALESCE(SUM(cves = '[]'), 0) FROM api_cache",
+                (time.time(),)).fetchone()
+        return {"total": total, "fresh": fresh, "empty": empty}
+
+
+# ---------------------------------------------------------------------------
+# HTTP Transport – gemeinsam für NVD, OSV, OSS Index und CISA KEV
+# ---------------------------------------------------------------------------
+
+class SlidingWindowLimiter:
+    """Thread-sicheres Rate-Limit über ein rollierendes Zeitfenster.
+
+    Erlaubt Bursts bis max_requests und wartet erst, wenn das Fenster voll
+    ist – bis der älteste Request aus dem Fenster fällt. Ein fester Abstand
+    vor jedem Request (window / max_requests) wäre bei gleichem Limit
+    deutlich langsamer, sobald Antwortzeiten dazukommen.
+    """
+
+    def __init__(self, max_requests: int, window: float):
+        self.max_requests = max(1, max_requests)
+        self.window       = window
+        self._stamps: deque[float] = deque()
+        self._lock        = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._stamps and now - self._stamps[0] >= self.window:
+                    self._stamps.popleft()
+                if len(self._stamps) < self.max_requests:
+                    self._stamps.append(now)
+                    return
+                wait = self.window - (now - self._stamps[0])
+            time.sleep(wait)
+
+
+class HttpTransport:
+    """Eine requests.Session für alle Quellen.
+
+    - Rate-Limit je Host (SlidingWindowLimiter), konfigurierbar in
+      [http_limits]; Clients melden ihre Standard-Limits per limit() an
+    - Wiederholung bei 429/5xx und Verbindungsfehlern: Retry-After wird
+      beachtet, sonst exponentielles Backoff – jeweils plus Jitter
+    - ein Connection-Pool für alle Worker-Threads
+    - Zähler je Host: Requests, Retries, Fehler (fehlgeschlagene Versuche),
+      Bytes, Sekunden
+    """
+
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE,
+                 retries: int = HTTP_RETRIES, backoff: float = HTTP_BACKOFF,
+                 max_backoff: float = HTTP_MAX_BACKOFF,
+                 limits: Optional[dict[str, tuple[int, float]]] = None):
+        self.retries     = max(0, retries)
+        self.backoff     = backoff
+        self.max_backoff = max_backoff
+        self._limiters: dict[str, SlidingWindowLimiter] = {
+            host: SlidingWindowLimiter(n, window)
+            for host, (n, window) in (limits or {}).items()}
+        self._configured = set(self._limiters)
+        self._stats: dict[str, dict] = {}
+        self._lock       = threading.Lock()
+        self.session     = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8,
+                                                pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": HTTP_USER_AGENT})
+
+    def limit(self, host: str, max_requests: int, window: float):
+        """Standard-Limit eines Clients – Einträge aus [http_limits] haben Vorrang."""
+        if host not in self._configured:
+            self._limiters[host] = SlidingWindowLimiter(max_requests, window)
+
+    def _count(self, host: str, **inc):
+        with self._lock:
+            st = self._stats.setdefault(host, {"requests": 0, "retries": 0,
+                                               "errors": 0, "bytes": 0,
+                                               "seconds": 0.0})
+            for k, v in inc.items():
+                st[k] += v
+
+    def _retry_wait(self, resp, attempt: int) -> float:
+        wait = self.backoff * (2 ** attempt)
+        value = resp.headers.get("Retry-After", "") if resp is not None else ""
+        if value:
+            try:
+                wait = float(value)
+            except ValueError:
+                try:
+                    wait = (parsedate_to_datetime(value)
+                            - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    pass
+        return min(max(wait, 0.0), self.max_backoff) + random.uniform(0, self.backoff)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Wie Session.request – mit Limit, Retries und Zählern.
+
+        Nach dem letzten Versuch wird die Antwort zurückgegeben (der Aufrufer
+        prüft den Status) bzw. die Exception weitergereicht.
+        """
+        host    = urlsplit(url).hostname or ""
+        limiter = self._limiters.get(host)
+        for attempt in range(self.retries + 1):
+            if limiter:
+                limiter.acquire()
+            t0 = time.monotonic()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._count(host, requests=1, errors=1,
+                            seconds=time.monotonic() - t0)
+                if attempt >= self.retries:
+                    raise
+                wait = self._retry_wait(None, attempt)
+                log.debug(f"HTTP {host}: {e} – neuer Versuch in {wait:.1f}s")
+            else:
+                size = resp.headers.get("Content-Length", "")
+                if not size.isdigit():
+                    size = 0 if kwargs.get("stream") else len(resp.content or b"")
+                self._count(host, requests=1, bytes=int(size),
+                            errors=int(resp.status_code >= 400),
+                            seconds=time.monotonic() - t0)
+                if resp.status_code not in self.RETRY_STATUS or attempt >= self.retries:
+                    return resp
+                wait = self._retry_wait(resp, attempt)
+                log.debug(f"HTTP {host}: Status {resp.status_code} – "
+                          f"neuer Versuch in {wait:.1f}s")
+                resp.close()
+            self._count(host, retries=1)
+            time.sleep(wait)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_if_changed(self, url: str, etag: str = "", last_modified: str = "",
+                       **kwargs) -> requests.Response:
+        """GET mit If-None-Match / If-Modified-Since – Status 304 = unverändert."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return self.get(url, headers=headers, **kwargs)
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {host: dict(st) for host, st in self._stats.items()}
 
 
 # ---------------------------------------------------------------------------
@@ -796,19 +1690,20 @@ class NvdClient:
     BASE_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
 
     def __init__(self, api_key: Optional[str] = None,
-                 min_cvss_score: float = 0.0):
+                 min_cvss_score: float = 0.0,
+                 mirror: Optional["NvdMirror"] = None,
+                 workers: int = NVD_WORKERS,
+                 http: Optional[HttpTransport] = None):
         self.min_cvss_score = min_cvss_score
-        self._req_count     = 0
-        self.delay          = NVD_DELAY_WITH_KEY if api_key else NVD_DELAY_NO_KEY
-        self.session        = requests.Session()
-        self.session.headers.update({"Accept": "application/json"})
+        self.mirror         = mirror          # gesetzt = lokal abfragen, keine API
+        self.workers        = max(1, workers)
+        self.http           = http or HttpTransport()
+        self.http.limit(urlsplit(self.BASE_URL).hostname,
+                        NVD_RATE_WITH_KEY if api_key else NVD_RATE_NO_KEY,
+                        NVD_RATE_WINDOW)
+        self.headers        = {"Accept": "application/json"}
         if api_key:
-            self.session.headers["apiKey"] = api_key
-
-    def _throttle(self):
-        if self._req_count > 0:
-            time.sleep(self.delay)
-        self._req_count += 1
+            self.headers["apiKey"] = api_key
 
     @staticmethod
     def _clean_version(version: str) -> str:
@@ -828,139 +1723,874 @@ class NvdClient:
         v = re.split(r"[+~]|(?<=[0-9])-", v)[0]
         return v.strip()
 
-    def search_by_keyword(self, name: str, version: str) -> list[CveMatch]:
-        self._throttle()
-        clean_ver = self._clean_version(version)
+    def fetch(self, params: dict) -> dict:
+        """Eine Seite der CVE-API (gedrosselt). Wirft requests.RequestException."""
+        resp = self.http.get(self.BASE_URL, params=params,
+                             headers=self.headers, timeout=60)
+        if resp.status_code == 404:
+            return {}   # 404 = keine Treffer, kein Fehler
+        resp.raise_for_status()
+        return resp.json()
+
+    def iter_pages(self, params: dict, page_size: int = NVD_PAGE_SIZE):
+        """Alle Seiten einer Abfrage per startIndex ("vulnerabilities"-Listen)."""
+        start, total = 0, 1
+        while start < total:
+            data  = self.fetch({**params, "startIndex": start,
+                                "resultsPerPage": page_size})
+            total = data.get("totalResults", 0)
+            page  = data.get("vulnerabilities", [])
+            if not page:
+                return
+            yield page
+            start += len(page)
+
+    def search_mirror(self, name: str, version: str) -> list[CveMatch]:
+        """Sucht im lokalen NVD-Mirror – für jedes Paket, nicht nur Mapping-Pakete."""
+        product, vendor = map_package_name(name)
+        return [m for m in self.mirror.search(vendor, product,
+                                              self._clean_version(version))
+                if m.cvss_score >= self.min_cvss_score]
+
+    # Beide Suchen liefern None bei Netzwerk-/HTTP-Fehlern, damit ein Fehler
+    # nicht als "keine Schwachstellen" im Cache landet.
+
+    def _search(self, params: dict, label: str) -> Optional[list[CveMatch]]:
+        """Alle Seiten einer Suche – nicht mehr nach 100 Treffern abgeschnitten."""
         try:
-            resp = self.session.get(
-                self.BASE_URL,
-                params={"keywordSearch": f"{name} {clean_ver}",
-                        "keywordExactMatch": "false",
-                        "resultsPerPage": 100},
-                timeout=30,
-            )
-            if resp.status_code == 404:
-                return []   # 404 = keine Treffer, kein Fehler
-            resp.raise_for_status()
-            return self._parse(resp.json())
+            return [m for page in self.iter_pages(params)
+                    for m in self._parse({"vulnerabilities": page})]
         except requests.RequestException as e:
-            log.debug(f"NVD keyword '{name} {clean_ver}': {e}")
-            return []
+            log.debug(f"NVD {label}: {e}")
+            return None
+
+    def search_by_keyword(self, name: str, version: str) -> Optional[list[CveMatch]]:
+        clean_ver = self._clean_version(version)
+        return self._search({"keywordSearch": f"{name} {clean_ver}",
+                             "keywordExactMatch": "false"},
+                            f"keyword '{name} {clean_ver}'")
 
     def search_by_cpe(self, vendor: str, product: str,
-                      version: str) -> list[CveMatch]:
-        self._throttle()
+                      version: str) -> Optional[list[CveMatch]]:
         clean_ver = self._clean_version(version)
         v   = vendor.lower().replace(" ", "_").replace("-", "_") if vendor else "*"
         p   = product.lower().replace(" ", "_").replace("-", "_")
         cpe = f"cpe:2.3:*:{v}:{p}:{clean_ver or '*'}:*:*:*:*:*:*:*"
-        try:
-            resp = self.session.get(
-                self.BASE_URL,
-                params={"cpeName": cpe, "resultsPerPage": 100},
-                timeout=30,
-            )
-            if resp.status_code == 404:
-                return []   # 404 = keine Treffer, kein Fehler
-            resp.raise_for_status()
-            return self._parse(resp.json())
-        except requests.RequestException as e:
-            log.debug(f"NVD CPE '{cpe}': {e}")
-            return []
+        return self._search({"cpeName": cpe}, f"CPE '{cpe}'")
+
+    def lookup(self, name: str, version: str) -> tuple[list[CveMatch], bool]:
+        """CPE-Suche, bei leerem Ergebnis direkt die Keyword-Suche.
+
+        Läuft als ein Task im Worker-Pool: der Keyword-Fallback eines Pakets
+        startet sofort, während andere Worker schon weitere Pakete abfragen.
+        Liefert (cves, failed) – failed = mindestens eine Suche schlug fehl.
+        """
+        product, vendor = map_package_name(name)
+        cves, failed = None, False
+        if vendor:
+            cves   = self.search_by_cpe(vendor, product, version)
+            failed = cves is None
+        if not cves:
+            cves   = self.search_by_keyword(product, version)
+            failed = failed or cves is None
+        return cves or [], failed
 
     def _parse(self, data: dict) -> list[CveMatch]:
         results = []
         for item in data.get("vulnerabilities", []):
-            cve_data = item.get("cve", {})
-            cve_id   = cve_data.get("id", "")
-            desc     = next((d["value"] for d in cve_data.get("descriptions", [])
-                             if d.get("lang") == "en"), "")
-            score, severity, vector = 0.0, "NONE", ""
-            for key in ("cvssMetricV31", "cvssMetricV30", "cvssMetricV2"):
-                mlist = cve_data.get("metrics", {}).get(key, [])
-                if mlist:
-                    m        = mlist[0].get("cvssData", {})
-                    score    = float(m.get("baseScore", 0.0))
-                    severity = m.get("baseSeverity", "NONE").upper()
-                    vector   = m.get("vectorString", "")
-                    break
-            if score < self.min_cvss_score:
-                continue
-            results.append(CveMatch(
-                cve_id=cve_id, severity=severity, cvss_score=score,
-                cvss_vector=vector, description=desc[:500],
-                published=cve_data.get("published", ""),
-                last_modified=cve_data.get("lastModified", ""),
-                source="NVD",
-                references=[r.get("url", "")
-                            for r in cve_data.get("references", [])[:10]],
-            ))
+            match = self.cve_to_match(item.get("cve", {}))
+            if match.cvss_score >= self.min_cvss_score:
+                results.append(match)
         return results
 
+    @staticmethod
+    def cve_to_match(cve_data: dict) -> CveMatch:
+        """Ein "cve"-Objekt der API 2.0 bzw. der JSON-2.0-Feeds → CveMatch."""
+        desc = next((d["value"] for d in cve_data.get("descriptions", [])
+                     if d.get("lang") == "en"), "")
+        score, severity, vector = 0.0, "NONE", ""
+        for key in ("cvssMetricV31", "cvssMetricV30", "cvssMetricV2"):
+            mlist = cve_data.get("metrics", {}).get(key, [])
+            if mlist:
+                m        = mlist[0].get("cvssData", {})
+                score    = float(m.get("baseScore", 0.0))
+                # CVSS v2 führt baseSeverity neben cvssData
+                severity = (m.get("baseSeverity") or mlist[0].get("baseSeverity")
+                            or "NONE").upper()
+                vector   = m.get("vectorString", "")
+                break
+        return CveMatch(
+            cve_id=cve_data.get("id", ""), severity=severity, cvss_score=score,
+            cvss_vector=vector, description=desc[:500],
+            published=cve_data.get("published", ""),
+            last_modified=cve_data.get("lastModified", ""),
+            source="NVD",
+            references=[r.get("url", "")
+                        for r in cve_data.get("references", [])[:10]],
+        )
+
 
 # ---------------------------------------------------------------------------
-# OSV.dev API Client
+# NVD Mirror – CVE-Daten lokal, inkrementell per lastModStartDate
 # ---------------------------------------------------------------------------
 
-class OsvClient:
-    def __init__(self, min_cvss_score: float = 0.0):
-        self.min_cvss_score = min_cvss_score
-        self.session        = requests.Session()
-        self.session.headers.update({
-            "Content-Type": "application/json",
-            "Accept":       "application/json",
-            "User-Agent":   "checkmk-cve-scanner/3.0",
-        })
+_CPE_SPLIT_RE = re.compile(r"(?<!\\):")
 
-    def detect_ecosystem(self, sw: SoftwareEntry) -> Optional[str]:
-        """Bestimmt das OSV-Ecosystem für ein Paket.
 
-        OSV erwartet für Debian/Ubuntu die Versionsnummer im Ecosystem:
-          "Debian:12" statt "Debian"  → nur Treffer für Debian 12
-          "Ubuntu:22.04" statt "Ubuntu"
+class NvdMirror:
+    """Lokaler Spiegel der NVD CVE-Daten (API 2.0) mit CPE-Index.
 
-        Ohne Versionsnummer liefert OSV zu viele unspezifische oder
-        falsche Treffer (Pakete anderer Distro-Versionen).
-        """
-        # 1. OS-Name hat höchste Priorität (Ubuntu != Debian, auch wenn beide "deb")
-        for os_key, eco in OSV_OS_ECOSYSTEM_MAP.items():
-            if eco and os_key in sw.os_name:
-                return self._versioned_eco(eco, sw.os_version)
+    Tabellen (SQLite):
+      cves       – je CVE die kompakten CveMatch-Felder (JSON)
+      cpe_match  – invertierter Index über alle verwundbaren cpeMatch-
+                   Einträge der configurations: (product, vendor) →
+                   CVE + Version bzw. Versionsbereich
+      sync_state – Zeitpunkt der letzten Synchronisation
 
-        # 2. Ecosystem aus package_type (deb → Debian, rpm → Red Hat, ...)
-        #    Nur als Fallback wenn OS-Name keinen Treffer ergab
-        for key, eco in OSV_ECOSYSTEM_MAP.items():
-            if key in sw.package_type.lower():
-                return self._versioned_eco(eco, sw.os_version)
+    Erstimport über alle Seiten der API (startIndex, 2000 pro Seite) oder
+    aus den JSON-2.0-Feeds (nvdcve-2.0-<jahr>.json.gz, --nvd-import),
+    danach nur noch Änderungen per lastModStartDate/-EndDate.
 
-        # 3. Fallback: vendor
-        for key, eco in OSV_ECOSYSTEM_MAP.items():
-            if key in sw.vendor.lower():
-                return eco
+    Vereinfachung: AND-Knoten ("App X auf Plattform Y") werden wie OR
+    behandelt – nur die verwundbaren cpeMatch-Einträge zählen.
+    """
 
-        return None
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cves (
+            id            TEXT NOT NULL PRIMARY KEY,
+            last_modified TEXT NOT NULL,
+            data          TEXT NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS cpe_match (
+            product     TEXT NOT NULL,
+            vendor      TEXT NOT NULL,
+            cve_id      TEXT NOT NULL,
+            version     TEXT NOT NULL,
+            start_incl  TEXT NOT NULL DEFAULT '',
+            start_excl  TEXT NOT NULL DEFAULT '',
+            end_incl    TEXT NOT NULL DEFAULT '',
+            end_excl    TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS cpe_match_product ON cpe_match (product, vendor);
+        CREATE INDEX IF NOT EXISTS cpe_match_cve     ON cpe_match (cve_id);
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key   TEXT NOT NULL PRIMARY KEY,
+            value TEXT NOT NULL
+        ) WITHOUT ROWID;
+    """
 
-    @staticmethod
-    def _versioned_eco(eco: str, os_version: str) -> str:
-        """Hängt OS-Version an Ecosystem an: 'Debian' + '12' → 'Debian:12'."""
-        distros_with_version = {"Debian", "Ubuntu", "Red Hat", "Rocky Linux",
-                                 "AlmaLinux", "openSUSE", "SUSE", "Fedora",
-                                 "Alpine", "Arch Linux"}
-        if eco in distros_with_version and os_version:
-            return f"{eco}:{os_version}"
-        return eco
+    def __init__(self, db_file: str = "/tmp/cve_scanner_nvd_mirror.sqlite"):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # Abfragen laufen im Thread der jeweiligen Quellen-Phase
+        self._db = sqlite3.connect(str(self.db_file), timeout=60,
+                                   isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(self.SCHEMA)
 
-    def query_batch(self, sw_list: list[SoftwareEntry]
-                    ) -> dict[str, list[CveMatch]]:
-        results: dict[str, list[CveMatch]] = {}
-        total = len(sw_list)
+    # ── Status ───────────────────────────────────────────────────────────
 
-        for batch_start in range(0, total, OSV_BATCH_SIZE):
-            batch = sw_list[batch_start:batch_start + OSV_BATCH_SIZE]
-            log.info(
-                f"  OSV Batch {batch_start // OSV_BATCH_SIZE + 1}/"
-                f"{(total + OSV_BATCH_SIZE - 1) // OSV_BATCH_SIZE}: "
-                f"{len(batch)} Pakete"
+    def _state(self, key: str) -> str:
+        row = self._db.execute("SELECT value FROM sync_state WHERE key = ?",
+                               (key,)).fetchone()
+        return row[0] if row else ""
+
+    def _set_state(self, key: str, value: str):
+        self._db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                         (key, value))
+
+    def last_sync(self) -> Optional[datetime]:
+        value = self._state("last_sync")
+        return datetime.fromisoformat(value) if value else None
+
+    def count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM cves").fetchone()[0]
+
+    # ── Import ───────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _cpe_rows(cve_data: dict) -> list[tuple]:
+        rows, cve_id = set(), cve_data.get("id", "")
+        for conf in cve_data.get("configurations", []):
+            for node in conf.get("nodes", []):
+                for cm in node.get("cpeMatch", []):
+                    if not cm.get("vulnerable"):
+                        continue
+                    parts = _CPE_SPLIT_RE.split(cm.get("criteria", ""))
+                    if len(parts) < 6:
+                        continue
+                    rows.add((parts[4].lower(), parts[3].lower(), cve_id,
+                              parts[5].replace("\\", ""),
+                              cm.get("versionStartIncluding", ""),
+                              cm.get("versionStartExcluding", ""),
+                              cm.get("versionEndIncluding", ""),
+                              cm.get("versionEndExcluding", "")))
+        return list(rows)
+
+    def store(self, vulnerabilities: list[dict]) -> int:
+        """Übernimmt die "vulnerabilities" einer API-Seite bzw. eines Feeds.
+
+        Je CVE werden die Index-Einträge ersetzt; zurückgezogene CVEs
+        (vulnStatus "Rejected") werden entfernt.
+        """
+        ids, cve_rows, cpe_rows = [], [], []
+        for item in vulnerabilities:
+            cve_data = item.get("cve", {})
+            cve_id   = cve_data.get("id")
+            if not cve_id:
+                continue
+            ids.append((cve_id,))
+            if cve_data.get("vulnStatus") == "Rejected":
+                continue
+            cve_rows.append((cve_id, cve_data.get("lastModified", ""),
+                             json.dumps(asdict(NvdClient.cve_to_match(cve_data)),
+                                        separators=(",", ":"))))
+            cpe_rows.extend(self._cpe_rows(cve_data))
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.executemany("DELETE FROM cpe_match WHERE cve_id = ?", ids)
+            self._db.executemany("DELETE FROM cves WHERE id = ?", ids)
+            self._db.executemany("INSERT INTO cves VALUES (?, ?, ?)", cve_rows)
+            self._db.executemany(
+                "INSERT INTO cpe_match VALUES (?, ?, ?, ?, ?, ?, ?, ?)", cpe_rows)
+        return len(ids)
+
+    def import_feed(self, path: Path) -> int:
+        """Importiert einen NVD JSON-2.0-Feed (nvdcve-2.0-*.json[.gz])."""
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as fh:
+            feed = json.load(fh)
+        count = self.store(feed.get("vulnerabilities", []))
+        # Ohne bisherigen Sync ab dem Feed-Zeitstempel inkrementell weiter
+        stamp = feed.get("timestamp", "")
+        if stamp and not self._state("last_sync"):
+            ts = datetime.fromisoformat(stamp.replace("Z", "+00:00"))
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            self._set_state("last_sync", ts.isoformat())
+        log.info(f"NVD Mirror: {count} CVEs aus {path.name} importiert")
+        return count
+
+    def _pull(self, client: "NvdClient", params: dict) -> int:
+        """Alle Seiten einer Abfrage per startIndex laden und speichern."""
+        count = 0
+        for page in client.iter_pages(params):
+            count += self.store(page)
+            log.info(f"  NVD Mirror: {count} CVEs geladen")
+        return count
+
+    def sync(self, client: "NvdClient") -> bool:
+        """Erstimport (alle CVEs) bzw. Änderungen seit dem letzten Sync.
+
+        Der Sync-Zeitpunkt wird erst nach vollständigem Erfolg gesetzt –
+        ein abgebrochener Lauf wird beim nächsten Mal wiederholt.
+        """
+        started = datetime.now(timezone.utc)
+        since   = self.last_sync()
+        try:
+            if since is None:
+                log.info("NVD Mirror: Erstimport aller CVEs (dauert ohne API-Key lange)")
+                count = self._pull(client, {})
+            else:
+                count = 0
+                while since < started:
+                    until  = min(since + timedelta(days=NVD_SYNC_WINDOW), started)
+                    count += self._pull(client, {
+                        "lastModStartDate": since.isoformat(timespec="milliseconds"),
+                        "lastModEndDate":   until.isoformat(timespec="milliseconds"),
+                    })
+                    since = until
+        except requests.RequestException as e:
+            log.warning(f"NVD Mirror: Sync abgebrochen ({e}) – Stand bleibt erhalten")
+            return False
+        self._set_state("last_sync", started.isoformat())
+        log.info(f"NVD Mirror: {count} CVEs aktualisiert, {self.count()} gesamt")
+        return True
+
+    # ── Abfrage ──────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _in_range(version: str, exact: str, start_incl: str, start_excl: str,
+                  end_incl: str, end_excl: str) -> bool:
+        cmp = generic_version_cmp
+        if exact not in ("*", "-", ""):
+            return cmp(version, exact) == 0
+        if start_incl and cmp(version, start_incl) < 0:
+            return False
+        if start_excl and cmp(version, start_excl) <= 0:
+            return False
+        if end_incl and cmp(version, end_incl) > 0:
+            return False
+        if end_excl and cmp(version, end_excl) >= 0:
+            return False
+        return True
+
+    def search(self, vendor: Optional[str], product: str,
+               version: str) -> list[CveMatch]:
+        """CVEs für (vendor, product, version) – ohne Vendor über alle Vendoren."""
+        p = product.lower().replace(" ", "_")
+        products = sorted({p, p.replace("-", "_")})
+        sql = (f"SELECT m.cve_id, m.version, m.start_incl, m.start_excl, "
+               f"m.end_incl, m.end_excl, c.data FROM cpe_match m "
+               f"JOIN cves c ON c.id = m.cve_id "
+               f"WHERE m.product IN ({','.join('?' * len(products))})")
+        params: list = list(products)
+        if vendor:
+            sql += " AND m.vendor = ?"
+            params.append(vendor.lower().replace(" ", "_").replace("-", "_"))
+        found: dict[str, CveMatch] = {}
+        for cve_id, *rng, data in self._db.execute(sql, params):
+            if cve_id not in found and self._in_range(version, *rng):
+                found[cve_id] = CveMatch(**json.loads(data))
+        return list(found.values())
+
+
+# ---------------------------------------------------------------------------
+# OSV Advisory Store – Details nur einmal laden, bis sie sich ändern
+# ---------------------------------------------------------------------------
+
+class OsvVulnStore:
+    """Persistenter Speicher für OSV-Advisories (GET /v1/vulns/<id>).
+
+    Liegt als eigene Tabelle in der SQLite-Datei des ApiCache. Schlüssel ist
+    die OSV-ID; ein Eintrag gilt, solange sein "modified" mit dem Wert aus
+    der querybatch-Antwort übereinstimmt – ändert OSV das Advisory, wird es
+    neu geladen. Thread-sicher (RLock wie ApiCache), da die OSV-Phase
+    parallel zu OSS und NVD läuft.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS osv_vulns (
+            id       TEXT NOT NULL PRIMARY KEY,
+            modified TEXT NOT NULL,
+            data     TEXT NOT NULL,
+            fetched  REAL NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_file: Path):
+        self.db_file = Path(db_file)
+        self._pending: list[tuple] = []
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.db_file), timeout=30,
+                                   isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(self.SCHEMA)
+
+    def get_many(self, ids: list[str]) -> dict[str, tuple[str, dict]]:
+        """OSV-ID → (modified, advisory) für alle gespeicherten IDs."""
+        found: dict[str, tuple[str, dict]] = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT id, modified, data FROM osv_vulns "
+                    f"WHERE id IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+            for vid, modified, data in rows:
+                found[vid] = (modified, json.loads(data))
+        return found
+
+    def put(self, vid: str, modified: str, data: dict):
+        row = (vid, modified, json.dumps(data, separators=(",", ":")), time.time())
+        with self._lock:
+            self._pending.append(row)
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            try:
+                with self._db:
+                    self._db.execute("BEGIN IMMEDIATE")
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO osv_vulns VALUES (?, ?, ?, ?)",
+                        self._pending)
+                self._pending.clear()
+            except sqlite3.Error as e:
+                log.warning(f"OSV-Store konnte nicht geschrieben werden: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Versionsvergleich (für den Offline-Abgleich gegen OSV "affected"-Ranges)
+# ---------------------------------------------------------------------------
+# Alle Funktionen liefern -1 / 0 / 1 wie cmp().
+
+def _sign(x: int) -> int:
+    return (x > 0) - (x < 0)
+
+
+def _dpkg_order(c: str) -> int:
+    if c == "~":
+        return -1
+    if c.isdigit():
+        return 0
+    if c.isalpha():
+        return ord(c)
+    return ord(c) + 256
+
+
+def _dpkg_verrevcmp(a: str, b: str) -> int:
+    """Nachbau von verrevcmp() aus dpkg (lib/dpkg/version.c)."""
+    i = j = 0
+    la, lb = len(a), len(b)
+    while i < la or j < lb:
+        while (i < la and not a[i].isdigit()) or (j < lb and not b[j].isdigit()):
+            ac = _dpkg_order(a[i]) if i < la else 0
+            bc = _dpkg_order(b[j]) if j < lb else 0
+            if ac != bc:
+                return _sign(ac - bc)
+            i += 1
+            j += 1
+        while i < la and a[i] == "0":
+            i += 1
+        while j < lb and b[j] == "0":
+            j += 1
+        first_diff = 0
+        while i < la and a[i].isdigit() and j < lb and b[j].isdigit():
+            if not first_diff:
+                first_diff = ord(a[i]) - ord(b[j])
+            i += 1
+            j += 1
+        if i < la and a[i].isdigit():
+            return 1
+        if j < lb and b[j].isdigit():
+            return -1
+        if first_diff:
+            return _sign(first_diff)
+    return 0
+
+
+def _split_evr(v: str) -> tuple[int, str, str]:
+    """[epoch:]version[-revision] → (epoch, version, revision)."""
+    epoch, version = 0, v.strip()
+    head, sep, tail = version.partition(":")
+    if sep and head.isdigit():
+        epoch, version = int(head), tail
+    version, sep, revision = version.rpartition("-")
+    if not sep:
+        version, revision = revision, ""
+    return epoch, version, revision
+
+
+def dpkg_version_cmp(a: str, b: str) -> int:
+    """Debian/Ubuntu: Vergleich wie dpkg --compare-versions."""
+    ea, va, ra = _split_evr(a)
+    eb, vb, rb = _split_evr(b)
+    if ea != eb:
+        return _sign(ea - eb)
+    return _dpkg_verrevcmp(va, vb) or _dpkg_verrevcmp(ra, rb)
+
+
+def _rpmvercmp(a: str, b: str) -> int:
+    """Nachbau von rpmvercmp() inkl. "~" (vor allem) und "^" (nach Basis)."""
+    if a == b:
+        return 0
+    i = j = 0
+    la, lb = len(a), len(b)
+    while i < la or j < lb:
+        while i < la and not a[i].isalnum() and a[i] not in "~^":
+            i += 1
+        while j < lb and not b[j].isalnum() and b[j] not in "~^":
+            j += 1
+        if (i < la and a[i] == "~") or (j < lb and b[j] == "~"):
+            if i >= la or a[i] != "~":
+                return 1
+            if j >= lb or b[j] != "~":
+                return -1
+            i += 1
+            j += 1
+            continue
+        if (i < la and a[i] == "^") or (j < lb and b[j] == "^"):
+            if i >= la:
+                return -1
+            if j >= lb:
+                return 1
+            if a[i] != "^":
+                return 1
+            if b[j] != "^":
+                return -1
+            i += 1
+            j += 1
+            continue
+        if i >= la or j >= lb:
+            break
+        si, sj = i, j
+        isnum = a[i].isdigit()
+        test = str.isdigit if isnum else str.isalpha
+        while i < la and test(a[i]):
+            i += 1
+        while j < lb and test(b[j]):
+            j += 1
+        seg_a, seg_b = a[si:i], b[sj:j]
+        if not seg_b:
+            return 1 if isnum else -1
+        if isnum:
+            seg_a, seg_b = seg_a.lstrip("0"), seg_b.lstrip("0")
+            if len(seg_a) != len(seg_b):
+                return _sign(len(seg_a) - len(seg_b))
+        if seg_a != seg_b:
+            return 1 if seg_a > seg_b else -1
+    if i >= la and j >= lb:
+        return 0
+    return -1 if i >= la else 1
+
+
+def rpm_version_cmp(a: str, b: str) -> int:
+    """RHEL/Rocky/Alma/SUSE: Vergleich wie rpm (epoch, version, release)."""
+    ea, va, ra = _split_evr(a)
+    eb, vb, rb = _split_evr(b)
+    if ea != eb:
+        return _sign(ea - eb)
+    c = _rpmvercmp(va, vb)
+    if c or not ra or not rb:
+        return c
+    return _rpmvercmp(ra, rb)
+
+
+_APK_RE = re.compile(r"^(\d+(?:\.\d+)*)([a-z]?)((?:_[a-z]+\d*)*)(?:-r(\d+))?$")
+_APK_SUFFIX = {"alpha": -4, "beta": -3, "pre": -2, "rc": -1,
+               "cvs": 1, "svn": 2, "git": 3, "hg": 4, "p": 5}
+
+
+def apk_version_cmp(a: str, b: str) -> int:
+    """Alpine/Wolfi: 1.2.3[a][_rc1...][-r4] wie apk-tools."""
+    ma, mb = _APK_RE.match(a.strip()), _APK_RE.match(b.strip())
+    if not ma or not mb:
+        return generic_version_cmp(a, b)
+    na = [int(x) for x in ma.group(1).split(".")]
+    nb = [int(x) for x in mb.group(1).split(".")]
+    if na != nb:
+        return 1 if na > nb else -1
+    if ma.group(2) != mb.group(2):
+        return 1 if ma.group(2) > mb.group(2) else -1
+    sa = [(_APK_SUFFIX.get(n, 0), int(d or 0))
+          for n, d in re.findall(r"_([a-z]+)(\d*)", ma.group(3))]
+    sb = [(_APK_SUFFIX.get(n, 0), int(d or 0))
+          for n, d in re.findall(r"_([a-z]+)(\d*)", mb.group(3))]
+    width = max(len(sa), len(sb))
+    sa += [(0, 0)] * (width - len(sa))
+    sb += [(0, 0)] * (width - len(sb))
+    if sa != sb:
+        return 1 if sa > sb else -1
+    return _sign(int(ma.group(4) or 0) - int(mb.group(4) or 0))
+
+
+def generic_version_cmp(a: str, b: str) -> int:
+    """Fallback: Ziffern numerisch, Rest als Text (1.2.10 > 1.2.9)."""
+    def key(v: str) -> list:
+        return [(0, int(t), "") if t.isdigit() else (1, 0, t)
+                for t in re.findall(r"\d+|[^\d.\-+_~]+", v)]
+    ka, kb = key(a), key(b)
+    return 0 if ka == kb else (1 if ka > kb else -1)
+
+
+def version_cmp_for(ecosystem: str) -> Callable[[str, str], int]:
+    base = ecosystem.split(":", 1)[0]
+    if base in ("Debian", "Ubuntu"):
+        return dpkg_version_cmp
+    if base in ("Red Hat", "Rocky Linux", "AlmaLinux", "SUSE", "openSUSE", "Fedora"):
+        return rpm_version_cmp
+    if base in ("Alpine", "Wolfi"):
+        return apk_version_cmp
+    return generic_version_cmp
+
+
+def osv_version_affected(entry: dict, version: str,
+                         cmp: Callable[[str, str], int]) -> bool:
+    """Prüft einen OSV "affected"-Eintrag (versions + ranges) für version.
+
+    Auswertung nach OSV-Schema: Events nach Version sortiert ablaufen,
+    introduced schaltet ein, fixed / limit (>=) und last_affected (>) aus.
+    GIT-Ranges werden ignoriert (keine Commits im Inventory).
+    """
+    if version in entry.get("versions", ()):
+        return True
+    for rng in entry.get("ranges", ()):
+        rtype = rng.get("type")
+        if rtype == "GIT":
+            continue
+        c = cmp if rtype == "ECOSYSTEM" else generic_version_cmp
+
+        def ev_version(ev: dict) -> str:
+            return next(iter(ev.values()), "0")
+
+        def ev_cmp(x: dict, y: dict) -> int:
+            vx, vy = ev_version(x), ev_version(y)
+            if vx == vy:
+                return 0
+            if vx == "0":
+                return -1
+            if vy == "0":
+                return 1
+            return c(vx, vy)
+
+        affected = False
+        for ev in sorted(rng.get("events", ()), key=cmp_to_key(ev_cmp)):
+            if "introduced" in ev:
+                if ev["introduced"] == "0" or c(version, ev["introduced"]) >= 0:
+                    affected = True
+            elif "fixed" in ev:
+                if c(version, ev["fixed"]) >= 0:
+                    affected = False
+            elif "last_affected" in ev:
+                if c(version, ev["last_affected"]) > 0:
+                    affected = False
+            elif "limit" in ev:
+                if c(version, ev["limit"]) >= 0:
+                    affected = False
+        if affected:
+            return True
+    return False
+
+
+def _ecosystem_matches(wanted: str, entry_eco: str) -> bool:
+    """"Debian:12" passt zu "Debian:12", "Ubuntu:22" zu "Ubuntu:22.04:LTS",
+    ein unversioniertes "Debian" zu allen Debian-Releases."""
+    if wanted == entry_eco:
+        return True
+    base, _, release = wanted.partition(":")
+    e_base, _, e_release = entry_eco.partition(":")
+    if base != e_base:
+        return False
+    if not release:
+        return True
+    e_release = e_release.lstrip("v")
+    return e_release == release or e_release.startswith((release + ".", release + ":"))
+
+
+# ---------------------------------------------------------------------------
+# OSV Offline-Datenbank – Ecosystem-Dumps (<ecosystem>/all.zip) lokal
+# ---------------------------------------------------------------------------
+
+class OsvOfflineDb:
+    """Lokaler OSV-Index aus den Ecosystem-Dumps von OSV.
+
+    OSV veröffentlicht pro Ecosystem ein Zip mit allen Advisories:
+      https://osv-vulnerabilities.storage.googleapis.com/Debian/all.zip
+
+    Tabellen (SQLite):
+      vulns     – Advisory-JSON je OSV-ID
+      affected  – invertierter Index: Paketname → (Ecosystem, OSV-ID,
+                  "affected"-Eintrag), Lookup über den Namen
+      dumps     – importierte Dumps mit ETag / Last-Modified für
+                  bedingte Downloads (304 = unverändert, kein Download)
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS vulns (
+            id       TEXT NOT NULL PRIMARY KEY,
+            modified TEXT NOT NULL,
+            data     TEXT NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS affected (
+            name      TEXT NOT NULL,
+            ecosystem TEXT NOT NULL,
+            id        TEXT NOT NULL,
+            entry     TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS affected_name ON affected (name);
+        CREATE INDEX IF NOT EXISTS affected_id   ON affected (id);
+        CREATE TABLE IF NOT EXISTS dumps (
+            dump          TEXT NOT NULL PRIMARY KEY,
+            etag          TEXT NOT NULL DEFAULT '',
+            last_modified TEXT NOT NULL DEFAULT '',
+            imported      REAL NOT NULL,
+            vulns         INTEGER NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_file: str = "/tmp/cve_scanner_osv_offline.sqlite",
+                 dump_url: str = OSV_DUMP_URL,
+                 http: Optional[HttpTransport] = None):
+        self.db_file  = Path(db_file)
+        self.dump_url = dump_url.rstrip("/")
+        self.http     = http or HttpTransport()
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # Abfragen laufen im Thread der jeweiligen Quellen-Phase
+        self._db = sqlite3.connect(str(self.db_file), timeout=60,
+                                   isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(self.SCHEMA)
+
+    def dumps(self) -> dict[str, int]:
+        """Importierte Dumps → Anzahl Advisories."""
+        return dict(self._db.execute("SELECT dump, vulns FROM dumps"))
+
+    def import_zip(self, zip_path: Path, dump: str,
+                   etag: str = "", last_modified: str = "") -> int:
+        """Importiert ein OSV-Zip (eine JSON-Datei pro Advisory)."""
+        count = 0
+        vulns_rows: list[tuple] = []
+        affected_rows: list[tuple] = []
+        ids: list[tuple] = []
+
+        def flush():
+            self._db.executemany("DELETE FROM affected WHERE id = ?", ids)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO vulns VALUES (?, ?, ?)", vulns_rows)
+            self._db.executemany(
+                "INSERT INTO affected VALUES (?, ?, ?, ?)", affected_rows)
+            ids.clear()
+            vulns_rows.clear()
+            affected_rows.clear()
+
+        with zipfile.ZipFile(zip_path) as zf, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            for info in zf.infolist():
+                if not info.filename.endswith(".json"):
+                    continue
+                try:
+                    vuln = json.loads(zf.read(info))
+                except (ValueError, zipfile.BadZipFile) as e:
+                    log.debug(f"OSV-Dump {dump}: {info.filename} übersprungen: {e}")
+                    continue
+                vid = vuln.get("id")
+                if not vid:
+                    continue
+                ids.append((vid,))
+                vulns_rows.append((vid, vuln.get("modified", ""),
+                                   json.dumps(vuln, separators=(",", ":"))))
+                for entry in vuln.get("affected", []):
+                    pkg = entry.get("package", {})
+                    if pkg.get("name"):
+                        affected_rows.append((
+                            pkg["name"].lower(), pkg.get("ecosystem", ""), vid,
+                            json.dumps({k: entry[k] for k in ("versions", "ranges")
+                                        if k in entry}, separators=(",", ":"))))
+                count += 1
+                if len(ids) >= 1000:
+                    flush()
+            flush()
+            self._db.execute(
+                "INSERT OR REPLACE INTO dumps VALUES (?, ?, ?, ?, ?)",
+                (dump, etag, last_modified, time.time(), count))
+        log.info(f"OSV offline: {count} Advisories aus {dump} importiert")
+        return count
+
+    def sync(self, dumps: list[str]):
+        """Lädt die Dumps (bedingt per ETag/Last-Modified) und importiert sie."""
+        known = {d: (e, lm) for d, e, lm in
+                 self._db.execute("SELECT dump, etag, last_modified FROM dumps")}
+        for dump in dumps:
+            url = f"{self.dump_url}/{quote(dump)}/all.zip"
+            etag, last_mod = known.get(dump, ("", ""))
+            try:
+                with self.http.get_if_changed(url, etag, last_mod, stream=True,
+                                              timeout=300) as resp:
+                    if resp.status_code == 304:
+                        log.info(f"OSV offline: {dump} unverändert")
+                        continue
+                    resp.raise_for_status()
+                    with tempfile.NamedTemporaryFile(
+                            dir=self.db_file.parent, suffix=".zip") as tmp:
+                        for block in resp.iter_content(1 << 20):
+                            tmp.write(block)
+                        tmp.flush()
+                        self.import_zip(Path(tmp.name), dump,
+                                        resp.headers.get("ETag", ""),
+                                        resp.headers.get("Last-Modified", ""))
+            except (requests.RequestException, OSError, zipfile.BadZipFile) as e:
+                log.warning(f"OSV offline: Dump {dump} nicht geladen: {e}")
+
+    def lookup(self, name: str) -> list[tuple[str, str, dict]]:
+        """Alle (ecosystem, id, affected-Eintrag) für einen Paketnamen."""
+        return [(eco, vid, json.loads(entry)) for eco, vid, entry in
+                self._db.execute("SELECT ecosystem, id, entry FROM affected "
+                                 "WHERE name = ?", (name.lower(),))]
+
+    def vuln(self, vid: str) -> Optional[dict]:
+        row = self._db.execute("SELECT data FROM vulns WHERE id = ?",
+                               (vid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+# ---------------------------------------------------------------------------
+# OSV.dev API Client
+# ---------------------------------------------------------------------------
+
+class OsvClient:
+    def __init__(self, min_cvss_score: float = 0.0,
+                 detail_workers: int = OSV_DETAIL_WORKERS,
+                 store: Optional[OsvVulnStore] = None,
+                 offline: Optional[OsvOfflineDb] = None,
+                 offline_sync: bool = False,
+                 offline_dumps: Optional[list[str]] = None,
+                 http: Optional[HttpTransport] = None):
+        self.min_cvss_score = min_cvss_score
+        self.detail_workers = max(1, detail_workers)
+        self.store          = store
+        self.offline        = offline         # gesetzt = lokal abgleichen, keine API
+        self.offline_sync   = offline_sync
+        self.offline_dumps  = offline_dumps or []
+        # Scan-weit: OSV-ID → geparstes Advisory (None = nicht parsebar)
+        self._vulns: dict[str, Optional[CveMatch]] = {}
+        self.http           = http or HttpTransport(pool_size=self.detail_workers)
+        self.headers        = {"Accept": "application/json"}
+
+    def detect_ecosystem(self, sw: SoftwareEntry) -> Optional[str]:
+        """Bestimmt das OSV-Ecosystem für ein Paket.
+
+        OSV erwartet für Debian/Ubuntu die Versionsnummer im Ecosystem:
+          "Debian:12" statt "Debian"  → nur Treffer für Debian 12
+          "Ubuntu:22.04" statt "Ubuntu"
+
+        Ohne Versionsnummer liefert OSV zu viele unspezifische oder
+        falsche Treffer (Pakete anderer Distro-Versionen).
+        """
+        # 1. OS-Name hat höchste Priorität (Ubuntu != Debian, auch wenn beide "deb")
+        for os_key, eco in OSV_OS_ECOSYSTEM_MAP.items():
+            if eco and os_key in sw.os_name:
+                return self._versioned_eco(eco, sw.os_version)
+
+        # 2. Ecosystem aus package_type (deb → Debian, rpm → Red Hat, ...)
+        #    Nur als Fallback wenn OS-Name keinen Treffer ergab
+        for key, eco in OSV_ECOSYSTEM_MAP.items():
+            if key in sw.package_type.lower():
+                return self._versioned_eco(eco, sw.os_version)
+
+        # 3. Fallback: vendor
+        for key, eco in OSV_ECOSYSTEM_MAP.items():
+            if key in sw.vendor.lower():
+                return eco
+
+        return None
+
+    @staticmethod
+    def _versioned_eco(eco: str, os_version: str) -> str:
+        """Hängt OS-Version an Ecosystem an: 'Debian' + '12' → 'Debian:12'."""
+        distros_with_version = {"Debian", "Ubuntu", "Red Hat", "Rocky Linux",
+                                 "AlmaLinux", "openSUSE", "SUSE", "Fedora",
+                                 "Alpine", "Arch Linux"}
+        if eco in distros_with_version and os_version:
+            return f"{eco}:{os_version}"
+        return eco
+
+    def query_batch(self, sw_list: list[SoftwareEntry]
+                    ) -> dict[str, list[CveMatch]]:
+        """Fragt OSV in 100er Batches ab.
+
+        Jedes erfolgreich abgefragte Paket ist im Ergebnis enthalten, auch
+        ohne Treffer (leere Liste). Pakete aus fehlgeschlagenen Batches
+        oder mit mindestens einem nicht abrufbaren Advisory fehlen und
+        werden beim nächsten Lauf erneut abgefragt.
+
+        Die Advisory-Details werden erst nach allen Batches geladen – jede
+        OSV-ID nur einmal pro Scan (siehe _resolve_details).
+        Im Offline-Modus wird stattdessen lokal abgeglichen (query_offline).
+        """
+        if self.offline is not None:
+            return self.query_offline(sw_list)
+        results:    dict[str, list[CveMatch]] = {}
+        key_to_ids: dict[str, list[str]]      = {}
+        wanted:     dict[str, str]            = {}   # OSV-ID → modified
+        total = len(sw_list)
+
+        for batch_start in range(0, total, OSV_BATCH_SIZE):
+            batch = sw_list[batch_start:batch_start + OSV_BATCH_SIZE]
+            log.info(
+                f"  OSV Batch {batch_start // OSV_BATCH_SIZE + 1}/"
+                f"{(total + OSV_BATCH_SIZE - 1) // OSV_BATCH_SIZE}: "
+                f"{len(batch)} Pakete"
             )
 
             queries, batch_keys = [], []
@@ -974,9 +2604,10 @@ class OsvClient:
                 batch_keys.append(key)
 
             try:
-                resp = self.session.post(
+                resp = self.http.post(
                     OSV_QUERYBATCH_URL,
                     json={"queries": queries},
+                    headers=self.headers,
                     timeout=60,
                 )
                 resp.raise_for_status()
@@ -985,39 +2616,115 @@ class OsvClient:
                 log.warning(f"OSV Batch Fehler: {e}")
                 continue
 
-            ids_to_fetch: list[str]          = []
-            key_to_ids:   dict[str, list[str]] = {}
+            for key in batch_keys:
+                results[key] = []
+
             for idx, result in enumerate(batch_results):
-                key      = batch_keys[idx]
-                vuln_ids = [v["id"] for v in result.get("vulns", [])]
-                if vuln_ids:
-                    key_to_ids[key] = vuln_ids
-                    ids_to_fetch.extend(vuln_ids)
-
-            vuln_details = self._fetch_details(list(set(ids_to_fetch)))
-
-            for key, ids in key_to_ids.items():
-                cve_list = []
-                for vid in ids:
-                    if vid in vuln_details:
-                        m = self._parse_osv_vuln(vuln_details[vid])
-                        if m and m.cvss_score >= self.min_cvss_score:
-                            cve_list.append(m)
-                if cve_list:
-                    results[key] = cve_list
+                vulns = result.get("vulns", [])
+                if vulns:
+                    key_to_ids[batch_keys[idx]] = [v["id"] for v in vulns]
+                    for v in vulns:
+                        wanted[v["id"]] = v.get("modified", "")
+
+        self._resolve_details(wanted)
+
+        for key, ids in key_to_ids.items():
+            if any(vid not in self._vulns for vid in ids):
+                # Details (teilweise) nicht abrufbar – weder als "keine" noch
+                # als vollständige Schwachstellen-Liste werten (nicht cachen)
+                del results[key]
+                continue
+            results[key] = [replace(m) for m in map(self._vulns.get, ids)
+                            if m and m.cvss_score >= self.min_cvss_score]
 
         return results
 
-    def _fetch_details(self, vuln_ids: list[str]) -> dict[str, dict]:
-        details: dict[str, dict] = {}
-        for vid in vuln_ids:
-            try:
-                resp = self.session.get(f"{OSV_VULNS_URL}/{vid}", timeout=15)
-                if resp.status_code == 200:
-                    details[vid] = resp.json()
-            except requests.RequestException as e:
-                log.debug(f"OSV Detail '{vid}': {e}")
-        return details
+    def query_offline(self, sw_list: list[SoftwareEntry]
+                      ) -> dict[str, list[CveMatch]]:
+        """Abgleich gegen die lokale OsvOfflineDb – kein Netzwerk (außer Sync).
+
+        Liefert dieselbe Struktur und dieselben CveMatch-Objekte
+        (_parse_osv_vuln) wie die API-Variante.
+        """
+        ecosystems = {self.detect_ecosystem(sw) for sw in sw_list} - {None}
+        dumps = self.offline_dumps or sorted({e.split(":", 1)[0] for e in ecosystems})
+        if self.offline_sync:
+            self.offline.sync(dumps)
+        available = self.offline.dumps()
+        missing = [d for d in dumps if d not in available]
+        if missing:
+            log.warning(f"OSV offline: keine Daten für {', '.join(missing)} – "
+                        f"--osv-sync oder --osv-import ausführen")
+
+        results: dict[str, list[CveMatch]] = {}
+        for sw in sw_list:
+            key = f"{sw.name.lower()}|{sw.version.lower()}"
+            results[key] = []
+            eco = self.detect_ecosystem(sw)
+            if not eco:
+                continue
+            cmp, seen = version_cmp_for(eco), set()
+            for entry_eco, vid, entry in self.offline.lookup(sw.name):
+                if vid in seen or not _ecosystem_matches(eco, entry_eco):
+                    continue
+                if not osv_version_affected(entry, sw.version, cmp):
+                    continue
+                seen.add(vid)
+                if vid not in self._vulns:
+                    data = self.offline.vuln(vid)
+                    self._vulns[vid] = self._parse_osv_vuln(data) if data else None
+                m = self._vulns[vid]
+                if m and m.cvss_score >= self.min_cvss_score:
+                    results[key].append(replace(m))
+        log.info(f"  OSV offline: {len(sw_list)} Pakete lokal abgeglichen, "
+                 f"{sum(1 for v in results.values() if v)} betroffen")
+        return results
+
+    def _resolve_details(self, wanted: dict[str, str]):
+        """Lädt die Advisories für wanted (OSV-ID → modified) nach self._vulns.
+
+        Bereits in diesem Scan geladene IDs werden übersprungen, IDs mit
+        unverändertem "modified" kommen aus dem OsvVulnStore, der Rest wird
+        mit detail_workers parallelen Requests geholt.
+        """
+        todo = [vid for vid in wanted if vid not in self._vulns]
+        if not todo:
+            return
+        stored = self.store.get_many(todo) if self.store else {}
+        fetch: list[str] = []
+        for vid in todo:
+            hit = stored.get(vid)
+            if hit and wanted[vid] and hit[0] == wanted[vid]:
+                self._vulns[vid] = self._parse_osv_vuln(hit[1])
+            else:
+                fetch.append(vid)
+        log.info(f"  OSV Details: {len(todo)} Advisories, "
+                 f"{len(todo) - len(fetch)} aus Store, {len(fetch)} laden "
+                 f"({min(self.detail_workers, max(len(fetch), 1))} parallel)")
+        if not fetch:
+            return
+        with ThreadPoolExecutor(max_workers=self.detail_workers) as pool:
+            futures = {pool.submit(self._fetch_detail, vid): vid for vid in fetch}
+            for fut in as_completed(futures):
+                data = fut.result()
+                if data is None:
+                    continue
+                vid = futures[fut]
+                self._vulns[vid] = self._parse_osv_vuln(data)
+                if self.store:
+                    self.store.put(vid, data.get("modified", ""), data)
+        if self.store:
+            self.store.flush()
+
+    def _fetch_detail(self, vid: str) -> Optional[dict]:
+        try:
+            resp = self.http.get(f"{OSV_VULNS_URL}/{vid}",
+                                 headers=self.headers, timeout=15)
+            if resp.status_code == 200:
+                return resp.json()
+        except requests.RequestException as e:
+            log.debug(f"OSV Detail '{vid}': {e}")
+        return None
 
     def _parse_osv_vuln(self, osv_vuln: dict) -> Optional[CveMatch]:
         osv_id  = osv_vuln.get("id", "")
@@ -1088,16 +2795,14 @@ class OssIndexClient:
     """
 
     def __init__(self, username: str = "", token: str = "",
-                 min_cvss_score: float = 0.0):
+                 min_cvss_score: float = 0.0,
+                 workers: int = OSS_WORKERS,
+                 http: Optional[HttpTransport] = None):
         self.min_cvss_score = min_cvss_score
-        self.session        = requests.Session()
-        self.session.headers.update({
-            "Content-Type": "application/json",
-            "Accept":       "application/json",
-            "User-Agent":   "checkmk-cve-scanner/4.0",
-        })
-        if username and token:
-            self.session.auth = (username, token)
+        self.workers        = max(1, workers)
+        self.http           = http or HttpTransport()
+        self.headers        = {"Accept": "application/json"}
+        self.auth           = (username, token) if username and token else None
 
     @staticmethod
     def _make_purl(sw: SoftwareEntry) -> str:
@@ -1124,143 +2829,263 @@ class OssIndexClient:
 
     def query_batch(self, sw_list: list["SoftwareEntry"]
                     ) -> dict[str, list[CveMatch]]:
+        """Wie OsvClient.query_batch: erfolgreich abgefragte Pakete ohne
+        Treffer sind mit leerer Liste enthalten.
+
+        Bis zu self.workers Batches laufen parallel (429 regelt der
+        Transport); die Ergebnisse werden in Batch-Reihenfolge übernommen."""
         results: dict[str, list[CveMatch]] = {}
-        total = len(sw_list)
+        batches = [sw_list[i:i + OSS_INDEX_BATCH]
+                   for i in range(0, len(sw_list), OSS_INDEX_BATCH)]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for part in pool.map(partial(self._query_chunk, total_batches=len(batches)),
+                                 batches, range(1, len(batches) + 1)):
+                for key, cves in part.items():
+                    results.setdefault(key, []).extend(cves)
+        return results
 
-        for batch_start in range(0, total, OSS_INDEX_BATCH):
-            batch = sw_list[batch_start:batch_start + OSS_INDEX_BATCH]
-            batch_num = batch_start // OSS_INDEX_BATCH + 1
-            total_batches = (total + OSS_INDEX_BATCH - 1) // OSS_INDEX_BATCH
-            log.info(f"  OSS Index Batch {batch_num}/{total_batches}: {len(batch)} Pakete")
+    def _query_chunk(self, batch: list["SoftwareEntry"], batch_num: int,
+                     total_batches: int) -> dict[str, list[CveMatch]]:
+        """Ein component-report Request; leeres dict bei Fehler."""
+        results: dict[str, list[CveMatch]] = {}
+        log.info(f"  OSS Index Batch {batch_num}/{total_batches}: {len(batch)} Pakete")
 
-            coordinates = []
-            purl_to_key: dict[str, str] = {}
-            for sw in batch:
-                purl = self._make_purl(sw)
-                key  = f"{sw.name.lower()}|{sw.version.lower()}"
-                coordinates.append({"coordinates": purl})
-                purl_to_key[purl] = key
+        coordinates = []
+        purl_to_key: dict[str, str] = {}
+        for sw in batch:
+            purl = self._make_purl(sw)
+            key  = f"{sw.name.lower()}|{sw.version.lower()}"
+            coordinates.append({"coordinates": purl})
+            purl_to_key[purl] = key
 
-            try:
-                resp = self.session.post(
-                    OSS_INDEX_URL,
-                    json={"coordinates": [c["coordinates"] for c in coordinates]},
-                    timeout=60,
-                )
-                if resp.status_code == 429:
-                    log.warning("OSS Index Rate Limit erreicht – warte 60s...")
-                    time.sleep(60)
-                    resp = self.session.post(
-                        OSS_INDEX_URL,
-                        json={"coordinates": [c["coordinates"] for c in coordinates]},
-                        timeout=60,
-                    )
-                resp.raise_for_status()
-            except requests.RequestException as e:
-                log.warning(f"OSS Index Batch Fehler: {e}")
-                continue
+        try:
+            # 429 (Rate Limit) wiederholt der Transport nach Retry-After
+            resp = self.http.post(
+                OSS_INDEX_URL,
+                json={"coordinates": [c["coordinates"] for c in coordinates]},
+                headers=self.headers,
+                auth=self.auth,
+                timeout=60,
+            )
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            log.warning(f"OSS Index Batch Fehler: {e}")
+            return results
 
-            for component in resp.json():
-                purl  = component.get("coordinates", "")
-                vulns = component.get("vulnerabilities", [])
-                if not vulns:
+        for key in purl_to_key.values():
+            results[key] = []
+
+        for component in resp.json():
+            purl  = component.get("coordinates", "")
+            vulns = component.get("vulnerabilities", [])
+            if not vulns:
+                continue
+            # PURL kann Abweichungen haben – normalisieren
+            key = purl_to_key.get(purl)
+            if not key:
+                # Fallback: Name aus PURL extrahieren
+                try:
+                    bare = purl.split("/")[-1].split("@")[0].lower()
+                    ver  = purl.split("@")[1].lower() if "@" in purl else ""
+                    key  = f"{bare}|{ver}"
+                except Exception:
                     continue
-                # PURL kann Abweichungen haben – normalisieren
-                key = purl_to_key.get(purl)
-                if not key:
-                    # Fallback: Name aus PURL extrahieren
-                    try:
-                        bare = purl.split("/")[-1].split("@")[0].lower()
-                        ver  = purl.split("@")[1].lower() if "@" in purl else ""
-                        key  = f"{bare}|{ver}"
-                    except Exception:
-                        continue
 
-                cve_list = []
-                for v in vulns:
-                    cve_id  = v.get("cve", v.get("id", ""))
-                    score   = float(v.get("cvssScore", 0.0))
-                    if score < self.min_cvss_score:
-                        continue
-                    severity = _cvss_score_to_severity(score)
-                    title    = v.get("title", "")
-                    desc     = v.get("description", title)[:500]
-                    refs     = [v.get("reference", "")]
-                    if not cve_id:
-                        continue
-                    cve_list.append(CveMatch(
-                        cve_id=cve_id, severity=severity, cvss_score=score,
-                        cvss_vector=v.get("cvssVector", ""),
-                        description=desc,
-                        published=v.get("publishedDate", ""),
-                        last_modified=v.get("lastModifiedDate", ""),
-                        source="OSS",
-                        references=[r for r in refs if r],
-                    ))
-                if cve_list:
-                    existing = results.get(key, [])
-                    existing.extend(cve_list)
-                    results[key] = existing
+            cve_list = []
+            for v in vulns:
+                cve_id  = v.get("cve", v.get("id", ""))
+                score   = float(v.get("cvssScore", 0.0))
+                if score < self.min_cvss_score:
+                    continue
+                severity = _cvss_score_to_severity(score)
+                title    = v.get("title", "")
+                desc     = v.get("description", title)[:500]
+                refs     = [v.get("reference", "")]
+                if not cve_id:
+                    continue
+                cve_list.append(CveMatch(
+                    cve_id=cve_id, severity=severity, cvss_score=score,
+                    cvss_vector=v.get("cvssVector", ""),
+                    description=desc,
+                    published=v.get("publishedDate", ""),
+                    last_modified=v.get("lastModifiedDate", ""),
+                    source="OSS",
+                    references=[r for r in refs if r],
+                ))
+            if cve_list:
+                existing = results.get(key, [])
+                existing.extend(cve_list)
+                results[key] = existing
 
         return results
 
 
+# ---------------------------------------------------------------------------
+# Feed-Cache – bedingte Downloads für Bulk-Feeds (CISA KEV, …)
+# ---------------------------------------------------------------------------
+
+class FeedCache:
+    """Lokale, vorindexierte Ablage für Bulk-Feeds (SQLite, WAL).
+
+    Ein Feed wird per refresh(name, url, index) geholt: bedingtes GET mit
+    dem gespeicherten ETag / Last-Modified, bei 304 bleibt der Stand
+    erhalten. Nur bei 200 wird das JSON einmal geparst und über die
+    index-Funktion in (Schlüssel, Datensatz)-Paare zerlegt; jeder Datensatz
+    liegt kompakt als eigene Zeile.
+
+    Tabellen:
+      feeds    – je Feed: URL, ETag, Last-Modified, letzte Prüfung,
+                 letzte Änderung, Anzahl Einträge
+      entries  – (feed, key) → kompaktes JSON des Datensatzes
+
+    Beim Start wird kein Feed-JSON geparst: keys() liefert nur die
+    Schlüssel, get_many() die Datensätze der tatsächlich benötigten Keys.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS feeds (
+            name          TEXT NOT NULL PRIMARY KEY,
+            url           TEXT NOT NULL,
+            etag          TEXT NOT NULL DEFAULT '',
+            last_modified TEXT NOT NULL DEFAULT '',
+            checked       REAL NOT NULL,
+            updated       REAL NOT NULL,
+            entries       INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS entries (
+            feed TEXT NOT NULL,
+            key  TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (feed, key)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_file: str = "/tmp/cve_scanner_feeds.sqlite",
+                 http: Optional[HttpTransport] = None):
+        self.db_file = Path(db_file)
+        self.http    = http or HttpTransport()
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # KEV-Phase lädt, Anreicherung läuft danach im Haupt-Thread
+        self._db = sqlite3.connect(str(self.db_file), timeout=60,
+                                   isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(self.SCHEMA)
+
+    def info(self, name: str) -> Optional[tuple]:
+        """(etag, last_modified, checked, updated, entries) oder None."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT etag, last_modified, checked, updated, entries "
+                "FROM feeds WHERE name = ?", (name,)).fetchone()
+
+    def refresh(self, name: str, url: str,
+                index: Callable[[object], object],
+                max_age: float = 0, timeout: int = 60) -> str:
+        """Aktualisiert einen Feed, falls die letzte Prüfung älter als
+        max_age Sekunden ist.
+
+        Rückgabe: "fresh" (nicht geprüft), "unchanged" (304), "updated"
+        oder "failed" (alter Stand bleibt erhalten).
+        """
+        info = self.info(name)
+        if info and time.time() - info[2] < max_age:
+            return "fresh"
+        etag, last_mod = (info[0], info[1]) if info else ("", "")
+        try:
+            with self.http.get_if_changed(url, etag, last_mod,
+                                          timeout=timeout) as resp:
+                if resp.status_code == 304 and info:
+                    with self._lock:
+                        self._db.execute("UPDATE feeds SET checked = ? WHERE name = ?",
+                                         (time.time(), name))
+                    return "unchanged"
+                resp.raise_for_status()
+                rows = [(name, key, json.dumps(rec, separators=(",", ":")))
+                        for key, rec in index(resp.json())]
+                etag     = resp.headers.get("ETag", "")
+                last_mod = resp.headers.get("Last-Modified", "")
+        except (requests.RequestException, ValueError) as e:
+            log.warning(f"Feed {name}: nicht aktualisiert ({e})"
+                        + (" – verwende lokalen Stand" if info else ""))
+            return "failed"
+
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("DELETE FROM entries WHERE feed = ?", (name,))
+            self._db.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                                 rows)
+            self._db.execute(
+                "INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, url, etag, last_mod, now, now, len(rows)))
+        return "updated"
+
+    def keys(self, name: str) -> set[str]:
+        with self._lock:
+            return {k for (k,) in self._db.execute(
+                "SELECT key FROM entries WHERE feed = ?", (name,))}
+
+    def get_many(self, name: str, keys) -> dict[str, dict]:
+        """Datensätze für die angegebenen Keys (fehlende fehlen im Ergebnis)."""
+        keys = list(dict.fromkeys(keys))
+        out: dict[str, dict] = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for key, data in self._db.execute(
+                        f"SELECT key, data FROM entries WHERE feed = ? "
+                        f"AND key IN ({marks})", (name, *chunk)):
+                    out[key] = json.loads(data)
+        return out
+
+
 # ---------------------------------------------------------------------------
 # CISA KEV Client – Known Exploited Vulnerabilities (aktiv ausgenutzt!)
 # ---------------------------------------------------------------------------
 
 class CisaKevClient:
     """CISA Known Exploited Vulnerabilities Catalog.
-    Kein Rate-Limit, kein API-Key. JSON-Feed wird lokal gecacht.
+    Kein Rate-Limit, kein API-Key. Der Feed liegt vorindexiert im
+    FeedCache (CVE-ID → KEV-Datensatz) und wird höchstens stündlich
+    bedingt geprüft – meist antwortet CISA mit 304.
     Liefert KEINEN CVSS-Score, aber markiert CVEs als aktiv ausgenutzt –
     das ist wertvoller als ein hoher CVSS-Score alleine.
     """
 
-    def __init__(self, cache_dir: str = "/tmp"):
-        self.cache_file  = Path(cache_dir) / "cisa_kev_cache.json"
+    FEED = "cisa_kev"
+
+    def __init__(self, cache_dir: str = "/tmp",
+                 http: Optional[HttpTransport] = None,
+                 feeds: Optional[FeedCache] = None):
+        self.http        = http or HttpTransport()
+        self.feeds       = feeds or FeedCache(
+            Path(cache_dir) / "cve_scanner_feeds.sqlite", http=self.http)
         self._kev_ids: set[str] = set()
-        self._kev_data: dict[str, dict] = {}
         self._loaded     = False
-        self.session     = requests.Session()
-        self.session.headers.update({"User-Agent": "checkmk-cve-scanner/4.0"})
 
     def _load(self):
-        """Laedt den KEV-Feed (aus Cache wenn fresh genug, sonst von CISA)."""
+        """Prüft den KEV-Feed (bedingt) und lädt die CVE-IDs aus dem Feed-Cache."""
         if self._loaded:
             return
-        # Cache prüfen
-        if self.cache_file.exists():
-            age = time.time() - self.cache_file.stat().st_mtime
-            if age < CISA_KEV_CACHE_TTL:
-                try:
-                    with open(self.cache_file, encoding="utf-8") as fh:
-                        data = json.load(fh)
-                    self._ingest(data)
-                    log.info(f"CISA KEV: {len(self._kev_ids)} Einträge aus Cache")
-                    self._loaded = True
-                    return
-                except Exception:
-                    pass
-        # Neu laden
-        try:
-            log.info("CISA KEV: Lade Feed von CISA...")
-            resp = self.session.get(CISA_KEV_URL, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            with open(self.cache_file, "w", encoding="utf-8") as fh:
-                json.dump(data, fh)
-            self._ingest(data)
-            log.info(f"CISA KEV: {len(self._kev_ids)} aktiv ausgenutzte CVEs geladen")
-        except requests.RequestException as e:
-            log.warning(f"CISA KEV Feed nicht erreichbar: {e}")
+        state = self.feeds.refresh(self.FEED, CISA_KEV_URL, self._index,
+                                   max_age=CISA_KEV_CACHE_TTL, timeout=30)
+        self._kev_ids = self.feeds.keys(self.FEED)
+        log.info(f"CISA KEV: {len(self._kev_ids)} aktiv ausgenutzte CVEs "
+                 + {"fresh":     "aus Cache",
+                    "unchanged": "aus Cache (Feed unverändert)",
+                    "updated":   "geladen",
+                    "failed":    "aus Cache (Feed nicht erreichbar)"}[state])
         self._loaded = True
 
-    def _ingest(self, data: dict):
+    @staticmethod
+    def _index(data: dict):
+        """KEV-Feed → (CVE-ID, kompakter Datensatz)."""
         for v in data.get("vulnerabilities", []):
             cve_id = v.get("cveID", "")
             if cve_id:
-                self._kev_ids.add(cve_id)
-                self._kev_data[cve_id] = {
+                yield cve_id, {
                     "vendorProject":     v.get("vendorProject", ""),
                     "product":           v.get("product", ""),
                     "vulnerabilityName": v.get("vulnerabilityName", ""),
@@ -1275,49 +3100,56 @@ class CisaKevClient:
         self._load()
         return cve_id in self._kev_ids
 
-    def enrich_findings(self, findings: list) -> int:
-        """Markiert Findings die in CISA KEV sind als aktiv ausgenutzt.
-        Gibt Anzahl der markierten Findings zurück."""
+    def enrich_cves(self, cves) -> int:
+        """Markiert CVEs die in CISA KEV sind als aktiv ausgenutzt.
+        Gibt Anzahl der markierten CVEs zurück."""
         self._load()
+        hits = [cve for cve in cves if cve.cve_id in self._kev_ids]
+        # Datensätze nur für die getroffenen CVEs, je CVE-ID einmal
+        kev_data = self.feeds.get_many(self.FEED, (c.cve_id for c in hits))
         count = 0
-        for f in findings:
-            cve_id = f.cve.cve_id
-            if cve_id in self._kev_ids:
-                f.cve.kev_exploited = True
-                kev = self._kev_data[cve_id]
+        for cve in hits:
+            kev = kev_data.get(cve.cve_id)
+            if kev is not None:
+                cve.kev_exploited = True
                 # Severity auf mindestens HIGH setzen wenn exploited
-                if f.cve.severity in ("NONE", "LOW", "MEDIUM"):
-                    f.cve.severity = "HIGH"
-                    if f.cve.cvss_score == 0.0:
-                        f.cve.cvss_score = 7.0
+                if cve.severity in ("NONE", "LOW", "MEDIUM"):
+                    cve.severity = "HIGH"
+                    if cve.cvss_score == 0.0:
+                        cve.cvss_score = 7.0
                 # Beschreibung anreichern
-                if kev["shortDescription"] and not f.cve.description:
-                    f.cve.description = kev["shortDescription"]
+                if kev["shortDescription"] and not cve.description:
+                    cve.description = kev["shortDescription"]
                 count += 1
         return count
 
+    def enrich_findings(self, findings: list) -> int:
+        """Wie enrich_cves, für eine Liste von Findings.
+        Findings teilen sich CveMatch-Objekte – jedes wird nur einmal
+        geprüft. Gibt Anzahl der markierten Findings zurück."""
+        findings = list(findings)
+        self.enrich_cves({id(f.cve): f.cve for f in findings}.values())
+        return sum(f.cve.kev_exploited for f in findings)
+
 
 # ---------------------------------------------------------------------------
-# CVE Merger
+# CVE Merger / CVE-Registry
 # ---------------------------------------------------------------------------
 
 class CveMerger:
     @staticmethod
     def merge(nvd: list[CveMatch], osv: list[CveMatch],
               oss: list[CveMatch] | None = None) -> list[CveMatch]:
-        merged: dict[str, CveMatch] = {c.cve_id: c for c in nvd}
-        for cve in (osv + (oss or [])):
-            key = next((k for k in [cve.cve_id] + cve.aliases if k in merged), None)
-            if key:
-                merged[key] = CveMerger._combine(merged[key], cve)
-            else:
-                merged[cve.cve_id] = cve
-        return list(merged.values())
+        """Dedupliziert die Treffer eines Pakets (NVD hat Vorrang)."""
+        registry = CveRegistry()
+        matches  = nvd + osv + (oss or [])
+        for cve in matches:
+            registry.add(cve)
+        return registry.resolve(matches)
 
     @staticmethod
     def _combine(a: CveMatch, b: CveMatch) -> CveMatch:
         hi = a if a.cvss_score >= b.cvss_score else b
-        lo = b if a.cvss_score >= b.cvss_score else a
         return CveMatch(
             cve_id=a.cve_id,
             severity=hi.severity, cvss_score=hi.cvss_score,
@@ -1325,54 +3157,205 @@ class CveMerger:
             description=a.description or b.description,
             published=a.published or b.published,
             last_modified=max(a.last_modified, b.last_modified),
-            source="NVD+OSV",
-            aliases=list(set(a.aliases + b.aliases +
-                             ([b.cve_id] if b.cve_id != a.cve_id else [])))[:5],
+            source=a.source if a.source == b.source else "NVD+OSV",
+            aliases=[x for x in dict.fromkeys(a.aliases + b.aliases + [b.cve_id])
+                     if x != a.cve_id][:5],
             references=list(dict.fromkeys(a.references + b.references))[:10],
         )
 
 
+class CveRegistry:
+    """Scanweites CVE-Register: jede Schwachstelle genau einmal.
+
+    Dieselbe Advisory (z.B. ein glibc-CVE) kommt über viele Pakete und
+    Quellen herein – als CVE-, GHSA-, DSA- oder OSV-ID mit Aliases. Die IDs
+    werden per Union-Find zu Klassen zusammengefasst; je Klasse gibt es
+    einen kanonischen CveMatch (CveMerger._combine, höchster Score gewinnt).
+
+    - add() nimmt Treffer auf, resolve() liefert für die Treffer eines
+      Pakets die kanonischen Objekte – Pakete halten nur Referenzen,
+      jede CVE hat auf allen Hosts denselben Score und dieselbe Severity
+    - Aliases werden transitiv aufgelöst (GHSA → CVE ← DSA)
+    - zwei verschiedene CVE-IDs werden nie zusammengelegt, auch wenn eine
+      Advisory beide als Alias nennt
+    - kanonische ID ist die erste CVE-ID der Klasse, sonst die zuerst
+      gesehene ID; bei gleichem Score gewinnt der zuerst gesehene Eintrag
+      (NVD vor OSV vor OSS wie in CveMerger.merge)
+    """
+
+    def __init__(self):
+        self._parent:  dict[str, str]      = {}
+        self._size:    dict[str, int]      = {}
+        self._cve:     dict[str, str]      = {}   # Wurzel → CVE-ID der Klasse
+        self._records: dict[str, CveMatch] = {}   # Wurzel → kanonischer Eintrag
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _find(self, vid: str) -> str:
+        parent = self._parent
+        if vid not in parent:
+            parent[vid] = vid
+            self._size[vid] = 1
+            if vid.startswith("CVE-"):
+                self._cve[vid] = vid
+            return vid
+        root = vid
+        while root != parent[root]:
+            parent[root] = parent[parent[root]]   # Pfad halbieren
+            root = parent[root]
+        return root
+
+    def _store(self, root: str, rec: CveMatch):
+        """Legt den Eintrag einer Klasse ab – unter der CVE-ID, falls bekannt."""
+        cve_id = self._cve.get(root)
+        if cve_id and rec.cve_id != cve_id:
+            rec = replace(rec, cve_id=cve_id, aliases=[
+                x for x in dict.fromkeys([rec.cve_id, *rec.aliases])
+                if x != cve_id][:5])
+        self._records[root] = rec
+
+    def _union(self, root: str, vid: str) -> str:
+        """Vereinigt die Klasse von vid mit root, gibt die neue Wurzel zurück."""
+        other = self._find(vid)
+        if other == root:
+            return root
+        cve_a, cve_b = self._cve.get(other), self._cve.get(root)
+        if cve_a and cve_b and cve_a != cve_b:
+            return root
+        # Bestehende Klasse zuerst (Beschreibung, Gleichstand beim Score)
+        a, b = self._records.get(other), self._records.pop(root, None)
+        if a is None:
+            a, b = b, None
+        self._records.pop(other, None)
+        if self._size[root] > self._size[other]:
+            root, other = other, root
+        self._parent[root] = other
+        self._size[other] += self._size.pop(root)
+        self._cve.pop(root, None)
+        if cve_a or cve_b:
+            self._cve[other] = cve_a or cve_b
+        if a is not None:
+            self._store(other, a if b is None else CveMerger._combine(a, b))
+        return other
+
+    @staticmethod
+    def _adds_nothing(a: CveMatch, b: CveMatch) -> bool:
+        """True, wenn CveMerger._combine(a, b) nur a wiederholen würde –
+        der Normalfall, wenn dieselbe Advisory in vielen Paketen auftaucht."""
+        if b.cvss_score > a.cvss_score or (b.source != a.source
+                                           and a.source != "NVD+OSV"):
+            return False
+        if (b.description and not a.description) or (b.published and not a.published) \
+                or b.last_modified > a.last_modified:
+            return False
+        if len(a.aliases) < 5 and not {b.cve_id, *b.aliases} <= {a.cve_id, *a.aliases}:
+            return False
+        return len(a.references) >= 10 or set(b.references) <= set(a.references)
+
+    def add(self, cve: CveMatch):
+        root = self._find(cve.cve_id)
+        rec  = self._records.get(root)
+        if rec is None:
+            self._store(root, cve)
+        elif rec is not cve and not self._adds_nothing(rec, cve):
+            self._store(root, CveMerger._combine(rec, cve))
+        for alias in cve.aliases:
+            root = self._union(root, alias)
+
+    def get(self, vid: str) -> Optional[CveMatch]:
+        """Kanonischer Eintrag für eine ID oder einen Alias."""
+        return self._records.get(self._find(vid)) if vid in self._parent else None
+
+    def resolve(self, matches: list[CveMatch]) -> list[CveMatch]:
+        """Kanonische Einträge für die Treffer eines Pakets (ohne Duplikate)."""
+        roots = dict.fromkeys(self._find(c.cve_id) for c in matches)
+        return [self._records[r] for r in roots]
+
+    def records(self) -> list[CveMatch]:
+        return list(self._records.values())
+
+
 # ---------------------------------------------------------------------------
 # Report Generator
 # ---------------------------------------------------------------------------
 
 class ReportGenerator:
+    """Schreibt die Reports zeilenweise aus dem ScanResult.
+
+    Die CVE-Felder werden je CVE einmal serialisiert (JSON-Fragment bzw.
+    CSV-Spalten) und pro Host-Vorkommen nur noch zusammengesetzt.
+    """
+
+    CVE_FIELDS = ("cve_id", "severity", "cvss_score", "cvss_vector",
+                  "description", "published", "last_modified", "source")
+    CSV_FIELDS = [
+        "site", "host", "software_name", "software_version", "vendor",
+        "cve_id", "severity", "cvss_score", "cvss_vector",
+        "source", "aliases", "published", "last_modified",
+        "description", "references", "scan_timestamp",
+    ]
+
     def __init__(self, output_dir: str = "."):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.timestamp  = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
 
-    def write_json(self, findings: list[VulnerabilityFinding],
-                   summary: dict) -> Path:
+    @classmethod
+    def _cve_part(cls, cve: CveMatch) -> dict:
+        d = {k: getattr(cve, k) for k in cls.CVE_FIELDS}
+        d["aliases"]    = "; ".join(cve.aliases[:5])
+        d["references"] = "; ".join(cve.references[:5])
+        return d
+
+    def write_json(self, result: "ScanResult", summary: dict) -> Path:
+        self.timestamp = result.file_stamp
         path = self.output_dir / f"cve_report_{self.timestamp}.json"
+        head = json.dumps({
+            "meta": {
+                "generated_at":   result.scan_timestamp,
+                "scanner":        "checkmk_cve_scanner",
+                "version":        "3.0.0",
+                "sources":        ["NVD", "OSV.dev"],
+                "total_findings": summary["total_findings"],
+            },
+            "summary": summary,
+        }, indent=2, ensure_ascii=False)
+        ts_json   = json.dumps(result.scan_timestamp)
+        cve_json: dict[int, str] = {}
         with open(path, "w", encoding="utf-8") as fh:
-            json.dump({
-                "meta": {
-                    "generated_at":   datetime.utcnow().isoformat() + "Z",
-                    "scanner":        "checkmk_cve_scanner",
-                    "version":        "3.0.0",
-                    "sources":        ["NVD", "OSV.dev"],
-                    "total_findings": len(findings),
-                },
-                "summary":  summary,
-                "findings": [f.to_dict() for f in findings],
-            }, fh, indent=2, ensure_ascii=False)
+            # Kopf wie gehabt, Findings eine Zeile je Finding
+            fh.write(head[:-2] + ',\n  "findings": [')
+            sep = "\n    "
+            for site, host, name, version, vendor, cve in result.iter_rows():
+                frag = cve_json.get(id(cve))
+                if frag is None:
+                    frag = cve_json[id(cve)] = json.dumps(
+                        self._cve_part(cve), ensure_ascii=False)[1:-1]
+                host_part = json.dumps({
+                    "site": site, "host": host, "software_name": name,
+                    "software_version": version, "vendor": vendor,
+                }, ensure_ascii=False)[:-1]
+                fh.write(f'{sep}{host_part}, "scan_timestamp": {ts_json}, {frag}}}')
+                sep = ",\n    "
+            fh.write("\n  ]\n}\n")
         log.info(f"JSON Report: {path}")
         return path
 
-    def write_csv(self, findings: list[VulnerabilityFinding]) -> Path:
-        fieldnames = [
-            "site", "host", "software_name", "software_version", "vendor",
-            "cve_id", "severity", "cvss_score", "cvss_vector",
-            "source", "aliases", "published", "last_modified",
-            "description", "references", "scan_timestamp",
-        ]
+    def write_csv(self, result: "ScanResult") -> Path:
+        self.timestamp = result.file_stamp
         path = self.output_dir / f"cve_report_{self.timestamp}.csv"
+        cve_cols: dict[int, list] = {}
         with open(path, "w", newline="", encoding="utf-8") as fh:
-            w = csv.DictWriter(fh, fieldnames=fieldnames, extrasaction="ignore")
-            w.writeheader()
-            for f in findings:
-                w.writerow(f.to_dict())
+            w = csv.writer(fh)
+            w.writerow(self.CSV_FIELDS)
+            for site, host, name, version, vendor, cve in result.iter_rows():
+                cols = cve_cols.get(id(cve))
+                if cols is None:
+                    part = self._cve_part(cve)
+                    cols = cve_cols[id(cve)] = [part[k] for k in self.CSV_FIELDS[5:-1]]
+                w.writerow([site, host, name, version, vendor, *cols,
+                            result.scan_timestamp])
         log.info(f"CSV Report: {path}")
         return path
 
@@ -1400,11 +3383,603 @@ class ReportGenerator:
         log.info(f"Summary CSV: {path}")
         return path
 
+    def write_delta(self, result: "ScanResult", db: "FindingsDb",
+                    scan_id: int) -> tuple[Path, Path]:
+        """Delta-Report: nur neue und behobene Findings dieses Scans."""
+        self.timestamp = result.file_stamp
+        _, started, sites, total, new, resolved = db.scan_info(scan_id)
+        json_path = self.output_dir / f"cve_delta_{self.timestamp}.json"
+        csv_path  = self.output_dir / f"cve_delta_{self.timestamp}.csv"
+        fields    = ["change", *self.CSV_FIELDS[:-1], "first_scan", "resolved_scan"]
+        head = json.dumps({
+            "meta": {
+                "generated_at":   started,
+                "scanner":        "checkmk_cve_scanner",
+                "version":        "3.0.0",
+                "scan_id":        scan_id,
+                "sites":          sites.split(","),
+                "total_findings": total,
+                "new":            new,
+                "resolved":       resolved,
+            },
+        }, indent=2, ensure_ascii=False)
+        with open(json_path, "w", encoding="utf-8") as jf, \
+             open(csv_path, "w", newline="", encoding="utf-8") as cf:
+            w = csv.writer(cf)
+            w.writerow(fields)
+            jf.write(head[:-2])
+            for change, rows in (("new", db.new(scan_id)),
+                                 ("resolved", db.resolved(scan_id))):
+                jf.write(f',\n  "{change}": [')
+                sep = "\n    "
+                for row in rows:
+                    jf.write(sep + json.dumps(row, ensure_ascii=False))
+                    sep = ",\n    "
+                    row["change"] = change.upper()
+                    w.writerow([row.get(k, "") for k in fields])
+                jf.write("\n  ]")
+            jf.write("\n}\n")
+        log.info(f"Delta Report: {json_path} ({new} neu, {resolved} behoben)")
+        log.info(f"Delta CSV: {csv_path}")
+        return json_path, csv_path
+
+
+# ---------------------------------------------------------------------------
+# Checkmk-Ausgabe (Spool)
+# ---------------------------------------------------------------------------
+
+class CheckmkSectionWriter:
+    """Schreibt je Host eine kompakte Section <<<cve_scanner:sep(124)>>>.
+
+    Inhalt: Findings je Severity, KEV-Anzahl, Top-CVE und Scan-Zeitpunkt –
+    ausgewertet vom Check-Plugin cve_scanner (cmk25/local/…/cve_scanner).
+
+    Je Host eine Datei <spool_dir>/cve_scanner_<site>.<host> im
+    Spool-Verzeichnis des Agenten auf dem Checkmk-Server, Inhalt als
+    Piggyback <<<<host>>>>. Der Agent liefert sie bei jedem Abruf erneut
+    aus – die Piggyback-Daten bleiben so auch bei täglichen Scans frisch
+    (direkt geschriebene Piggyback-Dateien überschritten das Max-Alter).
+    Site-Namen enthalten keinen Punkt, der Dateiname ist damit eindeutig.
+
+    Geschrieben wird atomar (temporäre Datei + os.replace) und nur, wenn
+    sich die Zusammenfassung eines Hosts geändert hat. Unveränderte Hosts
+    werden spätestens nach refresh_seconds neu geschrieben, damit das
+    Scan-Alter im Check aussagekräftig bleibt. Dateien von Hosts, die in
+    einer vollständig gescannten Site nicht mehr vorkommen, werden gelöscht.
+    """
+
+    SECTION = "cve_scanner"
+    MODES   = ("off", "spool")
+
+    def __init__(self, mode: str = "spool",
+                 spool_dir: str = "/var/lib/check_mk_agent/spool",
+                 refresh_seconds: int = 12 * 3600):
+        self.mode      = mode
+        self.spool_dir = Path(spool_dir)
+        self.refresh   = refresh_seconds
+
+    def _path(self, site: str, host: str) -> Path:
+        return self.spool_dir / f"{self.SECTION}_{site}.{host}"
+
+    @classmethod
+    def section_lines(cls, data: dict) -> list[str]:
+        """Section-Zeilen ohne scan_time (Vergleichsbasis für Änderungen)."""
+        lines = [f"total|{data.get('total', 0)}"]
+        for sev in ("CRITICAL", "HIGH", "MEDIUM", "LOW", "NONE"):
+            lines.append(f"{sev.lower()}|{data.get(sev, 0)}")
+        lines.append(f"kev|{data.get('kev', 0)}")
+        if data.get("top_cve"):
+            lines.append(f"top_cve|{data['top_cve']}|{data['top_score']}")
+        return lines
+
+    def _render(self, host: str, lines: list[str], scan_time: int) -> str:
+        body = f"<<<{self.SECTION}:sep(124)>>>\n" + \
+               "\n".join([f"scan_time|{scan_time}", *lines]) + "\n"
+        return f"<<<<{host}>>>>\n{body}<<<<>>>>\n"
+
+    @staticmethod
+    def _parse(text: str) -> tuple[int, list[str]]:
+        """(scan_time, übrige Section-Zeilen) einer vorhandenen Datei."""
+        scan_time, lines = 0, []
+        for line in text.splitlines():
+            if line.startswith("<<<"):
+                continue
+            if line.startswith("scan_time|"):
+                try:
+                    scan_time = int(line.split("|", 1)[1])
+                except ValueError:
+                    pass
+                continue
+            lines.append(line)
+        return scan_time, lines
+
+    @staticmethod
+    def _atomic_write(path: Path, content: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(content)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _remove_stale(self, sites: list[str], keep: set[Path]) -> int:
+        """Löscht Section-Dateien der Sites, deren Host nicht in keep ist."""
+        prefixes = tuple(f"{self.SECTION}_{site}." for site in sites)
+        removed  = 0
+        try:
+            files = list(self.spool_dir.iterdir())
+        except OSError:
+            return 0
+        for path in files:
+            if not path.name.startswith(prefixes) or path in keep:
+                continue
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                log.warning(f"Checkmk-Section {path} nicht gelöscht: {e}")
+        return removed
+
+    def write(self, result: "ScanResult", by_host: dict,
+              sites: Optional[list[str]] = None) -> tuple[int, int]:
+        """Schreibt die Sections aller gescannten Hosts.
+
+        sites: vollständig gescannte Sites (ohne Host-Filter) – deren
+        Dateien für nicht mehr inventarisierte Hosts werden gelöscht.
+        Gibt (geschrieben, unverändert) zurück."""
+        if self.mode == "off":
+            return 0, 0
+        now       = time.time()
+        scan_time = int(result.scanned_at.replace(tzinfo=timezone.utc).timestamp())
+        written = unchanged = 0
+        for site, host in result.host_map.hosts:
+            path  = self._path(site, host)
+            lines = self.section_lines(by_host.get((site, host), {}))
+            try:
+                old_time, old_lines = self._parse(path.read_text(encoding="utf-8"))
+            except OSError:
+                old_time, old_lines = 0, None
+            if old_lines == lines and now - old_time < self.refresh:
+                unchanged += 1
+                continue
+            try:
+                self._atomic_write(path, self._render(host, lines, scan_time))
+                written += 1
+            except OSError as e:
+                log.warning(f"Checkmk-Section für {site}/{host} nicht geschrieben: {e}")
+        removed = 0
+        if sites:
+            removed = self._remove_stale(
+                sites, {self._path(site, host) for site, host in result.host_map.hosts})
+        log.info(f"Checkmk-Sections ({self.mode}): {written} geschrieben, "
+                 f"{unchanged} unverändert, {removed} gelöscht")
+        return written, unchanged
+
+
+# ---------------------------------------------------------------------------
+# Findings-Datenbank
+# ---------------------------------------------------------------------------
+
+class FindingsDb:
+    """Findings-Datenbank (SQLite) mit Scan-Historie und Delta-Abfragen.
+
+    Gespeichert wird kompakt (Scan, Host, Paket, CVE), Hosts, Pakete und
+    CVEs je einmal in eigenen Tabellen:
+      scans     – ein Eintrag je Lauf (Zeitpunkt, Sites, Zähler)
+      hosts     – (site, host)
+      packages  – (name, version, vendor) der Binär-Pakete
+      cves      – CVE-ID, Severity, Score, KEV + Report-Felder (JSON);
+                  nur bei Änderung neu geschrieben
+      findings  – Intervall je (Host, Paket, CVE): first_scan bis
+                  resolved_scan (NULL = offen)
+
+    Unveränderte Findings werden nicht erneut geschrieben – ein Lauf fügt
+    nur neue Findings ein und schließt behobene. Behoben ist ein Finding
+    nur auf Hosts, die in diesem Lauf gescannt wurden (--hosts / einzelne
+    Sites lassen die übrigen Hosts unverändert), und nur für Pakete, die
+    alle Quellen beantwortet haben (ScanResult.unanswered – ein Netzfehler
+    macht aus offenen Findings kein behoben/neu im nächsten Lauf).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scans (
+            id        INTEGER PRIMARY KEY,
+            started   TEXT NOT NULL,
+            finished  TEXT NOT NULL DEFAULT '',
+            sites     TEXT NOT NULL DEFAULT '',
+            hosts     INTEGER NOT NULL DEFAULT 0,
+            findings  INTEGER NOT NULL DEFAULT 0,
+            new       INTEGER NOT NULL DEFAULT 0,
+            resolved  INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS hosts (
+            id    INTEGER PRIMARY KEY,
+            site  TEXT NOT NULL,
+            host  TEXT NOT NULL,
+            UNIQUE (site, host)
+        );
+        CREATE INDEX IF NOT EXISTS hosts_host ON hosts (host);
+        CREATE TABLE IF NOT EXISTS packages (
+            id       INTEGER PRIMARY KEY,
+            name     TEXT NOT NULL,
+            version  TEXT NOT NULL,
+            vendor   TEXT NOT NULL,
+            UNIQUE (name, version, vendor)
+        );
+        CREATE TABLE IF NOT EXISTS cves (
+            id          INTEGER PRIMARY KEY,
+            cve_id      TEXT NOT NULL UNIQUE,
+            severity    TEXT NOT NULL,
+            cvss_score  REAL NOT NULL,
+            kev         INTEGER NOT NULL DEFAULT 0,
+            data        TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS cves_severity ON cves (severity, cvss_score);
+        CREATE TABLE IF NOT EXISTS findings (
+            host_id        INTEGER NOT NULL,
+            package_id     INTEGER NOT NULL,
+            cve_ref        INTEGER NOT NULL,
+            first_scan     INTEGER NOT NULL,
+            resolved_scan  INTEGER
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS findings_open
+            ON findings (host_id, package_id, cve_ref) WHERE resolved_scan IS NULL;
+        CREATE INDEX IF NOT EXISTS findings_host     ON findings (host_id);
+        CREATE INDEX IF NOT EXISTS findings_cve      ON findings (cve_ref);
+        CREATE INDEX IF NOT EXISTS findings_first    ON findings (first_scan);
+        CREATE INDEX IF NOT EXISTS findings_resolved ON findings (resolved_scan)
+            WHERE resolved_scan IS NOT NULL;
+    """
+
+    # Spalten für Abfragen und Delta-Report (Report-Reihenfolge: KEV, CVSS)
+    _SELECT = """
+        SELECT h.site, h.host, p.name, p.version, p.vendor, c.data,
+               f.first_scan, f.resolved_scan
+        FROM findings f
+        JOIN hosts h    ON h.id = f.host_id
+        JOIN packages p ON p.id = f.package_id
+        JOIN cves c     ON c.id = f.cve_ref
+        WHERE {where}
+        ORDER BY c.kev DESC, c.cvss_score DESC, h.site, h.host, p.name, c.cve_id
+    """
+
+    def __init__(self, db_file: str = "/tmp/cve_scanner_findings.sqlite"):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.db_file), timeout=60,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+
+    # ── Schreiben ────────────────────────────────────────────────────────
+
+    def _ids(self, table: str, columns: tuple[str, ...],
+             keys: list[tuple]) -> dict[tuple, int]:
+        """IDs für (site, host) bzw. (name, version, vendor), neue anlegen.
+
+        Gelesen werden nur die gesuchten Schlüssel (UNIQUE-Index), nicht
+        die ganze Tabelle.
+        """
+        keys = list(dict.fromkeys(keys))
+        self._db.executemany(
+            f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})", keys)
+        sql = (f"SELECT id FROM {table} WHERE "
+               + " AND ".join(f"{c} = ?" for c in columns))
+        return {key: self._db.execute(sql, key).fetchone()[0] for key in keys}
+
+    def _cve_ref(self, cve: CveMatch) -> int:
+        data = ReportGenerator._cve_part(cve)
+        data["kev_exploited"] = cve.kev_exploited
+        data = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        # Nur schreiben wenn neu oder geändert (Score, KEV, Beschreibung …)
+        self._db.execute(
+            "INSERT INTO cves (cve_id, severity, cvss_score, kev, data) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (cve_id) DO UPDATE SET severity = excluded.severity, "
+            "cvss_score = excluded.cvss_score, kev = excluded.kev, "
+            "data = excluded.data WHERE cves.data != excluded.data",
+            (cve.cve_id, cve.severity, cve.cvss_score, int(cve.kev_exploited), data))
+        return self._db.execute("SELECT id FROM cves WHERE cve_id = ?",
+                                (cve.cve_id,)).fetchone()[0]
+
+    def record(self, result: "ScanResult", sites: list[str]) -> int:
+        """Speichert einen Scan als Delta zum offenen Stand. Gibt die Scan-ID zurück."""
+        t0  = time.monotonic()
+        hm  = result.host_map
+        db  = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            scan_id = db.execute(
+                "INSERT INTO scans (started, sites, hosts) VALUES (?, ?, ?)",
+                (result.scan_timestamp, ",".join(sites), len(hm.hosts))).lastrowid
+            host_ids = self._ids("hosts", ("site", "host"), hm.hosts)
+            host_db  = [host_ids[h] for h in hm.hosts]
+
+            # Aktueller Stand in eine temporäre Tabelle, Abgleich in SQL
+            db.execute("CREATE TEMP TABLE IF NOT EXISTS cur ("
+                       "host_id INTEGER, package_id INTEGER, cve_ref INTEGER, "
+                       "PRIMARY KEY (host_id, package_id, cve_ref)) WITHOUT ROWID")
+            db.execute("CREATE TEMP TABLE IF NOT EXISTS scanned ("
+                       "host_id INTEGER PRIMARY KEY)")
+            db.execute("CREATE TEMP TABLE IF NOT EXISTS keep ("
+                       "package_id INTEGER PRIMARY KEY)")
+            db.execute("DELETE FROM temp.cur")
+            db.execute("DELETE FROM temp.scanned")
+            db.execute("DELETE FROM temp.keep")
+            db.executemany("INSERT OR IGNORE INTO temp.scanned VALUES (?)",
+                           ((h,) for h in host_db))
+
+            # Paket-IDs einmal je Lauf: Gruppen mit Treffern und Gruppen,
+            # deren offene Findings mangels Antwort erhalten bleiben
+            pkg_ids = self._ids(
+                "packages", ("name", "version", "vendor"),
+                [p for group in [g for g, _ in result.groups] + list(result.unanswered)
+                 for p, _ in hm.package_hosts(group)])
+            db.executemany(
+                "INSERT OR IGNORE INTO temp.keep VALUES (?)",
+                ((pkg_ids[p],) for group in result.unanswered
+                 for p, _ in hm.package_hosts(group)))
+
+            # CVE-Objekte sind scanweit eindeutig (CveRegistry) – je CVE
+            # nur ein Upsert
+            cve_refs: dict[int, int] = {}
+            for group, cves in result.groups:
+                pkgs    = hm.package_hosts(group)
+                refs    = []
+                for cve in cves:
+                    ref = cve_refs.get(id(cve))
+                    if ref is None:
+                        ref = cve_refs[id(cve)] = self._cve_ref(cve)
+                    refs.append(ref)
+                db.executemany(
+                    "INSERT OR IGNORE INTO temp.cur VALUES (?, ?, ?)",
+                    ((host_db[hid], pkg_ids[pkg], ref)
+                     for pkg, hids in pkgs for hid in hids for ref in refs))
+
+            new = db.execute(
+                "INSERT INTO findings (host_id, package_id, cve_ref, first_scan) "
+                "SELECT c.host_id, c.package_id, c.cve_ref, ? FROM temp.cur c "
+                "WHERE NOT EXISTS (SELECT 1 FROM findings f "
+                "  WHERE f.resolved_scan IS NULL AND f.host_id = c.host_id "
+                "  AND f.package_id = c.package_id AND f.cve_ref = c.cve_ref)",
+                (scan_id,)).rowcount
+            resolved = db.execute(
+                "UPDATE findings SET resolved_scan = ? "
+                "WHERE resolved_scan IS NULL AND first_scan < ? "
+                "AND host_id IN (SELECT host_id FROM temp.scanned) "
+                "AND package_id NOT IN (SELECT package_id FROM temp.keep) "
+                "AND NOT EXISTS (SELECT 1 FROM temp.cur c "
+                "  WHERE c.host_id = findings.host_id "
+                "  AND c.package_id = findings.package_id "
+                "  AND c.cve_ref = findings.cve_ref)",
+                (scan_id, scan_id)).rowcount
+            total = db.execute("SELECT COUNT(*) FROM temp.cur").fetchone()[0]
+            db.execute("UPDATE scans SET finished = ?, findings = ?, new = ?, "
+                       "resolved = ? WHERE id = ?",
+                       (datetime.utcnow().isoformat() + "Z", total, new,
+                        resolved, scan_id))
+            db.execute("DELETE FROM temp.cur")
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        log.info(f"Findings-DB: Scan #{scan_id} gespeichert – {total} Findings, "
+                 f"{new} neu, {resolved} behoben "
+                 f"({time.monotonic() - t0:.1f}s, {self.db_file})")
+        return scan_id
+
+    # ── Abfrage ──────────────────────────────────────────────────────────
+
+    def scans(self, limit: int = 20) -> list[tuple]:
+        return self._db.execute(
+            "SELECT id, started, sites, hosts, findings, new, resolved "
+            "FROM scans ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+
+    def scan_info(self, scan_id: Optional[int] = None) -> Optional[tuple]:
+        """(id, started, sites, findings, new, resolved) – Standard: letzter Scan."""
+        sql = "SELECT id, started, sites, findings, new, resolved FROM scans "
+        if scan_id:
+            return self._db.execute(sql + "WHERE id = ?", (scan_id,)).fetchone()
+        return self._db.execute(sql + "ORDER BY id DESC LIMIT 1").fetchone()
+
+    def _rows(self, where: str, params: tuple, severity: Optional[str]):
+        """Findings als Report-Zeilen (dict), zeilenweise."""
+        if severity:
+            where  += " AND c.severity = ?"
+            params += (severity.upper(),)
+        for site, host, name, version, vendor, data, first, resolved in \
+                self._db.execute(self._SELECT.format(where=where), params):
+            row = {"site": site, "host": host, "software_name": name,
+                   "software_version": version, "vendor": vendor}
+            row.update(json.loads(data))
+            row["first_scan"]    = first
+            row["resolved_scan"] = resolved
+            yield row
+
+    def new(self, scan_id: int, severity: Optional[str] = None):
+        """Findings, die in diesem Scan erstmals auftraten."""
+        return self._rows("f.first_scan = ?", (scan_id,), severity)
+
+    def resolved(self, scan_id: int, severity: Optional[str] = None):
+        """Findings, die in diesem Scan nicht mehr auftraten."""
+        return self._rows("f.resolved_scan = ?", (scan_id,), severity)
+
+    def by_cve(self, cve_id: str, severity: Optional[str] = None):
+        """Offene Findings einer CVE (welche Hosts sind betroffen?)."""
+        return self._rows("f.resolved_scan IS NULL AND c.cve_id = ?",
+                          (cve_id.upper(),), severity)
+
+    def by_host(self, host: str, severity: Optional[str] = None):
+        """Offene Findings eines Hosts (Name oder site/host)."""
+        site, _, name = host.rpartition("/")
+        where = "f.resolved_scan IS NULL AND h.host = ?"
+        if site:
+            return self._rows(where + " AND h.site = ?", (name, site), severity)
+        return self._rows(where, (name,), severity)
+
+    def close(self):
+        self._db.close()
+
 
 # ---------------------------------------------------------------------------
 # Scanner Orchestration
 # ---------------------------------------------------------------------------
 
+class HostMap:
+    """Kompakte Zuordnung Abfrage-Gruppe → Binär-Pakete → Hosts.
+
+    Statt eines Tupels (site, host, name, version, vendor) je Paket und
+    Host (500.000+ bei 1.000 Hosts):
+      - Hosts als Integer-IDs, (site, host) nur einmal gespeichert
+      - Binär-Pakete (name, version, vendor) interniert, einmal gespeichert
+      - je Paket ein array("I") der Host-IDs (4 Bytes je Vorkommen)
+    Die Tupel entstehen erst beim Erzeugen der Findings (expand) und nur
+    für Gruppen mit Treffern.
+    """
+
+    def __init__(self):
+        self.hosts:    list[tuple[str, str]]      = []
+        self.packages: list[tuple[str, str, str]] = []
+        self._host_ids: dict[tuple[str, str], int] = {}
+        self._pkg_ids:  dict[tuple, int]           = {}
+        self._pkg_hosts: list[array]               = []
+        self._groups:   dict[tuple, list[int]]     = {}
+
+    def add(self, group: tuple, sw: SoftwareEntry):
+        hkey = (sw.site, sw.host)
+        hid  = self._host_ids.get(hkey)
+        if hid is None:
+            hid = self._host_ids[hkey] = len(self.hosts)
+            self.hosts.append(hkey)
+        pkey = (group, sw.name, sw.version, sw.vendor)
+        pid  = self._pkg_ids.get(pkey)
+        if pid is None:
+            pid = self._pkg_ids[pkey] = len(self.packages)
+            self.packages.append((sw.name, sw.version, sw.vendor))
+            self._pkg_hosts.append(array("I"))
+            self._groups.setdefault(group, []).append(pid)
+        hosts = self._pkg_hosts[pid]
+        # Hosts kommen nacheinander – doppelte Zeilen eines Hosts nur einmal
+        if not hosts or hosts[-1] != hid:
+            hosts.append(hid)
+
+    def members(self, group: tuple) -> set[str]:
+        """Binär-Namen einer Gruppe."""
+        return {self.packages[pid][0] for pid in self._groups.get(group, ())}
+
+    def expand(self, group: tuple):
+        """(site, host, name, version, vendor) für alle Vorkommen einer Gruppe."""
+        for pid in self._groups.get(group, ()):
+            name, version, vendor = self.packages[pid]
+            for hid in self._pkg_hosts[pid]:
+                site, host = self.hosts[hid]
+                yield site, host, name, version, vendor
+
+    def package_hosts(self, group: tuple):
+        """((name, version, vendor), Host-IDs) je Binär-Paket einer Gruppe."""
+        for pid in self._groups.get(group, ()):
+            yield self.packages[pid], self._pkg_hosts[pid]
+
+    def package_counts(self, group: tuple):
+        """(name, version, vendor, Anzahl Hosts) je Binär-Paket einer Gruppe."""
+        for pid in self._groups.get(group, ()):
+            yield (*self.packages[pid], len(self._pkg_hosts[pid]))
+
+    def host_counts(self, group: tuple) -> dict[int, int]:
+        """Host-ID → Anzahl Binär-Pakete einer Gruppe auf diesem Host."""
+        counts: dict[int, int] = {}
+        for pid in self._groups.get(group, ()):
+            for hid in self._pkg_hosts[pid]:
+                counts[hid] = counts.get(hid, 0) + 1
+        return counts
+
+    def occurrences(self, group: tuple) -> int:
+        """Anzahl (Host, Binär-Paket)-Vorkommen einer Gruppe."""
+        return sum(len(self._pkg_hosts[pid]) for pid in self._groups.get(group, ()))
+
+    def nbytes(self) -> int:
+        """Speicher der Host-ID-Arrays (für die Log-Ausgabe)."""
+        return sum(a.itemsize * len(a) for a in self._pkg_hosts)
+
+
+class ScanResult:
+    """Scan-Ergebnis in faktorisierter Form: Gruppe → CVEs, Gruppe → Hosts.
+
+    Ein Finding ist (Host-Vorkommen einer Gruppe) × (CVE der Gruppe). Statt
+    alle Kombinationen als Objekte anzulegen, werden sie beim Schreiben der
+    Reports Zeile für Zeile erzeugt (iter_rows). Alle Findings tragen
+    denselben Scan-Zeitstempel.
+
+    Reihenfolge wie bisher: KEV zuerst, dann CVSS absteigend; sortiert wird
+    nur über die (Gruppe, CVE)-Paare, nicht über alle Findings.
+    """
+
+    def __init__(self, groups: list[tuple[tuple, list[CveMatch]]],
+                 host_map: HostMap, scanned_at: Optional[datetime] = None,
+                 unanswered: Optional[set[tuple]] = None):
+        self.groups     = groups           # nur Gruppen mit Treffern
+        self.host_map   = host_map
+        # Gruppen mit fehlender Antwort mindestens einer Quelle
+        self.unanswered = unanswered or set()
+        self.scanned_at = scanned_at or datetime.utcnow()
+        self.scan_timestamp = self.scanned_at.isoformat() + "Z"
+
+    @property
+    def file_stamp(self) -> str:
+        return self.scanned_at.strftime("%Y%m%d_%H%M%S")
+
+    def __len__(self) -> int:
+        return sum(len(cves) * self.host_map.occurrences(group)
+                   for group, cves in self.groups)
+
+    def _runs(self):
+        """(Gruppe, CVEs) in Report-Reihenfolge.
+
+        Aufeinanderfolgende CVEs einer Gruppe mit gleichem Sortierschlüssel
+        bilden einen Lauf – innerhalb eines Laufs Hosts außen, CVEs innen,
+        wie bei der früheren stabilen Sortierung aller Findings.
+        """
+        pairs = [(gi, cve) for gi, (_, cves) in enumerate(self.groups)
+                 for cve in cves]
+        pairs.sort(key=lambda p: (p[1].kev_exploited, p[1].cvss_score),
+                   reverse=True)
+        run_gi, run_key, run = None, None, []
+        for gi, cve in pairs:
+            key = (cve.kev_exploited, cve.cvss_score)
+            if run and (gi, key) != (run_gi, run_key):
+                yield self.groups[run_gi][0], run
+                run = []
+            run_gi, run_key = gi, key
+            run.append(cve)
+        if run:
+            yield self.groups[run_gi][0], run
+
+    def iter_rows(self):
+        """(site, host, name, version, vendor, cve) in Report-Reihenfolge."""
+        for group, cves in self._runs():
+            for site, host, name, version, vendor in self.host_map.expand(group):
+                for cve in cves:
+                    yield site, host, name, version, vendor, cve
+
+    def __iter__(self):
+        """VulnerabilityFinding-Objekte einzeln (Kompatibilität)."""
+        for site, host, name, version, vendor, cve in self.iter_rows():
+            yield VulnerabilityFinding(
+                site=site, host=host, software_name=name,
+                software_version=version, vendor=vendor, cve=cve,
+                scan_timestamp=self.scan_timestamp,
+            )
+
+
 class CveScanner:
     def __init__(self,
                  reader:      CheckmkInventoryReader,
@@ -1412,26 +3987,35 @@ class CveScanner:
                  osv_client:  Optional[OsvClient],
                  oss_client:  Optional[OssIndexClient] = None,
                  kev_client:  Optional[CisaKevClient]  = None,
-                 cache:       Optional[ApiCache]        = None):
-        self.reader = reader
-        self.nvd    = nvd_client
-        self.osv    = osv_client
-        self.oss    = oss_client
-        self.kev    = kev_client
-        self.cache  = cache
+                 cache:       Optional[ApiCache]        = None,
+                 parallel:    bool                      = True):
+        self.reader   = reader
+        self.nvd      = nvd_client
+        self.osv      = osv_client
+        self.oss      = oss_client
+        self.kev      = kev_client
+        self.cache    = cache
+        self.parallel = parallel
 
     def scan(self, sites: list[str],
              host_filter: Optional[list[str]] = None
-             ) -> list[VulnerabilityFinding]:
+             ) -> ScanResult:
+        scanned_at = datetime.utcnow()
 
         # ── Inventory einlesen (Generator – RAM-effizient) ──────────────
         # Anstatt alle SoftwareEntry-Objekte in eine Liste zu laden,
         # werden sie per Generator einzeln verarbeitet. Bei 1.000 Hosts
         # mit je 500 Paketen = 500.000 Objekte → nur unique_sw bleibt im RAM.
+        #
+        # Abgefragt wird je (Quell-Paket, Version): libssl3, libssl-dev und
+        # openssl 3.0.11-1 sind eine Abfrage. unique_sw enthält dafür einen
+        # Vertreter mit dem Quell-Namen, host_map die Binär-Pakete.
+        # Das Ecosystem steckt wie bisher implizit in der Distro-Version
+        # (…deb12u2, …el9); die Clients liefern Ergebnisse je name|version.
         unique_sw:    dict[tuple, SoftwareEntry] = {}
-        # host_map: (name, version) → Liste von (site, host) Tupeln
+        # host_map: (quelle, version) → Binär-Pakete → Host-IDs (kompakt),
         # wird für das spätere Findings-Mapping gebraucht
-        host_map:     dict[tuple, list[tuple]] = {}
+        host_map      = HostMap()
         total_entries = 0
 
         for site in sites:
@@ -1439,183 +4023,316 @@ class CveScanner:
                 total_entries += 1
                 if sw.package_type == "os":
                     continue  # OS-Info nur für Ecosystem-Mapping
-                key = (sw.name.lower(), sw.version.lower())
+                source = source_package_name(sw.name, sw.source, sw.package_type)
+                key    = (source.lower(), sw.version.lower())
                 if key not in unique_sw:
-                    unique_sw[key] = sw
-                host_map.setdefault(key, []).append((sw.site, sw.host,
-                                                      sw.name, sw.version,
-                                                      sw.vendor))
+                    unique_sw[key] = sw if source == sw.name else replace(sw, name=source)
+                host_map.add(key, sw)
 
-        log.info(f"Gesamt Software-Einträge: {total_entries}")
+        log.info(f"Gesamt Software-Einträge: {total_entries} auf "
+                 f"{len(host_map.hosts)} Hosts "
+                 f"(Host-Zuordnung {host_map.nbytes() / 1e6:.1f} MB)")
         sw_list = list(unique_sw.values())
-        log.info(f"Unique Software/Version: {len(unique_sw)}")
+        log.info(f"Unique Software/Version: {len(host_map.packages)} "
+                 f"Binär-Pakete → {len(unique_sw)} Abfragen (nach Quell-Paket)")
+        # NVD: Quell- oder Binär-Name mit Package-Map-Eintrag
+        nvd_names = {key: nvd_mapped_name([sw.name, *sorted(host_map.members(key))])
+                     for key, sw in unique_sw.items()}
 
         # ── Cache-Status anzeigen ────────────────────────────────────────
         if self.cache:
             cs = self.cache.stats()
-            log.info(f"Cache: {cs['fresh']} frische Einträge in {self.cache.cache_file}")
-
-        # ── OSV.dev Batch-Lookup ─────────────────────────────────────────
-        osv_results: dict[str, list[CveMatch]] = {}
+            log.info(f"Cache: {cs['fresh']} frische Einträge in {self.cache.cache_file} "
+                     f"(davon {cs['empty']} ohne Schwachstellen)")
+
+        # ── Quellen-Abfrage – OSV, OSS Index, NVD und KEV-Feed parallel ──
+        # Die Phasen sind bis zum Merge unabhängig und warten überwiegend
+        # auf das Netz; jede Quelle behält ihr eigenes Worker-Budget
+        # (osv detail_workers, oss workers, nvd workers).
+        phases: dict[str, tuple] = {}
         if self.osv:
+            phases["OSV"] = (self._osv_phase, sw_list)
+        if self.oss:
+            phases["OSS"] = (self._oss_phase, sw_list)
+        if self.nvd:
+            phases["NVD"] = (self._nvd_phase, unique_sw, nvd_names)
+        if self.kev:
+            phases["KEV"] = (self._kev_phase,)
+        results = self._run_phases(phases)
+        osv_results: dict[str, list[CveMatch]]   = results.get("OSV", {})
+        oss_results: dict[str, list[CveMatch]]   = results.get("OSS", {})
+        nvd_results: dict[tuple, list[CveMatch]] = results.get("NVD", {})
+
+        # Gruppen, die nicht jede aktive Quelle beantwortet hat (Batch- oder
+        # API-Fehler) – ihre offenen Findings schließt die Findings-DB nicht
+        unanswered: set[tuple] = set()
+        for client, res in ((self.osv, osv_results), (self.oss, oss_results)):
+            if client:
+                unanswered.update(k for k in unique_sw if f"{k[0]}|{k[1]}" not in res)
+        if self.nvd:
+            # API: nur Mapping-Pakete werden abgefragt
+            unanswered.update(k for k in unique_sw if k not in nvd_results
+                              and (self.nvd.mirror is not None or nvd_names[k]))
+        if unanswered:
+            log.warning(f"{len(unanswered)} Pakete nicht von allen Quellen "
+                        f"beantwortet – deren Findings gelten nicht als behoben")
+
+        # ── Findings zusammenführen ──────────────────────────────────────
+        # Scanweites Register: jede CVE einmal, Aliases über alle Pakete
+        # und Quellen aufgelöst; NVD zuerst, dann OSV, dann OSS (Vorrang
+        # wie bisher je Paket)
+        log.info("─" * 55)
+        log.info("Merge OSV + OSS + NVD...")
+        registry = CveRegistry()
+        matches: dict[tuple, list[CveMatch]] = {}
+        for source in (nvd_results, osv_results, oss_results):
+            for (name, version) in unique_sw:
+                cves = source.get((name, version) if source is nvd_results
+                                  else f"{name}|{version}")
+                if not cves:
+                    continue
+                matches.setdefault((name, version), []).extend(cves)
+                for cve in cves:
+                    registry.add(cve)
+        del results, nvd_results, osv_results, oss_results
+
+        # Findings bleiben faktorisiert: Gruppe → CVEs, Hosts über host_map;
+        # die CVE-Objekte sind die kanonischen Einträge aus dem Register
+        groups: list[tuple[tuple, list[CveMatch]]] = [
+            (group, registry.resolve(matches[group]))
+            for group in unique_sw if group in matches]
+        del matches
+        log.info(f"Merge: {len(registry)} unterschiedliche Schwachstellen "
+                 f"in {len(groups)} Paketen")
+        result = ScanResult(groups, host_map, scanned_at, unanswered)
+
+        # ── CISA KEV Anreicherung ────────────────────────────────────────
+        if self.kev:
             log.info("─" * 55)
-            log.info("OSV.dev Batch-Lookup...")
-            # Cache-Hits herausfiltern
-            osv_uncached = [sw for sw in sw_list
-                            if self.cache is None
-                            or self.cache.get("osv", sw.name, sw.version) is None]
-            cached_hits  = len(sw_list) - len(osv_uncached)
-            if cached_hits:
-                log.info(f"  OSV Cache-Hits: {cached_hits} Pakete übersprungen")
-                for sw in sw_list:
-                    if self.cache:
-                        cached = self.cache.get("osv", sw.name, sw.version)
-                        if cached is not None:
-                            key = f"{sw.name.lower()}|{sw.version.lower()}"
-                            osv_results[key] = [CveMatch(**c) for c in cached]
-            # API-Abfragen für nicht gecachte Pakete
-            if osv_uncached:
-                fresh = self.osv.query_batch(osv_uncached)
-                osv_results.update(fresh)
-                if self.cache:
-                    for key, cves in fresh.items():
-                        n, v = key.split("|", 1)
-                        self.cache.set("osv", n, v, [vars(c) for c in cves])
-            log.info(f"OSV: {sum(len(v) for v in osv_results.values())} "
-                     f"Vulnerabilities in {len(osv_results)} Paketen")
+            n = self.kev.enrich_cves(registry.records())
+            marked = sum(sum(c.kev_exploited for c in cves) * host_map.occurrences(g)
+                         for g, cves in groups)
+            log.info(f"CISA KEV: {n} CVEs als aktiv ausgenutzt markiert "
+                     f"({marked} Findings)")
 
-        # ── OSS Index Batch-Lookup ───────────────────────────────────────
+        # ── Cache persistieren ───────────────────────────────────────────
+        if self.cache:
+            self.cache.save()
+
+        return result
+
+    def _osv_phase(self, sw_list: list[SoftwareEntry]) -> dict[str, list[CveMatch]]:
+        """OSV.dev Batch-Lookup (bzw. Offline-Abgleich) mit Cache."""
+        osv_results: dict[str, list[CveMatch]] = {}
+        log.info("OSV.dev Batch-Lookup..." if self.osv.offline is None
+                 else "OSV.dev Offline-Abgleich...")
+        # Offline-Abgleich ist lokal und schnell – nicht cachen, damit
+        # neue Dumps sofort wirken
+        osv_cache = self.cache if self.osv.offline is None else None
+        # Cache-Hits herausfiltern
+        osv_uncached = [sw for sw in sw_list
+                        if osv_cache is None
+                        or osv_cache.get("osv", sw.name, sw.version) is None]
+        cached_hits  = len(sw_list) - len(osv_uncached)
+        if cached_hits:
+            log.info(f"  OSV Cache-Hits: {cached_hits} Pakete übersprungen")
+            for sw in sw_list:
+                if osv_cache:
+                    cached = osv_cache.get("osv", sw.name, sw.version)
+                    if cached is not None:
+                        key = f"{sw.name.lower()}|{sw.version.lower()}"
+                        osv_results[key] = [CveMatch(**c) for c in cached]
+        # API-Abfragen für nicht gecachte Pakete
+        if osv_uncached:
+            fresh = self.osv.query_batch(osv_uncached)
+            osv_results.update(fresh)
+            if osv_cache:
+                for key, cves in fresh.items():
+                    n, v = key.split("|", 1)
+                    osv_cache.set("osv", n, v, [vars(c) for c in cves])
+        log.info(f"OSV: {sum(len(v) for v in osv_results.values())} "
+                 f"Vulnerabilities in {sum(1 for v in osv_results.values() if v)} Paketen")
+        return osv_results
+
+    def _oss_phase(self, sw_list: list[SoftwareEntry]) -> dict[str, list[CveMatch]]:
+        """OSS Index Batch-Lookup mit Cache."""
         oss_results: dict[str, list[CveMatch]] = {}
-        if self.oss:
-            log.info("─" * 55)
-            log.info("OSS Index Batch-Lookup...")
-            oss_uncached = [sw for sw in sw_list
-                            if self.cache is None
-                            or self.cache.get("oss", sw.name, sw.version) is None]
-            cached_hits = len(sw_list) - len(oss_uncached)
-            if cached_hits:
-                log.info(f"  OSS Cache-Hits: {cached_hits} Pakete übersprungen")
-                for sw in sw_list:
-                    if self.cache:
-                        cached = self.cache.get("oss", sw.name, sw.version)
-                        if cached is not None:
-                            key = f"{sw.name.lower()}|{sw.version.lower()}"
-                            oss_results[key] = [CveMatch(**c) for c in cached]
-            if oss_uncached:
-                fresh = self.oss.query_batch(oss_uncached)
-                oss_results.update(fresh)
+        log.info("OSS Index Batch-Lookup...")
+        oss_uncached = [sw for sw in sw_list
+                        if self.cache is None
+                        or self.cache.get("oss", sw.name, sw.version) is None]
+        cached_hits = len(sw_list) - len(oss_uncached)
+        if cached_hits:
+            log.info(f"  OSS Cache-Hits: {cached_hits} Pakete übersprungen")
+            for sw in sw_list:
                 if self.cache:
-                    for key, cves in fresh.items():
-                        n, v = key.split("|", 1)
-                        self.cache.set("oss", n, v, [vars(c) for c in cves])
-            log.info(f"OSS: {sum(len(v) for v in oss_results.values())} "
-                     f"Vulnerabilities in {len(oss_results)} Paketen")
-
-        # ── NVD Lookup – NUR Pakete mit bekanntem Mapping ────────────────
+                    cached = self.cache.get("oss", sw.name, sw.version)
+                    if cached is not None:
+                        key = f"{sw.name.lower()}|{sw.version.lower()}"
+                        oss_results[key] = [CveMatch(**c) for c in cached]
+        if oss_uncached:
+            fresh = self.oss.query_batch(oss_uncached)
+            oss_results.update(fresh)
+            if self.cache:
+                for key, cves in fresh.items():
+                    n, v = key.split("|", 1)
+                    self.cache.set("oss", n, v, [vars(c) for c in cves])
+        log.info(f"OSS: {sum(len(v) for v in oss_results.values())} "
+                 f"Vulnerabilities in {sum(1 for v in oss_results.values() if v)} Paketen")
+        return oss_results
+
+    def _nvd_phase(self, unique_sw: dict[tuple, SoftwareEntry],
+                   nvd_names: dict[tuple, str]) -> dict[tuple, list[CveMatch]]:
+        """NVD Lookup – Mirror: alle Pakete lokal, API: nur Mapping-Pakete.
+
+        Wie bei OSV/OSS sind beantwortete Pakete auch ohne Treffer enthalten
+        (leere Liste); fehlgeschlagene API-Abfragen fehlen.
+        """
         nvd_results: dict[tuple, list[CveMatch]] = {}
-        if self.nvd:
-            log.info("─" * 55)
-            mapped_sw = [(name, version, sw)
-                         for (name, version), sw in unique_sw.items()
-                         if name in PACKAGE_NAME_MAP]
+        if self.nvd.mirror is not None:
+            log.info(f"NVD Lookup (lokaler Mirror): {len(unique_sw)} Pakete")
+            for key, sw in unique_sw.items():
+                nvd_results[key] = self.nvd.search_mirror(nvd_names[key] or sw.name,
+                                                          sw.version)
+            log.info(f"NVD: {sum(len(v) for v in nvd_results.values())} "
+                     f"Vulnerabilities in {sum(1 for v in nvd_results.values() if v)} Paketen")
+        # API: NUR Pakete mit bekanntem Mapping
+        else:
+            mapped_sw = [(nvd_names[key], key[1], key)
+                         for key in unique_sw if nvd_names[key]]
             log.info(f"NVD Lookup (nur Mapping-Pakete): {len(mapped_sw)} / {len(unique_sw)} Pakete")
-            nvd_skipped = 0
-            for idx, (name, version, sw_proto) in enumerate(mapped_sw, 1):
+            nvd_skipped, nvd_todo = 0, []
+            for name, version, key in mapped_sw:
                 # Cache prüfen
                 if self.cache:
                     cached = self.cache.get("nvd", name, version)
                     if cached is not None:
-                        if cached:
-                            nvd_results[(name, version)] = [CveMatch(**c) for c in cached]
+                        nvd_results[key] = [CveMatch(**c) for c in cached]
                         nvd_skipped += 1
                         continue
-                log.info(f"[{idx}/{len(mapped_sw)}] NVD: {name} {version}")
-                nvd_product, nvd_vendor = map_package_name(name)
-                cves = []
-                if nvd_vendor:
-                    cves = self.nvd.search_by_cpe(nvd_vendor, nvd_product, version)
-                if not cves:
-                    cves = self.nvd.search_by_keyword(nvd_product, version)
-                if self.cache:
-                    self.cache.set("nvd", name, version, [vars(c) for c in cves])
-                if cves:
-                    nvd_results[(name, version)] = cves
-                    log.info(f"  → {len(cves)} CVE(s)")
+                nvd_todo.append((name, version, key))
+            # Worker teilen sich das Rate-Limit; Cache-Schreiben bleibt im
+            # Thread der NVD-Phase
+            with ThreadPoolExecutor(max_workers=self.nvd.workers) as pool:
+                futures = {pool.submit(self.nvd.lookup, name, version): (name, version, key)
+                           for name, version, key in nvd_todo}
+                for idx, fut in enumerate(as_completed(futures), 1):
+                    name, version, key = futures[fut]
+                    cves, failed  = fut.result()
+                    log.info(f"[{idx}/{len(nvd_todo)}] NVD: {name} {version}"
+                             + (f" → {len(cves)} CVE(s)" if cves else ""))
+                    # Teilweise fehlgeschlagen (z.B. CPE-Suche): Keyword-Treffer
+                    # sind unvollständig – nicht beantwortet, nicht cachen
+                    if not failed:
+                        nvd_results[key] = cves
+                        if self.cache:
+                            self.cache.set("nvd", name, version, [vars(c) for c in cves])
             if nvd_skipped:
                 log.info(f"NVD Cache-Hits: {nvd_skipped} Pakete übersprungen")
+        return nvd_results
 
-        # ── Findings zusammenführen ──────────────────────────────────────
-        log.info("─" * 55)
-        log.info("Merge OSV + OSS + NVD...")
-        findings: list[VulnerabilityFinding] = []
-
-        for (name, version), _ in unique_sw.items():
-            key      = f"{name}|{version}"
-            nvd_cves = nvd_results.get((name, version), [])
-            osv_cves = osv_results.get(key, [])
-            oss_cves = oss_results.get(key, [])
-            if not nvd_cves and not osv_cves and not oss_cves:
-                continue
-
-            merged_cves = CveMerger.merge(nvd_cves, osv_cves, oss_cves)
-            for (h_site, h_host, h_name, h_version, h_vendor) in                     host_map.get((name, version), []):
-                for cve in merged_cves:
-                    findings.append(VulnerabilityFinding(
-                        site=h_site, host=h_host,
-                        software_name=h_name, software_version=h_version,
-                        vendor=h_vendor, cve=cve,
-                    ))
-
-        # ── CISA KEV Anreicherung ────────────────────────────────────────
-        if self.kev:
-            log.info("─" * 55)
-            n = self.kev.enrich_findings(findings)
-            log.info(f"CISA KEV: {n} Findings als aktiv ausgenutzt markiert")
-
-        # ── Cache persistieren ───────────────────────────────────────────
-        if self.cache:
-            self.cache.save()
+    def _kev_phase(self) -> None:
+        """KEV-Feed vorab laden – die Anreicherung folgt nach dem Merge."""
+        self.kev._load()
 
-        findings.sort(key=lambda f: (f.cve.kev_exploited, f.cve.cvss_score),
-                      reverse=True)
-        return findings
+    def _run_phases(self, phases: dict[str, tuple]) -> dict[str, object]:
+        """Führt die Quellen-Phasen aus – parallel (je Quelle ein Thread)
+        oder mit parallel=False nacheinander. Log-Zeilen tragen den
+        Quellen-Präfix, die Dauer je Phase wird protokolliert."""
+        log.info("─" * 55)
+        log.info(f"Quellen-Abfrage: {', '.join(phases) or '-'}"
+                 + (" (parallel)" if self.parallel and len(phases) > 1 else ""))
+
+        def run(name: str, job: tuple):
+            t0 = time.monotonic()
+            res = job[0](*job[1:])
+            log.info(f"{name}: Phase fertig in {time.monotonic() - t0:.1f}s")
+            return res
+
+        t0 = time.monotonic()
+        if not self.parallel or len(phases) < 2:
+            results = {name: run(name, job) for name, job in phases.items()}
+        else:
+            with ThreadPoolExecutor(max_workers=len(phases),
+                                    thread_name_prefix="source") as pool:
+                futures = {name: pool.submit(run, name, job)
+                           for name, job in phases.items()}
+                results = {name: fut.result() for name, fut in futures.items()}
+        log.info(f"Quellen-Abfrage fertig in {time.monotonic() - t0:.1f}s")
+        return results
 
     @staticmethod
-    def build_summary(findings: list[VulnerabilityFinding]
-                      ) -> tuple[dict, dict]:
+    def build_summary(result: ScanResult) -> tuple[dict, dict]:
+        """Zusammenfassung aus dem faktorisierten Ergebnis.
+
+        Gezählt wird je (Gruppe, CVE) × Vorkommen, ohne Findings zu
+        erzeugen; top_cve und die Reihenfolge gleicher Zählerstände
+        entsprechen der Report-Reihenfolge.
+        """
         by_severity = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0, "NONE": 0}
         by_source   = {"NVD": 0, "OSV": 0, "OSS": 0, "NVD+OSV": 0, "OTHER": 0}
         kev_count   = 0
-        by_host:    dict[tuple, dict] = {}
-
-        for f in findings:
-            by_severity[f.cve.severity] = \
-                by_severity.get(f.cve.severity, 0) + 1
-            by_source[f.cve.source] = by_source.get(f.cve.source, 0) + 1
-            if f.cve.kev_exploited:
-                kev_count += 1
-
-            key = (f.site, f.host)
-            if key not in by_host:
-                by_host[key] = {"total": 0, "top_cve": "",
-                                "top_score": 0.0, "sources": set()}
-            by_host[key]["total"] += 1
-            by_host[key][f.cve.severity] = by_host[key].get(f.cve.severity, 0) + 1
-            by_host[key]["sources"].add(f.cve.source)
-            if f.cve.cvss_score > by_host[key]["top_score"]:
-                by_host[key]["top_score"] = f.cve.cvss_score
-                by_host[key]["top_cve"]   = f.cve.cve_id
-
-        for hd in by_host.values():
+        total       = 0
+        by_hid:     dict[int, dict] = {}
+        host_map    = result.host_map
+
+        for group, cves in result.groups:
+            hcounts = host_map.host_counts(group)
+            occ     = sum(hcounts.values())
+            total  += len(cves) * occ
+            sev:  dict[str, int] = {}
+            srcs: set[str]       = set()
+            top, kev = None, 0
+            for cve in cves:
+                by_severity[cve.severity] = by_severity.get(cve.severity, 0) + occ
+                by_source[cve.source]     = by_source.get(cve.source, 0) + occ
+                kev_count += occ if cve.kev_exploited else 0
+                kev       += cve.kev_exploited
+                sev[cve.severity] = sev.get(cve.severity, 0) + 1
+                srcs.add(cve.source)
+                if cve.cvss_score > 0 and (
+                        top is None or (cve.cvss_score, cve.kev_exploited)
+                        > (top.cvss_score, top.kev_exploited)):
+                    top = cve
+
+            for hid, n in hcounts.items():
+                hd = by_hid.get(hid)
+                if hd is None:
+                    hd = by_hid[hid] = {"total": 0, "top_cve": "",
+                                        "top_score": 0.0, "sources": set(),
+                                        "kev": 0, "_top_kev": False}
+                hd["total"] += len(cves) * n
+                hd["kev"]   += kev * n
+                for s, c in sev.items():
+                    hd[s] = hd.get(s, 0) + c * n
+                hd["sources"] |= srcs
+                if top and (top.cvss_score, top.kev_exploited) > \
+                        (hd["top_score"], hd["_top_kev"]):
+                    hd["top_score"] = top.cvss_score
+                    hd["top_cve"]   = top.cve_id
+                    hd["_top_kev"]  = top.kev_exploited
+
+        by_host: dict[tuple, dict] = {}
+        for hid, hd in by_hid.items():
+            del hd["_top_kev"]
             hd["sources"] = ", ".join(sorted(hd["sources"]))
+            by_host[host_map.hosts[hid]] = hd
 
+        # Reihenfolge des ersten Auftretens im Report (für gleiche Zähler)
         sw_count: dict[str, int] = {}
-        for f in findings:
-            k = f"{f.software_name} {f.software_version}"
-            sw_count[k] = sw_count.get(k, 0) + 1
+        seen: set[tuple] = set()
+        cves_by_group = dict(result.groups)
+        for group, _ in result._runs():
+            if group in seen:
+                continue
+            seen.add(group)
+            n_cves = len(cves_by_group[group])
+            for name, version, _, n in host_map.package_counts(group):
+                k = f"{name} {version}"
+                sw_count[k] = sw_count.get(k, 0) + n_cves * n
 
         return {
-            "total_findings":  len(findings),
+            "total_findings":  total,
             "by_severity":     by_severity,
             "by_source":       by_source,
             "affected_hosts":  len(by_host),
@@ -1639,28 +4356,54 @@ def load_config(config_path: Optional[str]) -> configparser.ConfigParser:
             "omd_root":    "/omd/sites",
             "sites":       "",          # leer = alle Sites auto-erkennen
             "hosts":       "",          # leer = alle Hosts
+            "workers":     "1",         # Prozesse für das Inventory-Parsing
+        },
+        "inventory_index": {
+            "enabled": "true",
+            "file":    "/tmp/cve_scanner_inventory_index.json",
         },
         "nvd": {
             "enabled":        "true",
             "api_key":        "",
             "min_cvss_score": "0.0",
+            "mode":           "api",    # api | mirror
+            "mirror_db":      "/tmp/cve_scanner_nvd_mirror.sqlite",
+            "sync":           "false",  # Mirror vor jedem Scan aktualisieren
+            "workers":        str(NVD_WORKERS),
         },
         "osv": {
-            "enabled": "true",
+            "enabled":        "true",
+            "detail_workers": str(OSV_DETAIL_WORKERS),
+            "mode":           "api",    # api | offline
+            "offline_db":     "/tmp/cve_scanner_osv_offline.sqlite",
+            "offline_dumps":  "",       # leer = aus den Paketen ableiten
+            "sync":           "false",  # Dumps vor jedem Scan aktualisieren
+            "dump_url":       OSV_DUMP_URL,
         },
         "oss_index": {
             "enabled":  "true",
             "username": "",   # Sonatype OSS Index Account (optional, erhöht Rate-Limit)
             "token":    "",
+            "workers":  str(OSS_WORKERS),
         },
         "cisa_kev": {
             "enabled":   "true",
             "cache_dir": "/tmp",
         },
+        "http": {
+            "pool_size":   str(HTTP_POOL_SIZE),
+            "retries":     str(HTTP_RETRIES),
+            "backoff":     str(HTTP_BACKOFF),
+            "max_backoff": str(HTTP_MAX_BACKOFF),
+            "parallel_sources": "true",   # OSV, OSS Index, NVD gleichzeitig
+        },
+        "http_limits": {},   # <host> = <requests>/<sekunden>
         "cache": {
             "enabled":  "true",
-            "file":     "/tmp/cve_scanner_cache.json",
+            "file":     "/tmp/cve_scanner_cache.sqlite",
             "ttl_hours": "24",
+            "negative_ttl_hours": "6",   # TTL für Pakete ohne Schwachstellen
+            "max_entries": "500000",
         },
         "package_map": {
             "file": "",   # Pfad zu externer JSON/YAML Datei (leer = nur eingebaut)
@@ -1668,6 +4411,16 @@ def load_config(config_path: Optional[str]) -> configparser.ConfigParser:
         "output": {
             "directory": "/var/log/cve_scanner",
         },
+        "checkmk_output": {
+            "mode":          "off",     # off | spool
+            "spool_dir":     "/var/lib/check_mk_agent/spool",
+            "refresh_hours": "12",      # unveränderte Hosts spätestens dann neu schreiben
+        },
+        "findings_db": {
+            "enabled":      "false",
+            "file":         "/tmp/cve_scanner_findings.sqlite",
+            "delta_report": "false",   # nur Änderungen statt vollständigem JSON/CSV
+        },
     })
     if config_path:
         read = cfg.read(config_path)
@@ -1724,6 +4477,13 @@ Beispiele:
                           help="OMD Root-Verzeichnis (Standard: /omd/sites)")
     site_grp.add_argument("--list-hosts", action="store_true",
                           help="Nur Hosts auflisten, nicht scannen")
+    site_grp.add_argument("--workers", type=int, default=None, metavar="N",
+                          help="Inventory mit N Prozessen parsen (Standard: 1)")
+    site_grp.add_argument("--no-index", action="store_true",
+                          help="Inventory-Index deaktivieren (alle Hosts neu parsen)")
+    site_grp.add_argument("--index-file", default=None, metavar="FILE",
+                          help="Pfad zum Inventory-Index "
+                               "(Standard: /tmp/cve_scanner_inventory_index.json)")
 
     src_grp = p.add_argument_group("Quellen")
     src_grp.add_argument("--no-nvd", action="store_true",
@@ -1734,6 +4494,28 @@ Beispiele:
                          help="OSS Index deaktivieren")
     src_grp.add_argument("--no-kev", action="store_true",
                          help="CISA KEV Anreicherung deaktivieren")
+    src_grp.add_argument("--osv-workers", type=int, default=None, metavar="N",
+                         help=f"Parallele OSV-Detail-Abfragen (Standard: {OSV_DETAIL_WORKERS})")
+    src_grp.add_argument("--osv-offline", action="store_true",
+                         help="OSV lokal gegen die Ecosystem-Dumps abgleichen (keine API)")
+    src_grp.add_argument("--osv-sync", action="store_true",
+                         help="OSV-Dumps vor dem Scan laden/aktualisieren (impliziert --osv-offline)")
+    src_grp.add_argument("--osv-import", nargs="+", metavar="ZIP",
+                         help="Lokale OSV-Dumps (all.zip) importieren (impliziert --osv-offline)")
+    src_grp.add_argument("--nvd-mirror", action="store_true",
+                         help="NVD aus dem lokalen Mirror abfragen (alle Pakete, keine API)")
+    src_grp.add_argument("--nvd-sync", action="store_true",
+                         help="NVD-Mirror vor dem Scan aktualisieren (impliziert --nvd-mirror)")
+    src_grp.add_argument("--nvd-import", nargs="+", metavar="FEED",
+                         help="NVD JSON-2.0-Feeds (nvdcve-2.0-*.json.gz) importieren "
+                              "(impliziert --nvd-mirror)")
+    src_grp.add_argument("--nvd-workers", type=int, default=None, metavar="N",
+                         help=f"Parallele NVD-Abfragen, teilen sich das Rate-Limit "
+                              f"(Standard: {NVD_WORKERS})")
+    src_grp.add_argument("--oss-workers", type=int, default=None, metavar="N",
+                         help=f"Parallele OSS-Index-Batches (Standard: {OSS_WORKERS})")
+    src_grp.add_argument("--sequential-sources", action="store_true",
+                         help="Quellen nacheinander statt parallel abfragen")
     src_grp.add_argument("--nvd-key",
                          default=os.environ.get("NVD_API_KEY"),
                          help="NVD API Key [env: NVD_API_KEY]")
@@ -1751,20 +4533,93 @@ Beispiele:
                          help="API-Cache deaktivieren")
     src_grp.add_argument("--cache-file", default=None,
                          metavar="FILE",
-                         help="Pfad zur Cache-Datei (Standard: /tmp/cve_scanner_cache.json)")
+                         help="Pfad zur Cache-Datenbank (Standard: /tmp/cve_scanner_cache.sqlite)")
     src_grp.add_argument("--cache-ttl", type=int, default=None,
                          metavar="HOURS",
                          help="Cache-Gültigkeitsdauer in Stunden (Standard: 24)")
+    src_grp.add_argument("--cache-negative-ttl", type=int, default=None,
+                         metavar="HOURS",
+                         help="Gültigkeit für Pakete ohne Schwachstellen "
+                              "in Stunden (Standard: 6)")
 
     out_grp = p.add_argument_group("Output")
     out_grp.add_argument("--output", default="./reports",
                          help="Ausgabeverzeichnis")
+    out_grp.add_argument("--checkmk-output", choices=CheckmkSectionWriter.MODES,
+                         default=None,
+                         help="Host-Zusammenfassung als Checkmk-Section schreiben "
+                              "(spool, Standard: aus)")
     out_grp.add_argument("--verbose", "-v", action="store_true",
                          help="Debug-Ausgabe")
 
+    db_grp = p.add_argument_group("Findings-DB")
+    db_grp.add_argument("--findings-db", action="store_true",
+                        help="Scan in der Findings-DB speichern (Historie, Delta)")
+    db_grp.add_argument("--findings-db-file", default=None, metavar="FILE",
+                        help="Pfad zur Findings-DB "
+                             "(Standard: /tmp/cve_scanner_findings.sqlite)")
+    db_grp.add_argument("--delta-report", action="store_true",
+                        help="Nur neue/behobene Findings schreiben "
+                             "(impliziert --findings-db)")
+    db_grp.add_argument("--db-scans", action="store_true",
+                        help="Gespeicherte Scans auflisten (kein Scan)")
+    db_grp.add_argument("--db-new", type=int, nargs="?", const=0, metavar="SCAN",
+                        help="Neue Findings eines Scans (Standard: letzter, kein Scan)")
+    db_grp.add_argument("--db-resolved", type=int, nargs="?", const=0, metavar="SCAN",
+                        help="Behobene Findings eines Scans (Standard: letzter, kein Scan)")
+    db_grp.add_argument("--db-cve", metavar="CVE",
+                        help="Hosts mit offener CVE anzeigen (kein Scan)")
+    db_grp.add_argument("--db-host", metavar="[SITE/]HOST",
+                        help="Offene Findings eines Hosts anzeigen (kein Scan)")
+    db_grp.add_argument("--db-severity", metavar="SEV",
+                        choices=["CRITICAL", "HIGH", "MEDIUM", "LOW", "NONE"],
+                        type=str.upper,
+                        help="Abfragen auf eine Severity einschränken")
+
     return p.parse_args()
 
 
+def query_findings_db(db: FindingsDb, args) -> None:
+    """Beantwortet --db-* Abfragen aus der Findings-DB (ohne Scan)."""
+    t0 = time.monotonic()
+    if args.db_scans:
+        print(f"{'Scan':>5}  {'Zeitpunkt':<28} {'Findings':>9} {'neu':>7} "
+              f"{'behoben':>7}  Sites")
+        for sid, started, sites, hosts, total, new, resolved in db.scans():
+            print(f"{sid:>5}  {started:<28} {total:>9} {new:>7} {resolved:>7}  {sites}")
+        return
+
+    rows, title = None, ""
+    if args.db_new is not None or args.db_resolved is not None:
+        wanted = args.db_new if args.db_new is not None else args.db_resolved
+        info   = db.scan_info(wanted or None)
+        if info is None:
+            log.error(f"Scan nicht gefunden: {wanted or 'keine Scans in ' + str(db.db_file)}")
+            sys.exit(1)
+        if args.db_new is not None:
+            rows, title = db.new(info[0], args.db_severity), \
+                          f"Neue Findings in Scan #{info[0]} ({info[1]})"
+        else:
+            rows, title = db.resolved(info[0], args.db_severity), \
+                          f"Behobene Findings in Scan #{info[0]} ({info[1]})"
+    elif args.db_cve:
+        rows, title = db.by_cve(args.db_cve, args.db_severity), \
+                      f"Offene Findings für {args.db_cve.upper()}"
+    elif args.db_host:
+        rows, title = db.by_host(args.db_host, args.db_severity), \
+                      f"Offene Findings auf {args.db_host}"
+
+    print(title)
+    n = 0
+    for row in rows:
+        n += 1
+        kev = "KEV " if row.get("kev_exploited") else "    "
+        print(f"  {kev}{row['severity']:<9} {row['cvss_score']:>4}  {row['cve_id']:<20} "
+              f"{row['site']}/{row['host']:<25} {row['software_name']} "
+              f"{row['software_version']}  (seit Scan #{row['first_scan']})")
+    print(f"{n} Findings ({(time.monotonic() - t0) * 1000:.0f} ms)")
+
+
 def main():
     args = parse_args()
 
@@ -1781,27 +4636,72 @@ def main():
                   os.environ.get("NVD_API_KEY")
     output_dir  = args.output or cfg.get("output", "directory")
     use_cache   = not args.no_cache and cfg.getboolean("cache", "enabled", fallback=True)
-    cache_file  = (args.cache_file or cfg.get("cache", "file", fallback="/tmp/cve_scanner_cache.json"))
+    cache_file  = (args.cache_file or cfg.get("cache", "file", fallback="/tmp/cve_scanner_cache.sqlite"))
+    cache_neg_ttl = (args.cache_negative_ttl or
+                     cfg.getint("cache", "negative_ttl_hours", fallback=6)) * 3600
+    cache_max   = cfg.getint("cache", "max_entries", fallback=500000)
     cache_ttl   = (args.cache_ttl or cfg.getint("cache", "ttl_hours", fallback=24)) * 3600
     pkg_map_file = args.package_map or cfg.get("package_map", "file", fallback="") or None
+    workers     = args.workers or cfg.getint("checkmk", "workers", fallback=1)
+    use_index   = not args.no_index and \
+                  cfg.getboolean("inventory_index", "enabled", fallback=True)
+    index_file  = args.index_file or cfg.get(
+        "inventory_index", "file",
+        fallback="/tmp/cve_scanner_inventory_index.json")
+
+    cmk_output  = (args.checkmk_output or
+                   cfg.get("checkmk_output", "mode", fallback="off")).strip().lower()
+    if cmk_output not in CheckmkSectionWriter.MODES:
+        log.error(f"[checkmk_output] mode = {cmk_output}: erwartet "
+                  f"{' | '.join(CheckmkSectionWriter.MODES)}")
+        sys.exit(1)
+    delta_report = args.delta_report or \
+                   cfg.getboolean("findings_db", "delta_report", fallback=False)
+    use_fdb     = args.findings_db or delta_report or \
+                  cfg.getboolean("findings_db", "enabled", fallback=False)
+    fdb_file    = args.findings_db_file or cfg.get(
+        "findings_db", "file", fallback="/tmp/cve_scanner_findings.sqlite")
+
+    # --db-*: nur Abfragen der Findings-DB, kein Scan
+    if args.db_scans or args.db_new is not None or args.db_resolved is not None \
+            or args.db_cve or args.db_host:
+        query_findings_db(FindingsDb(fdb_file), args)
+        return
 
     # Package-Map initialisieren (eingebaut + optional externe Datei)
     init_package_map(pkg_map_file)
 
     use_nvd     = not args.no_nvd and cfg.getboolean("nvd", "enabled", fallback=True)
+    nvd_workers = args.nvd_workers or cfg.getint("nvd", "workers", fallback=NVD_WORKERS)
+    nvd_sync    = args.nvd_sync or cfg.getboolean("nvd", "sync", fallback=False)
+    nvd_use_mirror = args.nvd_mirror or nvd_sync or bool(args.nvd_import) or \
+                     cfg.get("nvd", "mode", fallback="api").strip().lower() == "mirror"
     use_osv     = not args.no_osv and cfg.getboolean("osv", "enabled", fallback=True)
     use_oss     = not args.no_oss and cfg.getboolean("oss_index", "enabled", fallback=True)
     use_kev     = not args.no_kev and cfg.getboolean("cisa_kev", "enabled", fallback=True)
     oss_user    = args.oss_user or cfg.get("oss_index", "username", fallback="")
     oss_token   = args.oss_token or cfg.get("oss_index", "token", fallback="")
+    oss_workers = args.oss_workers or cfg.getint("oss_index", "workers",
+                                                 fallback=OSS_WORKERS)
+    parallel    = not args.sequential_sources and \
+                  cfg.getboolean("http", "parallel_sources", fallback=True)
     kev_cache   = cfg.get("cisa_kev", "cache_dir", fallback="/tmp")
+    osv_workers = args.osv_workers or cfg.getint("osv", "detail_workers",
+                                                 fallback=OSV_DETAIL_WORKERS)
+    osv_sync    = args.osv_sync or cfg.getboolean("osv", "sync", fallback=False)
+    osv_offline = args.osv_offline or osv_sync or bool(args.osv_import) or \
+                  cfg.get("osv", "mode", fallback="api").strip().lower() == "offline"
+    osv_dumps   = [d.strip() for d in cfg.get("osv", "offline_dumps", fallback="").split(",")
+                   if d.strip()]
 
     if not use_nvd and not use_osv and not use_oss:
         log.error("Mindestens eine Scan-Quelle muss aktiv sein!")
         sys.exit(1)
 
     # Reader initialisieren
-    reader = CheckmkInventoryReader(omd_root=omd_root)
+    inv_index = InventoryIndex(index_file=index_file) if use_index else None
+    reader = CheckmkInventoryReader(omd_root=omd_root, workers=workers,
+                                    index=inv_index)
 
     # Sites ermitteln
     if args.sites:
@@ -1834,53 +4734,129 @@ def main():
                 print(f"  {h}")
         return
 
-    # Clients
-    nvd_client = NvdClient(api_key=nvd_key, min_cvss_score=min_cvss) \
+    # Clients – alle über einen gemeinsamen HTTP-Transport
+    http_limits = {}
+    for host, value in cfg.items("http_limits", raw=True):
+        if host in cfg.defaults():
+            continue
+        try:
+            n, _, window = value.partition("/")
+            http_limits[host] = (int(n), float(window or 1))
+        except ValueError:
+            log.warning(f"[http_limits] {host} = {value}: erwartet <requests>/<sekunden>")
+    http = HttpTransport(pool_size=max(cfg.getint("http", "pool_size"),
+                                       nvd_workers, osv_workers, oss_workers),
+                         retries=cfg.getint("http", "retries"),
+                         backoff=cfg.getfloat("http", "backoff"),
+                         max_backoff=cfg.getfloat("http", "max_backoff"),
+                         limits=http_limits)
+    nvd_mirror = NvdMirror(cfg.get("nvd", "mirror_db")) \
+                 if use_nvd and nvd_use_mirror else None
+    for feed in (args.nvd_import or []) if nvd_mirror else []:
+        nvd_mirror.import_feed(Path(feed))
+    nvd_client = NvdClient(api_key=nvd_key, min_cvss_score=min_cvss,
+                           mirror=nvd_mirror, workers=nvd_workers, http=http) \
                  if use_nvd else None
-    osv_client = OsvClient(min_cvss_score=min_cvss) \
+    if nvd_mirror and nvd_sync:
+        nvd_mirror.sync(nvd_client)
+    if nvd_mirror and not nvd_mirror.count():
+        log.warning("NVD Mirror ist leer – --nvd-sync oder --nvd-import ausführen")
+    cache_client = ApiCache(cache_file=cache_file, ttl_seconds=cache_ttl,
+                            negative_ttl_seconds=cache_neg_ttl,
+                            max_entries=cache_max) \
+                   if use_cache else None
+    osv_store  = OsvVulnStore(cache_client.cache_file) \
+                 if cache_client and use_osv else None
+    osv_db     = OsvOfflineDb(cfg.get("osv", "offline_db"),
+                              dump_url=cfg.get("osv", "dump_url", fallback=OSV_DUMP_URL),
+                              http=http) \
+                 if use_osv and osv_offline else None
+    for zip_file in (args.osv_import or []) if osv_db else []:
+        zp = Path(zip_file)
+        osv_db.import_zip(zp, zp.parent.name if zp.stem == "all" else zp.stem)
+    osv_client = OsvClient(min_cvss_score=min_cvss, detail_workers=osv_workers,
+                           store=osv_store, offline=osv_db,
+                           offline_sync=osv_sync, offline_dumps=osv_dumps,
+                           http=http) \
                  if use_osv else None
     oss_client   = OssIndexClient(username=oss_user, token=oss_token,
-                                min_cvss_score=min_cvss) \
+                                min_cvss_score=min_cvss, workers=oss_workers,
+                                http=http) \
                    if use_oss else None
-    kev_client   = CisaKevClient(cache_dir=kev_cache) \
+    kev_client   = CisaKevClient(cache_dir=kev_cache, http=http) \
                    if use_kev else None
-    cache_client = ApiCache(cache_file=cache_file, ttl_seconds=cache_ttl) \
-                   if use_cache else None
 
     reporter = ReportGenerator(output_dir=output_dir)
     scanner  = CveScanner(reader, nvd_client, osv_client, oss_client,
-                          kev_client, cache_client)
+                          kev_client, cache_client, parallel=parallel)
 
     sources = []
-    if use_osv: sources.append("OSV.dev (Batch)")
-    if use_oss: sources.append(f"OSS Index (Batch{', Auth' if oss_user else ''})")
-    if use_nvd: sources.append(f"NVD (nur Mapping-Pakete, {'mit' if nvd_key else 'ohne'} Key)")
+    if use_osv: sources.append(f"OSV.dev (offline, {osv_db.db_file})" if osv_db
+                               else f"OSV.dev (Batch, {osv_workers} Detail-Worker)")
+    if use_oss: sources.append(f"OSS Index (Batch{', Auth' if oss_user else ''}, "
+                               f"{oss_workers} Worker)")
+    if use_nvd: sources.append(f"NVD (Mirror, alle Pakete, {nvd_mirror.db_file})" if nvd_mirror
+                               else f"NVD (nur Mapping-Pakete, {'mit' if nvd_key else 'ohne'} Key, "
+                                    f"{nvd_workers} Worker)")
     if use_kev:   sources.append("CISA KEV (Anreicherung)")
-    if use_cache: sources.append(f"Cache ({cache_ttl//3600}h TTL, {cache_file})")
+    if use_cache: sources.append(f"Cache ({cache_ttl//3600}h TTL, "
+                                 f"{cache_neg_ttl//3600}h ohne Treffer, {cache_file})")
 
     log.info("=" * 60)
     log.info("Checkmk CVE Scanner v4.0 — Local Mode")
     log.info(f"  OMD Root: {omd_root}")
     log.info(f"  Sites:    {', '.join(sites)}")
     log.info(f"  Hosts:    {host_filter or 'alle'}")
+    log.info(f"  Workers:  {workers}")
+    log.info(f"  Index:    {index_file if use_index else 'aus'}")
     log.info(f"  Quellen:  {' + '.join(sources)}")
     log.info(f"  Min CVSS: {min_cvss}")
     log.info(f"  Output:   {output_dir}")
+    log.info(f"  Checkmk:  {cmk_output}")
+    log.info(f"  Find.-DB: {fdb_file if use_fdb else 'aus'}"
+             f"{' (Delta-Report)' if delta_report else ''}")
     log.info("=" * 60)
 
-    findings         = scanner.scan(sites, host_filter=host_filter)
-    summary, by_host = CveScanner.build_summary(findings)
+    result           = scanner.scan(sites, host_filter=host_filter)
+    summary, by_host = CveScanner.build_summary(result)
 
-    json_path    = reporter.write_json(findings, summary)
-    csv_path     = reporter.write_csv(findings)
+    findings_db = FindingsDb(fdb_file) if use_fdb else None
+    scan_id     = findings_db.record(result, sites) if findings_db else None
+    if delta_report:
+        json_path, csv_path = reporter.write_delta(result, findings_db, scan_id)
+    else:
+        json_path = reporter.write_json(result, summary)
+        csv_path  = reporter.write_csv(result)
     summary_path = reporter.write_summary_csv(by_host)
 
+    cmk_written = None
+    if cmk_output != "off":
+        cmk_writer = CheckmkSectionWriter(
+            mode=cmk_output,
+            spool_dir=cfg.get("checkmk_output", "spool_dir"),
+            refresh_seconds=int(cfg.getfloat("checkmk_output", "refresh_hours") * 3600))
+        # Aufräumen nur ohne Host-Filter – sonst fehlen ungescannte Hosts
+        cmk_written = cmk_writer.write(result, by_host,
+                                       sites=None if host_filter else sites)
+
     print("\n" + "=" * 60)
     print("SCAN ABGESCHLOSSEN")
     print("=" * 60)
     print(f"Sites gescannt:     {', '.join(sites)}")
     print(f"Gesamt Findings:    {summary['total_findings']}")
     print(f"Betroffene Hosts:   {summary['affected_hosts']}")
+    if inv_index is not None:
+        print(f"Inventory:          {reader.stats['reused']} Hosts wiederverwendet, "
+              f"{reader.stats['parsed']} neu geparst")
+    if findings_db is not None:
+        _, _, _, _, new, resolved = findings_db.scan_info(scan_id)
+        print(f"Findings-DB:        Scan #{scan_id}: {new} neu, {resolved} behoben")
+    if cmk_written is not None:
+        print(f"{'Checkmk (' + cmk_output + '):':<20}"
+              f"{cmk_written[0]} Hosts geschrieben, {cmk_written[1]} unverändert")
+    for host, st in sorted(http.stats().items()):
+        print(f"HTTP {host}: {st['requests']} Requests, {st['retries']} Retries, "
+              f"{st['errors']} Fehler, {st['bytes'] / 1e6:.1f} MB, {st['seconds']:.1f}s")
     print()
     print("Nach Schweregrad:")
     for sev in ("CRITICAL", "HIGH", "MEDIUM", "LOW", "NONE"):
@@ -1905,7 +4881,7 @@ def main():
         print(f"  {e['software']:<40} {e['finding_count']} Findings")
     print()
     print("Reports:")
-    print(f"  JSON:    {json_path}")
+    print(f"  {'Delta:' if delta_report else 'JSON:':<8} {json_path}")
     print(f"  CSV:     {csv_path}")
     print(f"  Summary: {summary_path}")
     print("=" * 60)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_checkmk_section_writer.py - Spool-Sections je Host und Aufräumen
+#
+# Aufruf: python -m pytest -q cmk_cve_scanner/tests
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cmk25"))
+
+import checkmk_cve_scanner as m  # noqa: E402
+
+
+def _result(site: str, hosts: list[str]) -> "m.ScanResult":
+    host_map = m.HostMap()
+    for host in hosts:
+        host_map.add(("bash", "5"), m.SoftwareEntry(
+            site=site, host=host, name="bash", version="5"))
+    return m.ScanResult([], host_map)
+
+
+@pytest.fixture
+def writer(tmp_path):
+    return m.CheckmkSectionWriter("spool", spool_dir=str(tmp_path))
+
+
+def test_spool_file_is_piggyback_block(writer, tmp_path):
+    assert writer.write(_result("prod", ["web01"]), {}) == (1, 0)
+    lines = (tmp_path / "cve_scanner_prod.web01").read_text().splitlines()
+    assert lines[:2] == ["<<<<web01>>>>", "<<<cve_scanner:sep(124)>>>"]
+    assert lines[-1] == "<<<<>>>>"
+    assert writer.write(_result("prod", ["web01"]), {}) == (0, 1)
+
+
+def test_removed_hosts_are_cleaned_up(writer, tmp_path):
+    writer.write(_result("prod", ["web01", "sw01"]), {})
+    writer.write(_result("prod_b", ["sw01"]), {})
+    (tmp_path / "other_plugin").write_text("x")
+
+    # Teil-Scan (--hosts): nichts löschen
+    writer.write(_result("prod", ["web01"]), {}, sites=None)
+    assert (tmp_path / "cve_scanner_prod.sw01").exists()
+
+    writer.write(_result("prod", ["web01"]), {}, sites=["prod"])
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "cve_scanner_prod.web01", "cve_scanner_prod_b.sw01", "other_plugin"]
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_cve_registry.py - CVE-Register (Aliases, kanonische IDs) und CveMerger
+#
+# Aufruf: python -m pytest -q cmk_cve_scanner/tests
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cmk25"))
+
+from checkmk_cve_scanner import CveMatch, CveMerger, CveRegistry  # noqa: E402
+
+
+def _cve(cve_id: str, aliases=(), score: float = 7.5, source: str = "OSV",
+         description: str = "") -> CveMatch:
+    return CveMatch(cve_id=cve_id, severity="HIGH" if score < 9 else "CRITICAL",
+                    cvss_score=score, cvss_vector="", description=description,
+                    published="", last_modified="", source=source,
+                    aliases=list(aliases))
+
+
+def _registry(*cves: CveMatch) -> CveRegistry:
+    reg = CveRegistry()
+    for cve in cves:
+        reg.add(cve)
+    return reg
+
+
+def test_aliases_resolve_transitively():
+    # GHSA → CVE ← DSA: eine Klasse, ein Eintrag
+    reg = _registry(_cve("GHSA-aaaa", ["CVE-2024-1"]),
+                    _cve("DSA-5001-1", ["CVE-2024-1"]))
+    assert len(reg) == 1
+    rec = reg.get("GHSA-aaaa")
+    assert rec is reg.get("DSA-5001-1") is reg.get("CVE-2024-1")
+    assert rec.cve_id == "CVE-2024-1"
+    assert set(rec.aliases) == {"GHSA-aaaa", "DSA-5001-1"}
+
+
+@pytest.mark.parametrize("cves", [
+    # eine Advisory nennt beide CVEs
+    [_cve("GHSA-bbbb", ["CVE-2024-1", "CVE-2024-2"])],
+    # CVE mit anderer CVE als Alias
+    [_cve("CVE-2024-1", ["CVE-2024-2"])],
+    # über zwei Advisories verbunden
+    [_cve("CVE-2024-1"), _cve("CVE-2024-2"), _cve("DSA-1", ["CVE-2024-1"]),
+     _cve("DSA-2", ["DSA-1", "CVE-2024-2"])],
+])
+def test_different_cve_ids_are_never_joined(cves):
+    reg = _registry(*cves)
+    a, b = reg.get("CVE-2024-1"), reg.get("CVE-2024-2")
+    assert a is not None and a.cve_id == "CVE-2024-1"
+    assert b is None or (b is not a and b.cve_id == "CVE-2024-2")
+
+
+@pytest.mark.parametrize("cves", [
+    [_cve("GHSA-cccc", ["CVE-2024-3"])],                      # Alias ist die CVE
+    [_cve("DSA-5002-1"), _cve("CVE-2024-3", ["DSA-5002-1"])],  # CVE kommt später
+    [_cve("DSA-5002-1"), _cve("GHSA-cccc", ["DSA-5002-1"]),
+     _cve("OSV-2024-9", ["GHSA-cccc", "CVE-2024-3"])],         # über zwei Ecken
+])
+def test_canonical_id_is_the_cve_id(cves):
+    reg = _registry(*cves)
+    assert len(reg) == 1
+    rec = reg.records()[0]
+    assert rec.cve_id == "CVE-2024-3"
+    assert "CVE-2024-3" not in rec.aliases
+    assert cves[0].cve_id in rec.aliases
+
+
+def test_highest_score_wins_and_first_seen_on_tie():
+    nvd = _cve("CVE-2024-4", score=7.5, source="NVD", description="nvd")
+    osv = _cve("GHSA-dddd", ["CVE-2024-4"], score=9.8, description="osv")
+    rec = _registry(nvd, osv).get("CVE-2024-4")
+    assert (rec.cvss_score, rec.severity, rec.description) == (9.8, "CRITICAL", "nvd")
+
+    tie = _registry(_cve("CVE-2024-5", score=5.0, source="NVD", description="first"),
+                    _cve("CVE-2024-5", score=5.0, description="second"))
+    assert tie.get("CVE-2024-5").description == "first"
+
+
+def test_resolve_returns_shared_canonical_objects():
+    reg  = CveRegistry()
+    pkg1 = [_cve("CVE-2024-6"), _cve("GHSA-eeee", ["CVE-2024-6"])]
+    pkg2 = [_cve("DSA-5003-1", ["CVE-2024-6"]), _cve("CVE-2024-7")]
+    for cve in pkg1 + pkg2:
+        reg.add(cve)
+    r1, r2 = reg.resolve(pkg1), reg.resolve(pkg2)
+    assert len(r1) == 1 and len(r2) == 2
+    assert r1[0] is r2[0]                      # dieselbe CVE auf allen Paketen
+    assert [c.cve_id for c in r2] == ["CVE-2024-6", "CVE-2024-7"]
+
+
+def test_merge_source_label_and_alias_order():
+    nvd = [_cve("CVE-2024-8", score=7.5, source="NVD", description="nvd")]
+    osv = [_cve("GHSA-ffff", ["CVE-2024-8", "PYSEC-1"], score=9.8)]
+    (rec,) = CveMerger.merge(nvd, osv)
+    assert rec.cve_id == "CVE-2024-8"
+    assert rec.source == "NVD+OSV"
+    assert rec.aliases == ["PYSEC-1", "GHSA-ffff"]
+    assert (rec.cvss_score, rec.description) == (9.8, "nvd")
+
+
+def test_merge_same_source_and_unrelated_cves():
+    osv = [_cve("CVE-2024-9", score=5.0), _cve("GHSA-gggg", ["CVE-2024-9"], score=6.0),
+           _cve("CVE-2024-10")]
+    recs = CveMerger.merge([], osv)
+    assert [(r.cve_id, r.source, r.cvss_score) for r in recs] == [
+        ("CVE-2024-9", "OSV", 6.0), ("CVE-2024-10", "OSV", 7.5)]
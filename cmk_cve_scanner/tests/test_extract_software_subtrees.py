@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_extract_software_subtrees.py - Regressionstests für den Inventory-Extraktor
+#
+# Aufruf: python -m pytest -q cmk_cve_scanner/tests
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cmk25"))
+
+from checkmk_cve_scanner import extract_software_subtrees  # noqa: E402
+
+# Switch / reine Hardware-Inventur: kein software-Knoten
+NO_SOFTWARE_PY = ("{'Attributes': {}, 'Nodes': {'hardware': {'Attributes': "
+                  "{'Pairs': {'model': 'X440G2'}}, 'Nodes': {}, 'Table': {}}}, "
+                  "'Table': {}}")
+NO_SOFTWARE_JSON = ('{"Attributes": {}, "Nodes": {"networking": {"Nodes": {}, '
+                    '"Table": {"rows": [{"port": "1/1"}]}}}, "Table": {}}')
+WITH_SOFTWARE = ('{"Nodes": {"software": {"Nodes": {"packages": {"Table": '
+                 '{"rows": [{"name": "bash", "version": "5.2"}]}}, "os": '
+                 '{"Attributes": {"Pairs": {"name": "Debian"}}}}}}}')
+
+
+@pytest.mark.parametrize("tree", [NO_SOFTWARE_PY, NO_SOFTWARE_JSON])
+@pytest.mark.parametrize("trailer", ["", "\n", "\n\n  \n"])
+@pytest.mark.parametrize("chunk_size", [7, 1 << 16])
+def test_tree_without_software(tree, trailer, chunk_size):
+    assert extract_software_subtrees(io.StringIO(tree + trailer), chunk_size) == {}
+
+
+@pytest.mark.parametrize("trailer", ["", "\n"])
+def test_tree_with_software(trailer):
+    found = extract_software_subtrees(io.StringIO(WITH_SOFTWARE + trailer), 5)
+    assert set(found) == {"packages", "os"}
+    assert '"bash"' in found["packages"]
+
+
+def test_empty_file():
+    assert extract_software_subtrees(io.StringIO("")) == {}
+
+
+@pytest.mark.parametrize("broken", [NO_SOFTWARE_JSON[:-3], "{'Nodes': {'a': 'x"])
+def test_truncated_tree_raises(broken):
+    with pytest.raises(ValueError):
+        extract_software_subtrees(io.StringIO(broken), 4)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_findings_db.py - Findings-DB: neu/behoben bei unvollständigen Quellen
+#
+# Aufruf: python -m pytest -q cmk_cve_scanner/tests
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cmk25"))
+
+import checkmk_cve_scanner as m  # noqa: E402
+
+INVENTORY = {"h1": [("openssl", "1"), ("bash", "5")], "h2": [("openssl", "1")]}
+CVES      = {("openssl", "1"): ["CVE-2024-1", "CVE-2024-2"], ("bash", "5"): ["CVE-2024-3"]}
+
+
+def _result(cves: dict, unanswered=()) -> "m.ScanResult":
+    host_map = m.HostMap()
+    for host, pkgs in INVENTORY.items():
+        for name, version in pkgs:
+            host_map.add((name, version), m.SoftwareEntry(
+                site="s", host=host, name=name, version=version))
+    groups = [(g, [m.CveMatch(cve_id=c, severity="HIGH", cvss_score=7.5,
+                              cvss_vector="", description="", published="",
+                              last_modified="", source="OSV") for c in ids])
+              for g, ids in cves.items() if ids]
+    return m.ScanResult(groups, host_map, unanswered=set(unanswered))
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = m.FindingsDb(str(tmp_path / "findings.sqlite"))
+    yield db
+    db.close()
+
+
+def _counts(db, scan_id):
+    return db.scan_info(scan_id)[3:]   # (findings, new, resolved)
+
+
+def test_unchanged_scan_writes_nothing(db):
+    assert _counts(db, db.record(_result(CVES), ["s"])) == (5, 5, 0)
+    assert _counts(db, db.record(_result(CVES), ["s"])) == (5, 0, 0)
+
+
+def test_unanswered_group_stays_open(db):
+    db.record(_result(CVES), ["s"])
+    # OSV-Batch für openssl fehlgeschlagen: keine Treffer, aber nicht behoben
+    partial = {("bash", "5"): CVES[("bash", "5")]}
+    scan = db.record(_result(partial, unanswered=[("openssl", "1")]), ["s"])
+    assert _counts(db, scan) == (1, 0, 0)
+    assert len(list(db.by_cve("CVE-2024-1"))) == 2
+    # nächster vollständiger Lauf: nichts neu
+    assert _counts(db, db.record(_result(CVES), ["s"])) == (5, 0, 0)
+
+
+def test_answered_group_without_cves_is_resolved(db):
+    db.record(_result(CVES), ["s"])
+    fixed = {("openssl", "1"): ["CVE-2024-1"], ("bash", "5"): []}
+    scan = db.record(_result(fixed), ["s"])
+    assert _counts(db, scan) == (2, 0, 3)
+    assert {r["cve_id"] for r in db.resolved(scan)} == {"CVE-2024-2", "CVE-2024-3"}
+
+
+# ── Teil-Fehler der Quellen über den ganzen Scan ────────────────────────
+
+def _match(cve_id: str, source: str) -> "m.CveMatch":
+    return m.CveMatch(cve_id=cve_id, severity="HIGH", cvss_score=7.5,
+                      cvss_vector="", description="", published="",
+                      last_modified="", source=source)
+
+
+class _Reader:
+    def iter_software(self, site, hosts=None):
+        for host, pkgs in INVENTORY.items():
+            for name, version in pkgs:
+                yield m.SoftwareEntry(site=site, host=host, name=name,
+                                      version=version, os_name="debian",
+                                      os_version="12", package_type="deb")
+
+
+class _Response:
+    def __init__(self, data):
+        self._data, self.status_code = data, 200
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+
+class _OsvTransport:
+    """OSV-API: openssl → Advisories A, B; GET der IDs in failing schlägt fehl."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+
+    def post(self, url, json=None, **kw):
+        ids = {"openssl": ["A", "B"]}
+        return _Response({"results": [
+            {"vulns": [{"id": v, "modified": "1"} for v in ids.get(q["package"]["name"], [])]}
+            for q in json["queries"]]})
+
+    def get(self, url, **kw):
+        vid = url.rsplit("/", 1)[1]
+        if vid in self.failing:
+            raise m.requests.RequestException("timeout")
+        return _Response({"id": f"CVE-2024-{ord(vid)}", "modified": "1"})
+
+
+class _Nvd(m.NvdClient):
+    """NVD-API: CPE-Suche liefert CVE-2024-10 und -11, die Keyword-Suche nur -11."""
+
+    def __init__(self, cpe_fails: bool):
+        self.mirror, self.workers, self.min_cvss_score = None, 1, 0.0
+        self.cpe_fails = cpe_fails
+
+    def search_by_cpe(self, vendor, product, version):
+        if self.cpe_fails:
+            return None
+        return [_match("CVE-2024-10", "NVD"), _match("CVE-2024-11", "NVD")]
+
+    def search_by_keyword(self, product, version):
+        return [_match("CVE-2024-11", "NVD")]
+
+
+def _scan(osv_failing=(), cpe_fails=False) -> "m.ScanResult":
+    # neue Clients je Scan – die Advisory-Details sind scanweit gemerkt
+    osv = m.OsvClient(detail_workers=1, http=_OsvTransport(osv_failing))
+    return m.CveScanner(_Reader(), _Nvd(cpe_fails), osv, None, None, None,
+                        parallel=False).scan(["s"])
+
+
+@pytest.mark.parametrize("failure", [
+    {"osv_failing": {"B"}},       # ein Advisory-Detail nicht abrufbar
+    {"cpe_fails": True},          # NVD: CPE-Suche fehlgeschlagen, Keyword-Treffer
+])
+def test_partial_source_failure_does_not_flap(db, failure):
+    first = db.record(_scan(), ["s"])
+    open_before = _counts(db, first)[0]
+
+    result = _scan(**failure)
+    assert ("openssl", "1") in result.unanswered
+    scan = db.record(result, ["s"])
+    assert _counts(db, scan)[2] == 0                 # nichts behoben
+
+    # vollständiger Lauf danach: nichts neu, alles noch offen
+    assert _counts(db, db.record(_scan(), ["s"])) == (open_before, 0, 0)
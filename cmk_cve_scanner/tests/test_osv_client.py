@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_osv_client.py - OSV-Batch: unvollständige Advisory-Details
+#
+# Aufruf: python -m pytest -q cmk_cve_scanner/tests
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cmk25"))
+
+import checkmk_cve_scanner as m  # noqa: E402
+
+
+class _Response:
+    def __init__(self, data, status_code=200):
+        self._data       = data
+        self.status_code = status_code
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+
+class _Transport:
+    """querybatch: openssl → A, B; bash → C. GET für failing schlägt fehl."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+
+    def post(self, url, json=None, **kw):
+        vulns = {"openssl": ["A", "B"], "bash": ["C"], "zlib": []}
+        return _Response({"results": [
+            {"vulns": [{"id": v, "modified": "1"} for v in vulns[q["package"]["name"]]]}
+            for q in json["queries"]]})
+
+    def get(self, url, **kw):
+        vid = url.rsplit("/", 1)[1]
+        if vid in self.failing:
+            raise m.requests.RequestException("timeout")
+        return _Response({"id": vid, "aliases": [f"CVE-2024-{ord(vid)}"],
+                          "modified": "1", "summary": vid})
+
+
+def _query(failing=()):
+    client = m.OsvClient(detail_workers=2, http=_Transport(failing))
+    sw = [m.SoftwareEntry(site="s", host="h", name=n, version="1",
+                          os_name="debian", os_version="12")
+          for n in ("openssl", "bash", "zlib")]
+    return client.query_batch(sw)
+
+
+def test_all_details_fetched():
+    res = _query()
+    assert len(res["openssl|1"]) == 2 and len(res["bash|1"]) == 1
+    assert res["zlib|1"] == []
+
+
+@pytest.mark.parametrize("failing", [{"B"}, {"A", "B"}])
+def test_package_with_missing_details_is_unanswered(failing):
+    res = _query(failing)
+    # teilweise oder ganz fehlende Details: Paket fehlt (nicht beantwortet)
+    assert "openssl|1" not in res
+    assert len(res["bash|1"]) == 1
+    assert res["zlib|1"] == []
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_source_package_name.py - Binär- → Quell-Paket-Zuordnung
+#
+# Aufruf: python -m pytest -q cmk_cve_scanner/tests
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cmk25"))
+
+from checkmk_cve_scanner import source_package_name  # noqa: E402
+
+
+@pytest.mark.parametrize("binary, expected", [
+    ("libssl3", "openssl"),
+    ("gcc-10-base", "gcc-10"),
+    ("gcc-14-base", "gcc-14"),
+    ("libpython3.11-minimal", "python3.11"),
+    ("bash", "bash"),
+])
+def test_deb_map_and_rules(binary, expected):
+    assert source_package_name(binary, "", "deb") == expected
+
+
+@pytest.mark.parametrize("binary", ["libstdc++6", "libgcc-s1"])
+def test_release_dependent_source_not_guessed(binary):
+    assert source_package_name(binary, "", "deb") == binary
+    assert source_package_name(binary, "gcc-14 (14.2.0-4)", "deb") == "gcc-14"
+
+
+@pytest.mark.parametrize("package_type", ["rpm", "apk", ""])
+def test_map_only_for_deb(package_type):
+    assert source_package_name("libssl3", "", package_type) == "libssl3"
+    assert source_package_name("libssl3", "openssl", package_type) == "openssl"
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_version_cmp.py - Versionsvergleiche für den OSV-Offline-Abgleich
+#
+# Aufruf: python -m pytest -q cmk_cve_scanner/tests
+
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cmk25"))
+
+import checkmk_cve_scanner as m  # noqa: E402
+
+# (a, b, erwartet) – dpkg-Fälle mit dpkg --compare-versions geprüft
+DPKG = [
+    ("1.0", "1.0", 0),
+    ("0:1.0", "1.0", 0),
+    ("1.0~rc1", "1.0", -1),
+    ("1.0~~", "1.0~", -1),
+    ("1.0", "1.0+b1", -1),
+    ("1:1.0", "2.0", 1),
+    ("1.0-1", "1.0-1ubuntu1", -1),
+    ("1.0-1", "1.0-1.1", -1),
+    ("3.0.11-1~deb12u2", "3.0.11-1", -1),
+    ("2.36-9+deb12u4", "2.36-9+deb12u10", -1),
+    ("1.2.10", "1.2.9", 1),
+    ("1.0a", "1.0", 1),
+    ("1.0", "1.0.0", -1),
+]
+
+RPM = [
+    ("1.0", "1.0", 0),
+    ("1.0~rc1", "1.0", -1),
+    ("1.0~rc1", "1.0~rc2", -1),
+    ("1.0~~", "1.0~", -1),
+    ("1.0^git1", "1.0", 1),
+    ("1.0^git1", "1.0.1", -1),
+    ("1.0^", "1.0", 1),
+    ("1:1.0-1", "2.0-1", 1),
+    ("1.0-1.el9", "1.0-2.el9", -1),
+    ("1.0", "1.0-5", 0),            # ohne Release: nur Version vergleichen
+    ("1.10", "1.9", 1),
+    ("1.a", "1.1", -1),             # Ziffern sind neuer als Buchstaben
+    ("1.0a", "1.0", 1),
+    ("1.0.0", "1_0_0", 0),          # Trenner zählen nicht
+]
+
+APK = [
+    ("1.2.3", "1.2.3", 0),
+    ("1.2.3", "1.2.3-r1", -1),
+    ("1.2.3-r10", "1.2.3-r9", 1),
+    ("1.2.3_rc1", "1.2.3", -1),
+    ("1.2.3_rc1", "1.2.3_rc2", -1),
+    ("1.2.3_alpha", "1.2.3_beta", -1),
+    ("1.2.3_p1", "1.2.3", 1),
+    ("1.2.3_p1", "1.2.3_rc1", 1),
+    ("1.2.3a", "1.2.3", 1),
+    ("1.2.10", "1.2.9", 1),
+]
+
+
+def _check(cmp, a, b, expected):
+    assert cmp(a, b) == expected
+    assert cmp(b, a) == -expected
+
+
+@pytest.mark.parametrize("a, b, expected", DPKG)
+def test_dpkg(a, b, expected):
+    _check(m.dpkg_version_cmp, a, b, expected)
+
+
+@pytest.mark.parametrize("a, b, expected", RPM)
+def test_rpm(a, b, expected):
+    _check(m.rpm_version_cmp, a, b, expected)
+
+
+@pytest.mark.parametrize("a, b, expected", APK)
+def test_apk(a, b, expected):
+    _check(m.apk_version_cmp, a, b, expected)
+
+
+@pytest.mark.parametrize("ecosystem, cmp", [
+    ("Debian:12", m.dpkg_version_cmp), ("Ubuntu:22.04:LTS", m.dpkg_version_cmp),
+    ("Rocky Linux:9", m.rpm_version_cmp), ("Alpine:v3.20", m.apk_version_cmp),
+    ("PyPI", m.generic_version_cmp),
+])
+def test_version_cmp_for(ecosystem, cmp):
+    assert m.version_cmp_for(ecosystem) is cmp
+
+
+@pytest.mark.skipif(shutil.which("dpkg") is None, reason="dpkg nicht installiert")
+def test_dpkg_matches_dpkg_binary():
+    rnd = random.Random(1)
+    parts = ["0", "1", "2", "10", "a", "b", "~", "+", ".", "~rc", "+b"]
+
+    def version() -> str:
+        v = str(rnd.randint(0, 3)) + "".join(rnd.choice(parts) for _ in range(rnd.randint(0, 4)))
+        if rnd.random() < 0.3:
+            v += "-" + str(rnd.randint(0, 3)) + rnd.choice(["", "ubuntu1", "+deb12u1", "~bpo1"])
+        if rnd.random() < 0.1:
+            v = f"{rnd.randint(1, 2)}:{v}"
+        return v
+
+    for _ in range(200):
+        a, b = version(), version()
+        ok = {rel: subprocess.run(["dpkg", "--compare-versions", a, rel, b],
+                                  capture_output=True).returncode == 0
+              for rel in ("lt", "eq", "gt")}
+        if not any(ok.values()):
+            continue   # von dpkg abgelehnte Version
+        expected = -1 if ok["lt"] else (0 if ok["eq"] else 1)
+        assert m.dpkg_version_cmp(a, b) == expected, (a, b)
+
+
+# OSV "affected"-Einträge: (Eintrag, Ecosystem, {Version: betroffen})
+AFFECTED = [
+    ({"ranges": [{"type": "ECOSYSTEM",
+                  "events": [{"introduced": "0"}, {"fixed": "3.0.11-1~deb12u2"}]}]},
+     "Debian:12",
+     {"3.0.9-1": True, "3.0.11-1~deb12u1": True, "3.0.11-1~deb12u2": False,
+      "3.0.11-1": False}),
+    ({"ranges": [{"type": "ECOSYSTEM",
+                  "events": [{"introduced": "1.0"}, {"last_affected": "1.5"}]}]},
+     "PyPI",
+     {"0.9": False, "1.0": True, "1.5": True, "1.5.1": False}),
+    ({"ranges": [{"type": "ECOSYSTEM",
+                  "events": [{"introduced": "0"}, {"limit": "2.0"}]}]},
+     "PyPI",
+     {"1.9": True, "2.0": False}),
+    # mehrere Intervalle, Events unsortiert
+    ({"ranges": [{"type": "SEMVER",
+                  "events": [{"introduced": "2.0"}, {"fixed": "1.2"},
+                             {"fixed": "2.1"}, {"introduced": "1.0"}]}]},
+     "npm",
+     {"0.5": False, "1.1": True, "1.5": False, "2.0.5": True, "2.1": False}),
+    ({"versions": ["1.0"],
+      "ranges": [{"type": "GIT", "events": [{"introduced": "0"}]}]},
+     "PyPI",
+     {"1.0": True, "1.1": False}),
+    ({"ranges": [{"type": "ECOSYSTEM",
+                  "events": [{"introduced": "0"}, {"fixed": "1.2.3-r2"}]}]},
+     "Alpine:v3.20",
+     {"1.2.3-r1": True, "1.2.3_rc1": True, "1.2.3-r2": False, "1.2.3_p1": False}),
+]
+
+
+@pytest.mark.parametrize("entry, ecosystem, cases", AFFECTED)
+def test_osv_version_affected(entry, ecosystem, cases):
+    cmp = m.version_cmp_for(ecosystem)
+    got = {v: m.osv_version_affected(entry, v, cmp) for v in cases}
+    assert got == cases
@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+"""
+XIQ Plugin Benchmark (offline)
+==============================
+Misst Laufzeit und Speicher-Allokationen aller Parse-, Discovery-, Check- und
+Inventory-Funktionen des XIQ-Plugins (cmk_addons/plugins/xiq) ohne laufende
+Checkmk-Site.
+
+Der kleine Teil von cmk.agent_based.v2, den die Plugins nutzen (Result, Metric,
+Service, TableRow, Attributes, get_value_store, AgentSection, CheckPlugin,
+InventoryPlugin, register, ...), wird durch einen Stub ersetzt. Die
+Agent-Ausgabe wird entweder synthetisch für eine beliebige Flottengröße
+erzeugt (gleiches Format wie agent_xiq) oder aus einer mitgeschnittenen
+Ausgabe gelesen und wie in Checkmk in Hosts (Piggyback) und Sektionen zerlegt.
+
+Beispiele:
+  # Synthetische Flotten mit 100, 1000 und 5000 APs
+  python3 xiq_bench.py --fleet 100,1000,5000
+
+  # Mitgeschnittene Agent-Ausgabe
+  agent_xiq --url ... --username ... --password ... --host xiq > capture.txt
+  python3 xiq_bench.py --agent-output capture.txt
+
+  # Baseline speichern und später gegen sie prüfen (Exit-Code 1 bei Regression)
+  python3 xiq_bench.py --fleet 2000 --save-baseline xiq_baseline.json
+  python3 xiq_bench.py --fleet 2000 --baseline xiq_baseline.json --tolerance 0.25
+
+  # Anderes Plugin-Verzeichnis (z.B. die cmk25-Variante)
+  python3 xiq_bench.py --plugin-dir special_agents/ExtremeCloud-XIQ/cmk25/local/lib/python3/cmk_addons/plugins/xiq
+"""
+
+from __future__ import annotations
+
+import argparse
+import enum
+import gc
+import importlib
+import json
+import random
+import sys
+import time
+import tracemalloc
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+
+DEFAULT_PLUGIN_DIR = (
+    Path(__file__).resolve().parents[2]
+    / "special_agents/ExtremeCloud-XIQ/source/local/lib/python3/cmk_addons/plugins/xiq"
+)
+PLUGIN_PACKAGE = "cmk_addons.plugins.xiq"
+
+
+# ---------------------------------------------------------------------------
+# Stub für cmk.agent_based.v2
+# ---------------------------------------------------------------------------
+
+class State(enum.IntEnum):
+    OK = 0
+    WARN = 1
+    CRIT = 2
+    UNKNOWN = 3
+
+
+class Result:
+    __slots__ = ("state", "summary", "notice", "details")
+
+    def __init__(self, *, state: State, summary: str | None = None,
+                 notice: str | None = None, details: str | None = None) -> None:
+        self.state = state
+        self.summary = summary
+        self.notice = notice
+        self.details = details
+
+
+class Metric:
+    __slots__ = ("name", "value", "levels", "boundaries")
+
+    def __init__(self, name: str, value: float, *, levels: Any = None, boundaries: Any = None) -> None:
+        self.name = name
+        self.value = value
+        self.levels = levels
+        self.boundaries = boundaries
+
+
+class Service:
+    __slots__ = ("item", "parameters", "labels")
+
+    def __init__(self, *, item: str | None = None, parameters: Any = None, labels: Any = None) -> None:
+        self.item = item
+        self.parameters = parameters
+        self.labels = labels
+
+
+class TableRow:
+    __slots__ = ("path", "key_columns", "inventory_columns", "status_columns")
+
+    def __init__(self, *, path: list, key_columns: dict, inventory_columns: dict | None = None,
+                 status_columns: dict | None = None) -> None:
+        self.path = path
+        self.key_columns = key_columns
+        self.inventory_columns = inventory_columns or {}
+        self.status_columns = status_columns or {}
+
+
+class Attributes:
+    def __init__(self, *, path: list, **kwargs: Any) -> None:
+        self.path = path
+        self.kwargs = kwargs
+
+
+class InventoryResult(list):
+    """Typ-Alias in v2; das Legacy-Plugin nutzt es als Liste mit path=..."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+
+
+class _Registration:
+    def __init__(self, **kwargs: Any) -> None:
+        self.__dict__.update(kwargs)
+
+
+class AgentSection(_Registration):
+    pass
+
+
+class CheckPlugin(_Registration):
+    pass
+
+
+class InventoryPlugin(_Registration):
+    pass
+
+
+class _Dummy:
+    """Platzhalter für nicht benötigte API-Objekte."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def __call__(self, *args: Any, **kwargs: Any) -> "_Dummy":
+        return self
+
+    def __getattr__(self, name: str) -> "_Dummy":
+        return self
+
+
+_VALUE_STORES: dict[tuple, dict] = {}
+_VALUE_STORE_KEY: list[tuple] = [("", "", None)]
+
+
+def get_value_store() -> dict:
+    return _VALUE_STORES.setdefault(_VALUE_STORE_KEY[0], {})
+
+
+LEGACY_PLUGINS: list[_Registration] = []
+
+
+def _legacy_register(kind: str) -> Callable[..., None]:
+    def register_fn(**kwargs: Any) -> None:
+        LEGACY_PLUGINS.append(_Registration(kind=kind, **kwargs))
+    return register_fn
+
+
+def install_cmk_stub() -> None:
+    v2 = types.ModuleType("cmk.agent_based.v2")
+    for obj in (State, Result, Metric, Service, TableRow, Attributes, InventoryResult,
+                AgentSection, CheckPlugin, InventoryPlugin, get_value_store):
+        setattr(v2, obj.__name__, obj)
+    v2.StringTable = list
+    v2.DiscoveryResult = Iterable
+    v2.CheckResult = Iterable
+    v2.register = types.SimpleNamespace(
+        agent_section=_legacy_register("agent_section"),
+        check_plugin=_legacy_register("check_plugin"),
+        inventory_plugin=_legacy_register("inventory_plugin"),
+    )
+    v2.__getattr__ = lambda name: _Dummy  # type: ignore[attr-defined]
+
+    cmk = types.ModuleType("cmk")
+    agent_based = types.ModuleType("cmk.agent_based")
+    cmk.agent_based = agent_based  # type: ignore[attr-defined]
+    agent_based.v2 = v2  # type: ignore[attr-defined]
+    sys.modules.update({"cmk": cmk, "cmk.agent_based": agent_based, "cmk.agent_based.v2": v2})
+
+
+# ---------------------------------------------------------------------------
+# Plugins laden
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Plugins:
+    sections: dict[str, AgentSection] = field(default_factory=dict)
+    checks: list[CheckPlugin] = field(default_factory=list)
+    inventories: list[InventoryPlugin] = field(default_factory=list)
+    legacy: list[_Registration] = field(default_factory=list)
+
+
+def load_plugins(plugin_dir: Path) -> Plugins:
+    """
+    Importiert agent_based/*.py und inventory/*.py als cmk_addons.plugins.xiq.*
+    und sammelt die Registrierungen wie Checkmk (Objekte auf Modulebene).
+    """
+    lib_root = plugin_dir.resolve().parents[2]
+    sys.path.insert(0, str(lib_root))
+
+    plugins = Plugins()
+    for sub in ("agent_based", "inventory"):
+        for path in sorted((plugin_dir / sub).glob("*.py")):
+            module = importlib.import_module(f"{PLUGIN_PACKAGE}.{sub}.{path.stem}")
+            for obj in vars(module).values():
+                if isinstance(obj, AgentSection):
+                    plugins.sections[obj.name] = obj
+                elif isinstance(obj, CheckPlugin):
+                    plugins.checks.append(obj)
+                elif isinstance(obj, InventoryPlugin):
+                    plugins.inventories.append(obj)
+    plugins.legacy = [p for p in LEGACY_PLUGINS if p.kind == "inventory_plugin"]
+    return plugins
+
+
+# ---------------------------------------------------------------------------
+# Agent-Ausgabe erzeugen / zerlegen
+# ---------------------------------------------------------------------------
+
+SSIDS = ("Corp", "Guest", "IoT", "Voice")
+BANDS = (("2.4GHz", "11ng", 6), ("5GHz", "11ac", 36), ("6GHz", "11ax6g", 37))
+MODELS = ("AP_410C", "AP_305C", "AP_302W", "AP_4000")
+FIRMWARE = ("10.6.1.0", "10.6.2.0", "10.7.0.0")
+
+
+def _mac(rnd: random.Random) -> str:
+    return ":".join(f"{rnd.randrange(256):02X}" for _ in range(6))
+
+
+def generate_agent_output(n_aps: int, clients_per_ap: int, neighbors_per_ap: int,
+                          n_switches: int, seed: int) -> str:
+    """Synthetische agent_xiq-Ausgabe (H1-Sektionen + Piggyback je AP)."""
+    from cmk_addons.plugins.xiq.agent_based.common import COLUMNAR_FORMAT, columnar_encode
+
+    rnd = random.Random(seed)
+    compact = {"separators": (",", ":")}
+    out: list[str] = []
+    devices: list[tuple] = []
+    piggy: list[str] = []
+    sums = [0, 0, 0]
+
+    for i in range(n_aps):
+        dev_id = 100000 + i
+        host = f"ap-{i:05d}"
+        ip = f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"
+        model, sw = rnd.choice(MODELS), rnd.choice(FIRMWARE)
+        connected = rnd.random() > 0.03
+        loc = f"DE / Site-{i % 20} / Floor-{i % 5}"
+        devices.append((dev_id, host, f"SN{dev_id}", _mac(rnd), ip, model, sw, loc, "AP", "XIQ", int(connected)))
+
+        neighbors = [
+            (dev_id, host, ip, f"eth{k}", f"10.255.0.{k + 1}", f"ge-0/0/{rnd.randrange(48)}",
+             "uplink", _mac(rnd), f"sw-{rnd.randrange(max(n_switches, 1)):03d}")
+            for k in range(neighbors_per_ap)
+        ]
+
+        ssid_freq = {s: {b: 0 for b, _m, _c in BANDS} for s in SSIDS}
+        clients = []
+        for c in range(clients_per_ap):
+            ssid = rnd.choice(SSIDS)
+            band = rnd.choice(("2.4GHz", "5GHz", "5GHz", "6GHz"))
+            ssid_freq[ssid][band] += 1
+            clients.append({
+                "id": dev_id * 1000 + c, "hostname": f"client-{i}-{c}", "mac": _mac(rnd),
+                "ip": f"172.16.{c % 256}.{i % 256}", "ssid": ssid, "band": band, "bssid": _mac(rnd),
+                "rssi": -rnd.randint(35, 85), "snr": rnd.randint(5, 50), "channel": 36,
+                "ap_name": host, "ap_id": dev_id, "os_type": rnd.choice(("Windows", "iOS", "Android")),
+                "user_profile": "default", "connected": True,
+            })
+        band_sum = [sum(d[b] for d in ssid_freq.values()) for b, _m, _c in BANDS]
+        sums = [a + b for a, b in zip(sums, band_sum)]
+
+        radios = []
+        for j, (band, mode, channel) in enumerate(BANDS):
+            wlans = [{"ssid": s, "bssid": _mac(rnd), "network_policy_name": "Policy-A"} for s in SSIDS]
+            radios.append({
+                "name": f"wifi{j}", "mac_address": _mac(rnd), "frequency": band,
+                "channel_number": channel, "channel_width": "CW_20", "mode": mode,
+                "power": rnd.randint(4, 20), "wlans": columnar_encode(wlans),
+            })
+
+        piggy.append(f"<<<<{host}>>>>")
+        piggy.append("<<<extreme_ap_status:sep(124)>>>")
+        piggy.append(
+            f"{host}|SN{dev_id}|{devices[-1][3]}|{ip}|{model}|{int(connected)}|"
+            f"{'CONNECTED' if connected else 'DISCONNECTED'}|{sw}|{rnd.randint(60, 10**7)}|{loc}|"
+            + (f"{neighbors[0][8]}/{neighbors[0][5]}" if neighbors else "")
+        )
+        piggy.append("<<<extreme_ap_clients:sep(124)>>>")
+        piggy.append("|".join(str(n) for n in band_sum))
+        piggy.append("<<<extreme_ap_neighbors:sep(124)>>>")
+        piggy.extend("|".join(str(v) for v in n) for n in neighbors)
+        piggy.append("<<<xiq_radio_information:json>>>")
+        piggy.append(json.dumps({
+            "format": COLUMNAR_FORMAT, "device_id": dev_id, "hostname": host,
+            "radios": radios, "_ssid_freq": ssid_freq,
+        }, **compact))
+        piggy.append("<<<xiq_active_clients:json>>>")
+        piggy.append(json.dumps({
+            "format": COLUMNAR_FORMAT, "device_id": dev_id, "hostname": host,
+            "summary": {"total": sum(band_sum), "band": dict(zip((b for b, _m, _c in BANDS), band_sum)),
+                        "per_ssid": ssid_freq},
+            "clients": columnar_encode(clients),
+        }, **compact))
+        piggy.append("<<<<>>>>")
+        devices[-1] = devices[-1] + (neighbors,)
+
+    for k in range(n_switches):
+        devices.append((900000 + k, f"sw-{k:03d}", f"SW{k}", _mac(rnd), f"10.254.0.{k % 256}",
+                        "SW_5520", "31.7.1.0", "DE / Core", "SWITCH", "XIQ", 1, []))
+
+    out.append("<<<extreme_cloud_iq_rate_limits:sep(124)>>>")
+    out += ["state|OK", "limit|7500", f"remaining|{rnd.randint(1000, 7500)}", "reset_in_seconds|1800",
+            "window_s|3600", "status_code|200"]
+    out.append("<<<extreme_cloud_iq_login>>>")
+    out.append("STATUS:OK CODE:200 RESPONSE:Token valid and data fetched")
+    out.extend(piggy)
+    out.append("<<<extreme_summary:sep(124)>>>")
+    out += [f"access_points|{n_aps}", f"total_clients|{sum(sums)}", f"clients_24|{sums[0]}",
+            f"clients_5|{sums[1]}", f"clients_6|{sums[2]}"]
+    out.append("<<<extreme_device_inventory:sep(124)>>>")
+    out.extend("|".join(str(v) for v in d[:11]) for d in devices)
+    out.append("<<<extreme_device_neighbors:sep(124)>>>")
+    out.extend("|".join(str(v) for v in n) for d in devices for n in d[11])
+    return "\n".join(out) + "\n"
+
+
+@dataclass
+class RawSection:
+    options: list[str]
+    string_table: list[list[str]]
+
+
+def split_agent_output(text: str, main_host: str = "xiq") -> dict[str, dict[str, RawSection]]:
+    """
+    Zerlegt Agent-Ausgabe wie Checkmk: <<<<host>>>> startet Piggyback,
+    <<<<>>>> beendet es, sep(N) bestimmt den Trenner (sonst Whitespace).
+    """
+    hosts: dict[str, dict[str, RawSection]] = {main_host: {}}
+    host = main_host
+    section: RawSection | None = None
+    sep: str | None = None
+
+    for line in text.splitlines():
+        if line.startswith("<<<<") and line.endswith(">>>>"):
+            host = line[4:-4].strip() or main_host
+            hosts.setdefault(host, {})
+            section = None
+            continue
+        if line.startswith("<<<") and line.endswith(">>>"):
+            name, *options = line[3:-3].split(":")
+            section = hosts[host].setdefault(name, RawSection(options, []))
+            sep = None
+            for opt in options:
+                if opt.startswith("sep(") and opt.endswith(")"):
+                    sep = chr(int(opt[4:-1]))
+            continue
+        if section is None or not line.strip():
+            continue
+        if sep is None:
+            section.string_table.append(line.split())
+        elif sep == "\0":
+            section.string_table.append([line])
+        else:
+            section.string_table.append(line.split(sep))
+    return hosts
+
+
+# ---------------------------------------------------------------------------
+# Messung
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Stat:
+    calls: int = 0
+    seconds: float = 0.0
+    peak_bytes: int = 0
+    retained_bytes: int = 0
+    errors: int = 0
+
+
+class Recorder:
+    """Ruft Plugin-Funktionen auf und misst Zeit bzw. Allokationen."""
+
+    def __init__(self, measure_alloc: bool, strict: bool) -> None:
+        self.measure_alloc = measure_alloc
+        self.strict = strict
+        self.stats: dict[str, Stat] = {}
+
+    def call(self, key: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        stat = self.stats.setdefault(key, Stat())
+        stat.calls += 1
+        if self.measure_alloc:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            res = fn(*args, **kwargs)
+            # Generatoren (Discovery/Check/Inventory) vollständig abarbeiten
+            if isinstance(res, types.GeneratorType):
+                res = list(res)
+        except Exception:
+            stat.errors += 1
+            if self.strict:
+                raise
+            res = None
+        stat.seconds += time.perf_counter() - start
+        if self.measure_alloc:
+            current, peak = tracemalloc.get_traced_memory()
+            stat.peak_bytes = max(stat.peak_bytes, peak - base)
+            if key.startswith("parse:"):
+                stat.retained_bytes += max(0, current - base)
+        return res
+
+
+def _section_kwargs(section_names: list[str], parsed: dict[str, Any]) -> dict[str, Any]:
+    if len(section_names) == 1:
+        return {"section": parsed.get(section_names[0])}
+    return {f"section_{n}": parsed.get(n) for n in section_names}
+
+
+def run_host(rec: Recorder, plugins: Plugins, host: str, raw: dict[str, RawSection]) -> None:
+    parsed: dict[str, Any] = {}
+    for name, sec in raw.items():
+        agent_section = plugins.sections.get(name)
+        if agent_section is None:
+            parsed[name] = sec.string_table
+        else:
+            parsed[name] = rec.call(f"parse:{name}", agent_section.parse_function, sec.string_table)
+
+    for plugin in plugins.checks:
+        names = list(getattr(plugin, "sections", None) or [plugin.name])
+        if not any(parsed.get(n) is not None for n in names):
+            continue
+        kwargs = _section_kwargs(names, parsed)
+        services = rec.call(f"discovery:{plugin.name}", plugin.discovery_function, **kwargs) or []
+        params = getattr(plugin, "check_default_parameters", None)
+        for service in services:
+            call_kwargs = dict(kwargs)
+            if "%s" in plugin.service_name:
+                call_kwargs["item"] = service.item
+            if params is not None:
+                call_kwargs["params"] = params
+            _VALUE_STORE_KEY[0] = (host, plugin.name, service.item)
+            rec.call(f"check:{plugin.name}", plugin.check_function, **call_kwargs)
+
+    for plugin in plugins.inventories:
+        names = list(getattr(plugin, "sections", None) or [plugin.name])
+        if not any(parsed.get(n) is not None for n in names):
+            continue
+        kwargs = _section_kwargs(names, parsed)
+        params = getattr(plugin, "inventory_default_parameters", None)
+        if params is not None:
+            kwargs["params"] = params
+        rec.call(f"inventory:{plugin.name}", plugin.inventory_function, **kwargs)
+
+    # Legacy register.inventory_plugin(): eigene parse_function, bei :json-
+    # Sektionen erwartet das Plugin das dekodierte JSON-Objekt.
+    for plugin in plugins.legacy:
+        name = plugin.sections[0]
+        sec = raw.get(name)
+        if sec is None:
+            continue
+        data: Any = sec.string_table
+        if "json" in sec.options:
+            try:
+                data = json.loads("".join("".join(row) for row in sec.string_table))
+            except ValueError:
+                pass
+        section = rec.call(f"parse:{plugin.name} (legacy)", plugin.parse_function, data)
+        kwargs = {"section": section}
+        params = getattr(plugin, "inventory_default_parameters", None)
+        if params is not None:
+            kwargs["params"] = params
+        rec.call(f"inventory:{plugin.name} (legacy)", plugin.inventory_function, **kwargs)
+
+
+def run_fleet(plugins: Plugins, hosts: dict[str, dict[str, RawSection]],
+              repeat: int, measure_alloc: bool, strict: bool) -> dict[str, Stat]:
+    """
+    Zeit: Minimum über 'repeat' Läufe (ohne tracemalloc).
+    Allokationen: ein zusätzlicher Lauf mit tracemalloc.
+    """
+    best: dict[str, Stat] = {}
+    for _ in range(max(1, repeat)):
+        _VALUE_STORES.clear()
+        rec = Recorder(measure_alloc=False, strict=strict)
+        gc.collect()
+        for host, raw in hosts.items():
+            run_host(rec, plugins, host, raw)
+        for key, stat in rec.stats.items():
+            if key not in best or stat.seconds < best[key].seconds:
+                best[key] = stat
+
+    if measure_alloc:
+        _VALUE_STORES.clear()
+        rec = Recorder(measure_alloc=True, strict=strict)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            for host, raw in hosts.items():
+                run_host(rec, plugins, host, raw)
+        finally:
+            tracemalloc.stop()
+        for key, stat in rec.stats.items():
+            best[key].peak_bytes = stat.peak_bytes
+            best[key].retained_bytes = stat.retained_bytes
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Ausgabe / Baseline
+# ---------------------------------------------------------------------------
+
+def print_report(label: str, stats: dict[str, Stat], n_hosts: int) -> None:
+    print(f"\n=== {label}: {n_hosts} Hosts ===")
+    print(f"{'Funktion':<52} {'Aufrufe':>8} {'Gesamt ms':>10} {'us/Aufruf':>10} "
+          f"{'Peak KiB':>9} {'Parsed KiB':>11} {'Fehler':>6}")
+    total = 0.0
+    for key, st in sorted(stats.items(), key=lambda kv: -kv[1].seconds):
+        total += st.seconds
+        per_call = st.seconds / st.calls * 1e6 if st.calls else 0.0
+        retained = f"{st.retained_bytes / 1024:.0f}" if key.startswith("parse:") else "-"
+        print(f"{key:<52} {st.calls:>8} {st.seconds * 1e3:>10.1f} {per_call:>10.1f} "
+              f"{st.peak_bytes / 1024:>9.1f} {retained:>11} {st.errors:>6}")
+    print(f"{'Summe':<52} {'':>8} {total * 1e3:>10.1f}")
+
+
+def compare_baseline(results: dict[str, dict[str, Stat]], baseline: dict[str, Any],
+                     tolerance: float, min_ms: float) -> list[str]:
+    regressions: list[str] = []
+    for label, stats in results.items():
+        base = (baseline.get(label) or {})
+        for key, st in stats.items():
+            old = base.get(key)
+            if old is None:
+                continue
+            new_ms, old_ms = st.seconds * 1e3, float(old["ms"])
+            if new_ms > old_ms * (1 + tolerance) and new_ms - old_ms >= min_ms:
+                regressions.append(f"{label} {key}: {old_ms:.1f} ms -> {new_ms:.1f} ms")
+    return regressions
+
+
+def stats_to_json(results: dict[str, dict[str, Stat]]) -> dict[str, Any]:
+    return {
+        label: {
+            key: {"calls": st.calls, "ms": round(st.seconds * 1e3, 3), "peak_kib": round(st.peak_bytes / 1024, 1),
+                  "parsed_kib": round(st.retained_bytes / 1024, 1), "errors": st.errors}
+            for key, st in stats.items()
+        }
+        for label, stats in results.items()
+    }
+
+
+def apply_param_overrides(plugins: Plugins, overrides: list[str]) -> None:
+    """--param NAME:JSON mischt JSON in die Default-Parameter des Plugins."""
+    for spec in overrides:
+        name, _, raw = spec.partition(":")
+        values = json.loads(raw)
+        for plugin in (*plugins.checks, *plugins.inventories, *plugins.legacy):
+            if plugin.name != name:
+                continue
+            for attr in ("check_default_parameters", "inventory_default_parameters"):
+                if getattr(plugin, attr, None) is not None:
+                    setattr(plugin, attr, {**getattr(plugin, attr), **values})
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Offline-Benchmark für die XIQ Check-/Inventory-Plugins")
+    p.add_argument("--plugin-dir", type=Path, default=DEFAULT_PLUGIN_DIR,
+                   help="Pfad zu .../cmk_addons/plugins/xiq (Default: source-Variante im Repo)")
+    src = p.add_mutually_exclusive_group()
+    src.add_argument("--fleet", default="100,1000",
+                     help="Kommagetrennte Flottengrößen (Anzahl APs) für synthetische Daten")
+    src.add_argument("--agent-output", type=Path, help="Mitgeschnittene agent_xiq-Ausgabe statt Synthetik")
+    p.add_argument("--clients-per-ap", type=int, default=20)
+    p.add_argument("--neighbors-per-ap", type=int, default=2)
+    p.add_argument("--switches", type=int, default=50)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--repeat", type=int, default=3, help="Läufe pro Flotte, gewertet wird das Minimum")
+    p.add_argument("--no-alloc", action="store_true", help="Keine Allokationsmessung (tracemalloc)")
+    p.add_argument("--strict", action="store_true", help="Bei Plugin-Exceptions abbrechen")
+    p.add_argument("--param", action="append", default=[], metavar="PLUGIN:JSON",
+                   help="Parameter eines Plugins überschreiben, z.B. "
+                        "'xiq_inventory_active_clients:{\"mode\": \"weakest_rssi\"}' (mehrfach möglich)")
+    p.add_argument("--json", type=Path, help="Ergebnisse zusätzlich als JSON schreiben")
+    p.add_argument("--save-baseline", type=Path, help="Ergebnisse als Baseline speichern")
+    p.add_argument("--baseline", type=Path, help="Gegen Baseline prüfen, Exit-Code 1 bei Regression")
+    p.add_argument("--tolerance", type=float, default=0.25, help="Erlaubte Verlangsamung (0.25 = +25%%)")
+    p.add_argument("--min-ms", type=float, default=2.0, help="Regressionen unter dieser Differenz ignorieren")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    install_cmk_stub()
+    plugins = load_plugins(args.plugin_dir)
+    apply_param_overrides(plugins, args.param)
+    print(f"Plugins: {len(plugins.sections)} Sektionen, {len(plugins.checks)} Checks, "
+          f"{len(plugins.inventories)} Inventories, {len(plugins.legacy)} Legacy-Inventories")
+
+    if args.agent_output:
+        datasets = {args.agent_output.name: args.agent_output.read_text(encoding="utf-8", errors="replace")}
+    else:
+        datasets = {
+            f"fleet={n}": generate_agent_output(n, args.clients_per_ap, args.neighbors_per_ap,
+                                                args.switches, args.seed)
+            for n in (int(x) for x in args.fleet.split(",") if x.strip())
+        }
+
+    results: dict[str, dict[str, Stat]] = {}
+    for label, text in datasets.items():
+        hosts = split_agent_output(text)
+        results[label] = run_fleet(plugins, hosts, args.repeat, not args.no_alloc, args.strict)
+        print_report(label, results[label], len(hosts))
+
+    if args.json:
+        args.json.write_text(json.dumps(stats_to_json(results), indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(stats_to_json(results), indent=2), encoding="utf-8")
+        print(f"\nBaseline gespeichert: {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_baseline(results, baseline, args.tolerance, args.min_ms)
+        if regressions:
+            print(f"\nREGRESSION (> +{args.tolerance:.0%} gegenüber {args.baseline}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nKeine Regression gegenüber {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
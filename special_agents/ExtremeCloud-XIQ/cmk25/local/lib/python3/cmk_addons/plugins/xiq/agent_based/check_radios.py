@@ -9,10 +9,12 @@
 #   - Thresholds: clients (>= warn/crit) and power (<= warn/crit)
 #   - Perfdata only for clients and power
 #
+# Consumes the parsed section common.RadioInformation (radios indexed by band).
+#
 # Compatible with Checkmk 2.4
 # =============================================================================
 
-from typing import Mapping, Any, Iterable
+from typing import Mapping, Any, Iterable, Optional
 from cmk.agent_based.v2 import (
     CheckPlugin,
     DiscoveryResult,
@@ -23,24 +25,18 @@ from cmk.agent_based.v2 import (
     State,
 )
 
+from .common import BANDS, RadioInformation
+
 # ---------------------------------------------------------------------
 # DISCOVERY – one service per detected band
 # ---------------------------------------------------------------------
-def discover_xiq_radios(section: Mapping[str, Any]) -> DiscoveryResult:
+def discover_xiq_radios(section: Optional[RadioInformation]) -> DiscoveryResult:
     if not section:
         return
 
-    radios = section.get("radios") or section.get("_radios") or []
-    bands = set()
-
-    for r in radios:
-        freq = r.get("frequency")
-        if freq in ("2.4GHz", "5GHz", "6GHz"):
-            bands.add(freq)
-
-    ordering = ("2.4GHz", "5GHz", "6GHz")
-    for band in sorted(bands, key=lambda b: ordering.index(b)):
-        yield Service(item=band)
+    for band in BANDS:
+        if band in section.by_band:
+            yield Service(item=band)
 
 
 # ---------------------------------------------------------------------
@@ -48,7 +44,7 @@ def discover_xiq_radios(section: Mapping[str, Any]) -> DiscoveryResult:
 # ---------------------------------------------------------------------
 def check_xiq_radios(item: str,
                      params: Mapping[str, Any],
-                     section: Mapping[str, Any]) -> Iterable[CheckResult]:
+                     section: Optional[RadioInformation]) -> Iterable[CheckResult]:
 
     if not section:
         yield Result(state=State.UNKNOWN, summary="No radio data")
@@ -60,44 +56,17 @@ def check_xiq_radios(item: str,
     warn_power   = int(params.get("warn_power", 10))
     crit_power   = int(params.get("crit_power", 5))
 
-    ssid_freq = section.get("_ssid_freq", {})
-    radios = section.get("radios") or section.get("_radios") or []
-
     # -----------------------------------------------------------------
-    # Clients per band
+    # Clients per band (summed over all SSIDs by the parser)
     # -----------------------------------------------------------------
-    total_clients = 0
-    for _ssid, band_counts in ssid_freq.items():
-        if isinstance(band_counts, dict):
-            try:
-                total_clients += int(band_counts.get(item, 0))
-            except Exception:
-                pass
+    total_clients = section.band_clients.get(item, 0)
 
     # -----------------------------------------------------------------
     # Channels + TX Power collection (ignore zeros / disabled radios)
     # -----------------------------------------------------------------
-    channels_raw = []
-    powers_raw = []
-
-    for r in radios:
-        if r.get("frequency") == item:
-            ch = r.get("channel_number")
-            if ch not in (None, "", "null"):
-                try:
-                    channels_raw.append(int(ch))
-                except Exception:
-                    pass
-
-            pw = r.get("power")
-            if pw not in (None, "", "null"):
-                try:
-                    powers_raw.append(int(pw))
-                except Exception:
-                    pass
-
-    channels = [c for c in channels_raw if c > 0]
-    powers   = [p for p in powers_raw if p > 0]
+    radios = section.by_band.get(item) or []
+    channels = [r.channel_number for r in radios if r.channel_number > 0]
+    powers   = [r.power for r in radios if r.power > 0]
 
     channels_str = ", ".join(str(c) for c in sorted(set(channels))) if channels else "-"
     powers_str   = ", ".join(str(p) for p in sorted(set(powers)))   if powers   else "-"
@@ -13,9 +13,12 @@
 #   and exposes perfdata for remaining and total API quota. Compatible
 #   with the section <<<<extreme_cloud_iq_rate_limits>>>> provided by
 #   the Special Agent.
+#
+#   If the agent runs with request hedging (--hedge), the optional section
+#   <<<xiq_request_hedging>>> adds the number of sent and won hedges.
 # =============================================================================
 
-from typing import Mapping, Any, Iterable
+from typing import Mapping, Any, Iterable, Optional
 from cmk.agent_based.v2 import (
     CheckPlugin,
     CheckResult,
@@ -30,15 +33,22 @@ from cmk.agent_based.v2 import (
 # ---------------------------------------------------------------------
 # DISCOVERY  create a global service if rate-limit data exists
 # ---------------------------------------------------------------------
-def discover_rate_limits(section: Mapping[str, Any]) -> DiscoveryResult:
-    if section:
+def discover_rate_limits(
+    section_extreme_cloud_iq_rate_limits: Optional[Mapping[str, Any]],
+    section_xiq_request_hedging: Optional[Mapping[str, Any]],
+) -> DiscoveryResult:
+    if section_extreme_cloud_iq_rate_limits:
         yield Service()
 
 
 # ---------------------------------------------------------------------
 # CHECK  evaluate remaining quota, thresholds, and details
 # ---------------------------------------------------------------------
-def check_xiq_rate_limits(section: Mapping[str, Any]) -> Iterable[CheckResult]:
+def check_xiq_rate_limits(
+    section_extreme_cloud_iq_rate_limits: Optional[Mapping[str, Any]],
+    section_xiq_request_hedging: Optional[Mapping[str, Any]],
+) -> Iterable[CheckResult]:
+    section = section_extreme_cloud_iq_rate_limits
     if not section:
         yield Result(state=State.UNKNOWN, summary="No API rate limit data available")
         return
@@ -89,6 +99,15 @@ def check_xiq_rate_limits(section: Mapping[str, Any]) -> Iterable[CheckResult]:
     if window_s > 0:
         details_lines.append(f"- Rate-limit window: {window_s}s")
 
+    hedging = section_xiq_request_hedging or {}
+    if hedging:
+        details_lines.append(
+            f"- Hedged requests: {hedging.get('hedged', 0)} of {hedging.get('requests', 0)} "
+            f"(won {hedging.get('won', 0)}, denied {hedging.get('denied', 0)})"
+        )
+        for endpoint, delay in sorted((hedging.get("delays") or {}).items()):
+            details_lines.append(f"- Hedge delay {endpoint}: {delay:.2f}s")
+
     if details_lines:
         yield Result(
             state=state,
@@ -100,13 +119,17 @@ def check_xiq_rate_limits(section: Mapping[str, Any]) -> Iterable[CheckResult]:
     yield Metric("xiq_api_remaining", rem)
     yield Metric("xiq_api_limit", limit)
 
+    if hedging:
+        yield Metric("xiq_api_hedges_sent", int(hedging.get("hedged", 0)))
+        yield Metric("xiq_api_hedges_won", int(hedging.get("won", 0)))
+
 
 # ---------------------------------------------------------------------
 # REGISTRATION
 # ---------------------------------------------------------------------
 check_plugin_xiq_rate_limits = CheckPlugin(
     name="xiq_rate_limits",
-    sections=["extreme_cloud_iq_rate_limits"],
+    sections=["extreme_cloud_iq_rate_limits", "xiq_request_hedging"],
     service_name="XIQ API Rate Limits",
     discovery_function=discover_rate_limits,
     check_function=check_xiq_rate_limits,
@@ -11,12 +11,14 @@
 #   agent sections (extreme_summary and extreme_device_inventory) to
 #   compute AP counts, client totals, switching infrastructure, and
 #   miscellaneous device counts. Emits perfdata and a consolidated,
-#   human-readable summary.
+#   human-readable summary. Device counts, connectivity, model and firmware
+#   distribution come precomputed with the parsed inventory section
+#   (common.DeviceInventory).
 # =============================================================================
 
 from __future__ import annotations
 
-from typing import Any, List, Optional, Tuple, Mapping, Iterable
+from typing import Any, List, Mapping, Iterable
 from cmk.agent_based.v2 import (
     CheckPlugin,
     CheckResult,
@@ -27,6 +29,8 @@ from cmk.agent_based.v2 import (
     Metric,
 )
 
+from .common import DeviceInventory
+
 # ---------------------------------------------------------------------
 # INT ? SAFE INT CONVERSION
 # ---------------------------------------------------------------------
@@ -46,64 +50,21 @@ def _to_int(x: Any, default: int = 0) -> int:
 
 
 # ---------------------------------------------------------------------
-# COUNT DEVICES BY FUNCTION (AP/SW/MISC)
-# ---------------------------------------------------------------------
-def _count_by_function(inv_rows: Optional[List[List[str]]]) -> Mapping[str, int]:
-    """
-    Count devices by 'device_function' column in the inventory section.
-    AP / SW / MISC + TOTAL.
-    """
-    counts = {"AP": 0, "SW": 0, "MISC": 0, "TOTAL": 0}
-    if not inv_rows:
-        return counts
-
-    for row in inv_rows:
-        dev_fun = (row[8] if len(row) > 8 else "") or ""
-        dev_fun_u = str(dev_fun).upper()
-        if "AP" in dev_fun_u:
-            counts["AP"] += 1
-        elif "SW" in dev_fun_u:
-            counts["SW"] += 1
-        else:
-            counts["MISC"] += 1
-        counts["TOTAL"] += 1
-    return counts
-
-
-# ---------------------------------------------------------------------
-# COUNT CONNECTED / DISCONNECTED APS FROM INVENTORY
+# FIRMWARE SPREAD  distinct versions per device class
 # ---------------------------------------------------------------------
-def _count_ap_connected(inv_rows: Optional[List[List[str]]]) -> Tuple[int, Optional[int]]:
-    """
-    Returns:
-      (connected_APs, disconnected_APs or None if unknown)
-    """
-    if not inv_rows:
-        return 0, None
-
-    ap_total = 0
-    ap_connected = 0
-    any_conn_field = False
-
-    for row in inv_rows:
-        dev_fun = (row[8] if len(row) > 8 else "") or ""
-        if "AP" not in str(dev_fun).upper():
+def _firmware_lines(firmware: Mapping[str, Mapping[str, int]]) -> List[str]:
+    lines: List[str] = []
+    for dev_class, title in (("AP", "AP"), ("SW", "Switch"), ("MISC", "Misc")):
+        versions = firmware.get(dev_class) or {}
+        if not versions:
             continue
-
-        ap_total += 1
-
-        if len(row) > 10:
-            any_conn_field = True
-            val = str(row[10]).strip().upper()
-            if val in ("1", "TRUE", "YES", "Y", "CONNECTED", "ONLINE"):
-                ap_connected += 1
-
-    if ap_total == 0:
-        return 0, None
-    if not any_conn_field:
-        return 0, None
-
-    return ap_connected, ap_total - ap_connected
+        ordered = sorted(versions.items(), key=lambda kv: (-kv[1], kv[0]))
+        lines.append(
+            f"{title} firmware versions: {len(versions)} ("
+            + ", ".join(f"{v}: {n}" for v, n in ordered)
+            + ")"
+        )
+    return lines
 
 
 # ---------------------------------------------------------------------
@@ -161,14 +122,14 @@ def check_xiq_summary(
             )
             break
 
-    # Inventory-based counts
-    inv_counts = _count_by_function(section_extreme_device_inventory)
-    inv_ap_total  = inv_counts.get("AP", 0)
-    inv_sw_total  = inv_counts.get("SW", 0)
-    inv_misc_total = inv_counts.get("MISC", 0)
-    inv_total      = inv_counts.get("TOTAL", 0)
+    # Inventory-based counts (aggregated by the parser)
+    inv: DeviceInventory = section_extreme_device_inventory or DeviceInventory([])
+    inv_ap_total   = inv.by_function["AP"]
+    inv_sw_total   = inv.by_function["SW"]
+    inv_misc_total = inv.by_function["MISC"]
+    inv_total      = inv.by_function["TOTAL"]
 
-    inv_ap_conn, inv_ap_disc = _count_ap_connected(section_extreme_device_inventory)
+    inv_ap_conn, inv_ap_disc = inv.ap_connected, inv.ap_disconnected
 
     # ------------------------------------------------------------------
     # SUMMARY (short)
@@ -183,6 +144,12 @@ def check_xiq_summary(
     yield Metric("xiq_clients_5",  c5)
     yield Metric("xiq_clients_6",  c6)
 
+    # Firmware spread (number of distinct versions per device class)
+    if inv_ap_total:
+        yield Metric("xiq_firmware_versions_ap", len(inv.firmware.get("AP") or {}))
+    if inv_sw_total:
+        yield Metric("xiq_firmware_versions_sw", len(inv.firmware.get("SW") or {}))
+
     # ------------------------------------------------------------------
     # DETAILED OUTPUT
     # ------------------------------------------------------------------
@@ -205,6 +172,11 @@ def check_xiq_summary(
         lines.append(f"Misc devices in XIQ: {inv_misc_total}")
         lines.append(f"Total devices in XIQ: {inv_total}")
 
+    if inv.models:
+        ordered = sorted(inv.models.items(), key=lambda kv: (-kv[1], kv[0]))
+        lines.append("Models: " + ", ".join(f"{m}: {n}" for m, n in ordered))
+    lines.extend(_firmware_lines(inv.firmware))
+
     yield Result(
         state=State.OK,
         notice="XIQ Summary details available in long output",
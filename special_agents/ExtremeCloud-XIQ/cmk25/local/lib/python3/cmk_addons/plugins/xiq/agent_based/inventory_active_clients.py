@@ -13,10 +13,22 @@
 #   MAC, IP, SSID, band, RSSI, SNR, channel, BSSID, OS type, user profile
 #   and connectivity state. Output is stored under inventory path:
 #       extreme.clients
+#
+#   The ruleset "xiq_active_clients_inventory" bounds the table per AP
+#   (summary only, top-N weakest RSSI/SNR, stable sample) and can hash
+#   client MACs. When limited, the node also gets the attributes
+#   clients_total / clients_listed / client_table_mode.
 # =============================================================================
 
-from typing import Mapping, Any, Iterable, Optional, List, Union
-from cmk.agent_based.v2 import InventoryPlugin, TableRow
+from typing import Mapping, Any, Optional, List, Union
+from cmk.agent_based.v2 import Attributes, InventoryPlugin, InventoryResult, TableRow
+
+from .common import (
+    CLIENT_INVENTORY_DEFAULTS,
+    columnar_decode,
+    hash_mac,
+    select_inventory_clients,
+)
 
 
 # ---------------------------------------------------------------------
@@ -46,8 +58,9 @@ def _as_mapping(
 # INVENTORY FUNCTION – enumerate active clients as inventory rows
 # ---------------------------------------------------------------------
 def inventory_xiq_active_clients(
-    section: Optional[Union[Mapping[str, Any], List[List[str]]]]
-) -> Iterable[TableRow]:
+    params: Mapping[str, Any],
+    section: Optional[Union[Mapping[str, Any], List[List[str]]]],
+) -> InventoryResult:
     """
     Expected parsed section structure (from <<<<xiq_active_clients>>>>):
 
@@ -73,8 +86,23 @@ def inventory_xiq_active_clients(
     device_id = data.get("device_id")
     ap_name = _to_str(data.get("hostname"))
 
+    all_clients: List[Mapping[str, Any]] = columnar_decode(data.get("clients"))
+    clients = select_inventory_clients(all_clients, params)
+    hash_macs = bool((params or {}).get("hash_macs"))
+    hash_salt = _to_str((params or {}).get("hash_salt"))
+    mode = (params or {}).get("mode") or "all"
+
+    if mode != "all":
+        yield Attributes(
+            path=["extreme", "clients"],
+            inventory_attributes={
+                "clients_total":     len(all_clients),
+                "clients_listed":    len(clients),
+                "client_table_mode": mode,
+            },
+        )
+
     # Clients: stable order → first by SSID, then by MAC
-    clients: List[Mapping[str, Any]] = data.get("clients") or []
 
     def _client_sort_key(c: Mapping[str, Any]) -> str:
         mac = _to_str(c.get("mac")).lower()
@@ -82,7 +110,10 @@ def inventory_xiq_active_clients(
         return f"{ssid}__{mac}" if (mac or ssid) else "zzz"
 
     for idx, c in enumerate(sorted(clients, key=_client_sort_key)):
-        mac = _to_str(c.get("mac")) or f"idx-{idx}"
+        mac = _to_str(c.get("mac"))
+        if mac and hash_macs:
+            mac = hash_mac(mac, hash_salt)
+        mac = mac or f"idx-{idx}"
 
         yield TableRow(
             path=["extreme", "clients"],
@@ -115,4 +146,6 @@ inventory_plugin_xiq_active_clients = InventoryPlugin(
     name="xiq_inventory_active_clients",
     sections=["xiq_active_clients"],
     inventory_function=inventory_xiq_active_clients,
+    inventory_default_parameters=CLIENT_INVENTORY_DEFAULTS,
+    inventory_ruleset_name="xiq_active_clients_inventory",
 )
\ No newline at end of file
@@ -9,39 +9,34 @@
 #
 # Description:
 #   Checkmk Inventory plugins for ExtremeCloudIQ radio details and BSSIDs.
-#   Consumes the parsed section "xiq_radio_information" and creates
+#   Consumes the parsed section "xiq_radio_information"
+#   (common.RadioInformation) and creates
 #   inventory entries under:
 #     - extreme.ap_radios  (per-radio attributes)
 #     - extreme.ap_bssids  (per-SSID/BSSID tuples with frequency)
 # =============================================================================
 
-from typing import Mapping, Any, Iterable, Optional, List
+from typing import Iterable, Optional
 from cmk.agent_based.v2 import InventoryPlugin, TableRow
 
-from .common import format_mac, _to_int_safe
+from .common import RadioInformation, _to_int_safe
 
 
 # ---------------------------------------------------------------------
 # INVENTORY: AP RADIOS  one row per radio with basic attributes
 # ---------------------------------------------------------------------
 def inventory_xiq_ap_radios(
-    section: Optional[Mapping[str, Any]]
+    section: Optional[RadioInformation]
 ) -> Iterable[TableRow]:
 
     if not section:
         return
 
-    radios = section.get("_radios") or section.get("radios") or []
-    if not isinstance(radios, list):
-        return
-
-    device_id = section.get("device_id") or section.get("_device_id")
-    hostname  = section.get("hostname") or section.get("_hostname", "")
+    device_id = section.device_id
+    hostname  = section.hostname
 
-    for r in radios:
-        radio_name = (r.get("radio_name") or r.get("name") or "").strip()
-        radio_mac  = format_mac(r.get("radio_mac") or r.get("mac_address") or "")
-        frequency  = r.get("frequency", "")
+    for r in section.radios:
+        radio_name = r.name.strip()
         unique_key = f"{device_id}_{radio_name}"
 
         yield TableRow(
@@ -49,12 +44,12 @@ def inventory_xiq_ap_radios(
             key_columns={"radio_key": unique_key},
             inventory_columns={
                 "radio_name":     radio_name,
-                "radio_mac":      radio_mac,
-                "frequency":      frequency,
-                "channel_number": _to_int_safe(r.get("channel_number")),
-                "channel_width":  _to_int_safe(r.get("channel_width")),
-                "mode":           r.get("mode", ""),
-                "power":          _to_int_safe(r.get("power")),
+                "radio_mac":      r.mac,
+                "frequency":      r.frequency,
+                "channel_number": r.channel_number,
+                "channel_width":  _to_int_safe(r.channel_width),
+                "mode":           r.mode,
+                "power":          r.power,
                 "hostname":       hostname,
                 "device_id":      device_id,
             },
@@ -65,59 +60,36 @@ def inventory_xiq_ap_radios(
 # INVENTORY: AP BSSIDs  one row per SSID/BSSID/frequency tuple
 # ---------------------------------------------------------------------
 def inventory_xiq_ap_bssids(
-    section: Optional[Mapping[str, Any]]
+    section: Optional[RadioInformation]
 ) -> Iterable[TableRow]:
 
     if not section:
         return
 
-    radios = section.get("_radios") or section.get("radios") or []
-    if not isinstance(radios, list):
-        return
-
-    device_id = section.get("device_id") or section.get("_device_id")
-    hostname  = section.get("hostname") or section.get("_hostname", "")
-
-    rows: List[Mapping[str, Any]] = []
-
-    for r in radios:
-        freq = r.get("frequency", "")
-        radio_name = (r.get("radio_name") or r.get("name") or "").strip()
-
-        for w in (r.get("wlans") or []):
-            ssid  = (w.get("ssid") or "").strip()
-            bssid = format_mac(w.get("bssid", ""))
+    device_id = section.device_id
+    hostname  = section.hostname
 
-            if not ssid or not bssid:
-                continue
-
-            rows.append({
-                "ssid": ssid,
-                "bssid": bssid,
-                "frequency": freq,
-                "device_id": device_id,
-                "hostname": hostname,
-                "radio_name": radio_name,
-            })
-
-    # stable order for inventory diffs
-    rows.sort(key=lambda e: (e["ssid"], e["frequency"], e["bssid"]))
-
-    for e in rows:
-        unique_key = f"{e['device_id']}_{e['ssid']}_{e['bssid']}"
-
-        yield TableRow(
-            path=["extreme", "ap_bssids"],   # <-- correct inventory path
-            key_columns={"bssid_key": unique_key},
-            inventory_columns={
-                "ssid":       e["ssid"],
-                "bssid":      e["bssid"],
-                "frequency":  e["frequency"],
-                "device_id":  e["device_id"],
-                "hostname":   e["hostname"],
-                "radio_name": e["radio_name"],
-            },
+    # stable order for inventory diffs (SSIDs are pre-sorted by the parser)
+    for ssid in section.ssids:
+        wlans = sorted(
+            (w for w in section.by_ssid.get(ssid) or [] if w.bssid),
+            key=lambda w: (w.frequency, w.bssid),
         )
+        for w in wlans:
+            unique_key = f"{device_id}_{ssid}_{w.bssid}"
+
+            yield TableRow(
+                path=["extreme", "ap_bssids"],   # <-- correct inventory path
+                key_columns={"bssid_key": unique_key},
+                inventory_columns={
+                    "ssid":       ssid,
+                    "bssid":      w.bssid,
+                    "frequency":  w.frequency,
+                    "device_id":  device_id,
+                    "hostname":   hostname,
+                    "radio_name": w.radio_name.strip(),
+                },
+            )
 
 
 # ---------------------------------------------------------------------
@@ -18,12 +18,24 @@
 #       - AP Status            (extreme_ap_status)
 #       - AP Clients           (extreme_ap_clients)
 #       - Rate Limits          (extreme_cloud_iq_rate_limits)
+#       - Request Hedging      (xiq_request_hedging)
 #       - Device Inventory     (extreme_device_inventory)
 #       - Device Neighbors     (extreme_device_neighbors)
 #       - Radio Information    (xiq_radio_information)
 #       - Active Clients       (xiq_active_clients)
 #
 #   All parsers return None ? section skipped (Checkmk default behaviour).
+#
+#   Radio information is parsed into common.RadioInformation (slot-based
+#   radios/WLANs with per-band and per-SSID indexes).
+#
+#   The device-neighbor section is returned indexed by AP hostname with the
+#   rows of each AP already sorted, so the per-AP neighbor services do not
+#   have to scan the whole list on every check.
+#
+#   The JSON sections (radio information, active clients) are accepted in
+#   the legacy record-list form and in the columnar form (format 2, see
+#   common.columnar_encode) emitted by current agent versions.
 # =============================================================================
 
 from typing import Mapping, Any, Optional, List, Dict
@@ -35,7 +47,19 @@ from cmk.agent_based.v2 import (
     StringTable,
 )
 
-from .common import format_mac, _clean_text
+from .common import (
+    format_mac,
+    _clean_text,
+    _to_int_safe,
+    columnar_decode,
+    COLUMNAR_FORMAT,
+    BANDS,
+    DeviceInventory,
+    DeviceRecord,
+    Radio,
+    RadioInformation,
+    Wlan,
+)
 
 
 # ---------------------------------------------------------------------
@@ -258,20 +282,72 @@ def parse_xiq_rate_limits(table: StringTable) -> Optional[Mapping[str, Any]]:
 
 
 # ---------------------------------------------------------------------
-# DEVICE INVENTORY (table rows)
+# REQUEST HEDGING (agent option --hedge)
 # ---------------------------------------------------------------------
-def parse_xiq_device_inventory(table: StringTable) -> List[List[str]]:
-    result: List[List[str]] = []
+def parse_xiq_request_hedging(table: StringTable) -> Optional[Mapping[str, Any]]:
+    if not table:
+        return None
+
+    res: Dict[str, Any] = {"delays": {}}
     for row in table:
-        if len(row) >= 10:
-            result.append(row)
-    return result
+        if len(row) < 2:
+            continue
+        k = row[0].strip().lower()
+        if k == "delay" and len(row) >= 3:
+            try:
+                res["delays"][row[1].strip()] = float(row[2])
+            except ValueError:
+                pass
+            continue
+        if k == "quantile":
+            try:
+                res["quantile"] = float(row[1])
+            except ValueError:
+                pass
+            continue
+        if k in ("requests", "hedged", "won", "denied"):
+            try:
+                res[k] = int(row[1])
+            except ValueError:
+                pass
+
+    return res
+
+
+# ---------------------------------------------------------------------
+# DEVICE INVENTORY (records + aggregates, see common.DeviceInventory)
+# ---------------------------------------------------------------------
+def parse_xiq_device_inventory(table: StringTable) -> DeviceInventory:
+    return DeviceInventory([DeviceRecord(row) for row in table if len(row) >= 10])
 
 
 # ---------------------------------------------------------------------
 # DEVICE NEIGHBORS
 # ---------------------------------------------------------------------
-def parse_xiq_device_neighbors(table: StringTable) -> List[Mapping[str, str]]:
+def _neighbor_sort_key(entry: Mapping[str, str]):
+    # Stable order per AP: local_port, remote_device, remote_port
+    return (
+        entry.get("local_port", "") or "",
+        entry.get("remote_device", "") or entry.get("remote_name", "") or "",
+        entry.get("remote_port", "") or "",
+    )
+
+
+def parse_xiq_device_neighbors(table: StringTable) -> Dict[str, List[Mapping[str, str]]]:
+    """
+    Returns {hostname: [neighbor, ...]} with the neighbors of each AP
+    sorted by local port, remote device and remote port.
+    """
+    result: Dict[str, List[Mapping[str, str]]] = {}
+    for entry in parse_xiq_ap_neighbors(table):
+        result.setdefault(entry["hostname"].strip(), []).append(entry)
+    for rows in result.values():
+        rows.sort(key=_neighbor_sort_key)
+    return result
+
+
+def parse_xiq_ap_neighbors(table: StringTable) -> List[Mapping[str, str]]:
+    """Neighbor rows of a single AP (piggyback section), in agent order."""
     result: List[Mapping[str, str]] = []
     for row in table:
         if len(row) < 9:
@@ -290,10 +366,57 @@ def parse_xiq_device_neighbors(table: StringTable) -> List[Mapping[str, str]]:
     return result
 
 
+# ---------------------------------------------------------------------
+# JSON PAYLOAD VERSION
+# ---------------------------------------------------------------------
+def _is_columnar(data: Mapping[str, Any]) -> bool:
+    try:
+        return int(data.get("format") or 1) >= COLUMNAR_FORMAT
+    except (TypeError, ValueError):
+        return False
+
+
 # ---------------------------------------------------------------------
 # RADIO INFORMATION (JSON, includes WLANs & policy info)
 # ---------------------------------------------------------------------
-def parse_xiq_radio_information(table: StringTable) -> Optional[Mapping[str, Any]]:
+_WLAN_FIELDS = ("ssid", "bssid", "network_policy_name")
+
+
+def _wlan_tuples(block: Any) -> List[tuple]:
+    """(ssid, bssid, policy) per WLAN from a plain or columnar list."""
+    if isinstance(block, Mapping) and "cols" in block:
+        cols = block.get("cols") or []
+        const = block.get("const") or {}
+        pos = [cols.index(n) if n in cols else None for n in _WLAN_FIELDS]
+        dflt = [const.get(n) for n in _WLAN_FIELDS]
+        return [
+            tuple(
+                row[i] if i is not None and i < len(row) else d
+                for i, d in zip(pos, dflt)
+            )
+            for row in block.get("rows") or []
+        ]
+
+    return [
+        (w.get("ssid"), w.get("bssid"), w.get("network_policy_name"))
+        for w in (block or [])
+        if isinstance(w, dict)
+    ]
+
+
+def _radio_band(r: Mapping[str, Any]) -> str:
+    freq = str(r.get("frequency", "")).strip()
+    if freq in BANDS:
+        return freq
+    mode = str(r.get("mode", "")).lower()
+    if "5g" in mode:
+        return "5GHz"
+    if "6g" in mode:
+        return "6GHz"
+    return "2.4GHz"
+
+
+def parse_xiq_radio_information(table: StringTable) -> Optional[RadioInformation]:
     if not table:
         return None
 
@@ -306,50 +429,23 @@ def parse_xiq_radio_information(table: StringTable) -> Optional[Mapping[str, Any
     except Exception:
         return None
 
-    device_id = data.get("device_id")
-    hostname = data.get("hostname") or ""
-    radios_in = data.get("radios") or []
-    ssid_freq_in = data.get("_ssid_freq") or {}
-
-    out: Dict[str, Any] = {}
-    out["_device_id"] = device_id
-    out["_hostname"] = hostname
-    out["_ssid_freq"] = ssid_freq_in
-    out["radios"] = radios_in
-    out["_radios"] = []
-
-    freq_map: Dict[str, List[Dict[str, Any]]] = {"2.4GHz": [], "5GHz": [], "6GHz": []}
-
-    for r in radios_in:
-        freq = str(r.get("frequency", "")).strip()
-        if freq not in ("2.4GHz", "5GHz", "6GHz"):
-            mode = str(r.get("mode", "")).lower()
-            if "5g" in mode:
-                freq = "5GHz"
-            elif "6g" in mode:
-                freq = "6GHz"
-            else:
-                freq = "2.4GHz"
-
-        wlans = r.get("wlans") or []
-        wlans_out = []
-        ssids = []
-        bssids = []
-
-        for w in wlans:
-            ssid = str(w.get("ssid") or "").strip()
-            policy = str(w.get("network_policy_name") or "").strip()
-            bssid = format_mac(str(w.get("bssid") or ""))
-
-            entry = {"ssid": ssid, "bssid": bssid, "policy": policy}
-            wlans_out.append(entry)
-
-            if ssid:
-                ssids.append(ssid)
-            if bssid:
-                bssids.append(bssid)
-            if ssid or bssid:
-                freq_map[freq].append(entry)
+    radios: List[Radio] = []
+    for r in data.get("radios") or []:
+        if not isinstance(r, dict):
+            continue
+        freq = _radio_band(r)
+        radio_name = str(r.get("name") or "")
+
+        wlans = [
+            Wlan(
+                str(ssid or "").strip(),
+                format_mac(str(bssid or "")),
+                str(policy or "").strip(),
+                freq,
+                radio_name,
+            )
+            for ssid, bssid, policy in _wlan_tuples(r.get("wlans"))
+        ]
 
         # Active clients per radio (rare in XIQ)
         client_count = 0
@@ -362,24 +458,24 @@ def parse_xiq_radio_information(table: StringTable) -> Optional[Mapping[str, Any
             except Exception:
                 pass
 
-        out["_radios"].append({
-            "device_id": device_id,
-            "hostname": hostname,
-            "radio_name": str(r.get("name") or ""),
-            "radio_mac": format_mac(str(r.get("mac_address") or "")),
-            "frequency": freq,
-            "channel_number": int(r.get("channel_number") or 0),
-            "channel_width": str(r.get("channel_width") or ""),
-            "mode": str(r.get("mode") or ""),
-            "power": int(r.get("power") or 0),
-            "wlans": wlans_out,
-            "ssid_list": ssids,
-            "bssid_list": bssids,
-            "client_count": client_count,
-        })
-
-    out.update(freq_map)
-    return out
+        radios.append(Radio(
+            radio_name,
+            format_mac(str(r.get("mac_address") or "")),
+            freq,
+            _to_int_safe(r.get("channel_number")),
+            str(r.get("channel_width") or ""),
+            str(r.get("mode") or ""),
+            _to_int_safe(r.get("power")),
+            client_count,
+            wlans,
+        ))
+
+    return RadioInformation(
+        data.get("device_id"),
+        data.get("hostname") or "",
+        radios,
+        data.get("_ssid_freq") or {},
+    )
 
 
 # ---------------------------------------------------------------------
@@ -389,6 +485,7 @@ def parse_xiq_active_clients(table: StringTable) -> Optional[Mapping[str, Any]]:
     """
     Active client parser for <<<<xiq_active_clients>>>>:
     Accepts 1) JSON object, 2) or JSON list (fallback).
+    Columnar client tables (format 2) are expanded to a list of dicts.
     """
     if not table:
         return None
@@ -404,6 +501,8 @@ def parse_xiq_active_clients(table: StringTable) -> Optional[Mapping[str, Any]]:
 
     # preferred: dict
     if isinstance(data, dict):
+        if _is_columnar(data):
+            data = dict(data, clients=columnar_decode(data.get("clients")))
         return data
 
     # fallback: list of clients
@@ -444,6 +543,11 @@ agent_section_xiq_rate_limits = AgentSection(
     parse_function=parse_xiq_rate_limits,
 )
 
+agent_section_xiq_request_hedging = AgentSection(
+    name="xiq_request_hedging",
+    parse_function=parse_xiq_request_hedging,
+)
+
 agent_section_xiq_device_inventory = AgentSection(
     name="extreme_device_inventory",
     parse_function=parse_xiq_device_inventory,
@@ -461,7 +565,7 @@ agent_section_xiq_radios = AgentSection(
 
 agent_section_xiq_ap_neighbors = AgentSection(
     name="extreme_ap_neighbors",
-    parse_function=parse_xiq_device_neighbors,
+    parse_function=parse_xiq_ap_neighbors,
 )
 
 agent_section_xiq_active_clients = AgentSection(
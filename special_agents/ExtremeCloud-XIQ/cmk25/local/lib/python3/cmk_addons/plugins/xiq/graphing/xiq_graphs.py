@@ -10,7 +10,8 @@
 # Description:
 #   Graph definitions for ExtremeCloudIQ (XIQ) using Checkmk Graphing API v1.
 #   Provides graphs for AP counts, client distribution, per-band client totals,
-#   and API remaining quota. Used in dashboards and detailed service graphs.
+#   API remaining quota and firmware-version spread. Used in dashboards and
+#   detailed service graphs.
 # =============================================================================
 
 from cmk.graphing.v1 import graphs, metrics
@@ -51,4 +52,16 @@ graph_xiq_api_remaining = graphs.Graph(
     title=metrics.Title("XIQ: API Calls Remaining"),
     minimal_range=graphs.MinimalRange(0, 1000),
     simple_lines=["xiq_api_remaining"],
+)
+
+
+# ---------------------------------------------------------------------
+# GRAPH 4  Firmware spread (distinct versions per device class)
+# ---------------------------------------------------------------------
+graph_xiq_firmware_versions = graphs.Graph(
+    name="xiq_firmware_versions",
+    title=metrics.Title("XIQ: Firmware versions in use"),
+    minimal_range=graphs.MinimalRange(0, 5),
+    simple_lines=["xiq_firmware_versions_ap", "xiq_firmware_versions_sw"],
+    optional=["xiq_firmware_versions_sw"],
 )
\ No newline at end of file
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Checkmk Rulesets API v1 – XIQ active client inventory
+#
+# Limits the per-AP client table written by the HW/SW inventory:
+#   - all clients (default, unchanged behaviour)
+#   - summary only (client counts, no client rows)
+#   - top-N clients with the weakest RSSI or SNR
+#   - stable sampled subset of N clients
+#   - optional hashing of client MAC addresses (with site-specific salt)
+#
+# Compatible with Checkmk 2.4
+# =============================================================================
+
+from cmk.rulesets.v1 import Title, Help
+from cmk.rulesets.v1.rule_specs import InventoryParameters, Topic
+from cmk.rulesets.v1.form_specs import (
+    Dictionary,
+    DictElement,
+    Integer,
+    BooleanChoice,
+    DefaultValue,
+    SingleChoice,
+    SingleChoiceElement,
+    String,
+)
+
+
+# --------------------------------------------------------------------
+# PARAMETER FORM — defines editable config fields in Setup
+# --------------------------------------------------------------------
+def _parameter_form() -> Dictionary:
+    return Dictionary(
+        title=Title("XIQ active clients inventory"),
+        help_text=Help(
+            "Client MAC addresses change constantly. On large sites a full client "
+            "table per AP lets the inventory history grow quickly and makes delta "
+            "computation expensive. Use these options to keep the client table small "
+            "and stable."
+        ),
+        elements={
+            "mode": DictElement(
+                required=True,
+                parameter_form=SingleChoice(
+                    title=Title("Client table"),
+                    elements=[
+                        SingleChoiceElement(name="all", title=Title("All active clients")),
+                        SingleChoiceElement(name="summary", title=Title("Summary only (no client rows)")),
+                        SingleChoiceElement(name="weakest_rssi", title=Title("Top N clients with weakest RSSI")),
+                        SingleChoiceElement(name="weakest_snr", title=Title("Top N clients with weakest SNR")),
+                        SingleChoiceElement(name="sample", title=Title("Stable sample of N clients")),
+                    ],
+                    prefill=DefaultValue("all"),
+                ),
+            ),
+            "max_clients": DictElement(
+                required=False,
+                parameter_form=Integer(
+                    title=Title("Number of clients per AP (N)"),
+                    help_text=Help(
+                        "Used by the top-N and sample modes. The sample is selected by a "
+                        "hash of the client MAC, so the same clients stay in the table "
+                        "as long as they are connected."
+                    ),
+                    prefill=DefaultValue(10),
+                ),
+            ),
+            "hash_macs": DictElement(
+                required=False,
+                parameter_form=BooleanChoice(
+                    title=Title("Hash client MAC addresses"),
+                    help_text=Help(
+                        "Store a SHA-256 based pseudonym instead of the client MAC address. "
+                        "Without a salt this only gives stable row keys and does not "
+                        "anonymise: once the vendor prefix (OUI) is known, the MAC can be "
+                        "recovered from the hash by brute force."
+                    ),
+                    prefill=DefaultValue(False),
+                ),
+            ),
+            "hash_salt": DictElement(
+                required=False,
+                parameter_form=String(
+                    title=Title("Salt for hashed MAC addresses"),
+                    help_text=Help(
+                        "Site-specific secret mixed into the hash (HMAC-SHA256). Without "
+                        "it the pseudonyms cannot be recomputed from a list of MACs. "
+                        "Changing the salt changes all pseudonyms."
+                    ),
+                    prefill=DefaultValue(""),
+                ),
+            ),
+        },
+    )
+
+
+# --------------------------------------------------------------------
+# RULE REGISTRATION — MUST match inventory_ruleset_name in InventoryPlugin
+# --------------------------------------------------------------------
+rule_spec_xiq_active_clients_inventory = InventoryParameters(
+    name="xiq_active_clients_inventory",
+    title=Title("XIQ active clients inventory"),
+    topic=Topic.NETWORKING,
+    parameter_form=_parameter_form,
+)
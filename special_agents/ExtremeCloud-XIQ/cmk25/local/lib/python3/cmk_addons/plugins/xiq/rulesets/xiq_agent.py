@@ -22,6 +22,7 @@ from cmk.rulesets.v1.form_specs import (
     String,
     BooleanChoice,
     Integer,
+    validators,
 )
 from cmk.rulesets.v1.rule_specs import SpecialAgent, Topic
 
@@ -76,6 +77,27 @@ def _parameter_form_xiq():
                     ),
                 ),
             ),
+            "hedging": DictElement(
+                parameter_form=BooleanChoice(
+                    title=Title("Hedge slow API requests"),
+                    help_text=Help(
+                        "Send a second request for radio information and active clients "
+                        "if the first one is slower than 90% of the recent requests to "
+                        "the same endpoint. The faster answer is used. Hedges are not "
+                        "sent while the API rate limit is nearly used up."
+                    ),
+                    prefill=DefaultValue(False),
+                ),
+            ),
+            "hedge_max_percent": DictElement(
+                parameter_form=Integer(
+                    title=Title("Maximum share of hedged requests (%)"),
+                    prefill=DefaultValue(10),
+                    custom_validate=(
+                        validators.NumberInRange(min_value=0, max_value=100),
+                    ),
+                ),
+            ),
         },
     )
 
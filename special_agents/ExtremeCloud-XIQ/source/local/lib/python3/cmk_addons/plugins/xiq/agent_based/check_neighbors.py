@@ -14,6 +14,7 @@
 #
 #   Consumes the section:
 #       <<<<extreme_device_neighbors>>>>
+#   parsed as {hostname: [neighbor, ...]} with pre-sorted rows per AP.
 #
 #   Expected keys in each entry:
 #       device_id, hostname, host_ip, local_port, management_ip,
@@ -22,7 +23,7 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Mapping, Any, List, Set
+from typing import Iterable, Mapping, Any, List
 from cmk.agent_based.v2 import (
     CheckPlugin,
     CheckResult,
@@ -43,13 +44,9 @@ def discover_xiq_ap_neighbors(section) -> DiscoveryResult:
     if not section:
         return
 
-    seen: Set[str] = set()
-    for entry in section:
-        host = (entry.get("hostname") or "").strip()
-        if not host or host in seen:
-            continue
-        seen.add(host)
-        yield Service(item=host)
+    for host in section:
+        if host:
+            yield Service(item=host)
 
 
 # ---------------------------------------------------------------------
@@ -85,11 +82,8 @@ def check_xiq_ap_neighbors(
         )
         return
 
-    # Filter entries for this AP only
-    rows = [
-        entry for entry in section
-        if ((entry.get("hostname") or "").strip() == item)
-    ]
+    # Entries for this AP only (pre-sorted by the parser)
+    rows = section.get(item) or []
 
     if not rows:
         yield Result(
@@ -121,15 +115,6 @@ def check_xiq_ap_neighbors(
 
     limit = int((params or {}).get("neighbor_limit", 0))  # 0 = unlimited
 
-    # Stable sort: local_port, remote_device, remote_port
-    rows.sort(
-        key=lambda e: (
-            e.get("local_port", "") or "",
-            e.get("remote_device", "") or e.get("remote_name", "") or "",
-            e.get("remote_port", "") or "",
-        )
-    )
-
     # -----------------------------------------------------------------
     # SUMMARY
     # -----------------------------------------------------------------
@@ -10,10 +10,13 @@
 #   - Threshold evaluation: total clients per SSID (warn/crit)
 #   - Perfdata: total + per-band client metrics (Graphing API v1 compatible)
 #
+# The radio section is parsed into common.RadioInformation, which already
+# indexes the WLANs per SSID.
+#
 # Compatible with Checkmk 2.4 (new Check API / agent_based.v2)
 # =============================================================================
 
-from typing import Mapping, Any, Iterable, Optional, Set
+from typing import Mapping, Any, Iterable, Optional
 from cmk.agent_based.v2 import (
     CheckPlugin,
     DiscoveryResult,
@@ -24,21 +27,14 @@ from cmk.agent_based.v2 import (
     Metric,
 )
 
-# If you have a helper to pretty-print MACs, import it here.
-# Otherwise, you can replace 'format_mac' with a no-op or remove it.
-try:
-    from cmk_addons.plugins.xiq.agent_based.common import format_mac
-except Exception:
-    def format_mac(value: str) -> str:
-        # Fallback: return input unmodified if helper is not available.
-        return value or ""
+from .common import RadioInformation
 
 
 # -----------------------------------------------------------------------------
 # DISCOVERY  one service per SSID visible on the AP
 # -----------------------------------------------------------------------------
 def discover_xiq_ssids(
-    section_xiq_radio_information: Optional[Mapping[str, Any]],
+    section_xiq_radio_information: Optional[RadioInformation],
     section_extreme_ap_status: Optional[Mapping[str, Any]],
     section_extreme_ap_clients: Optional[Mapping[str, int]],
 ) -> DiscoveryResult:
@@ -51,28 +47,8 @@ def discover_xiq_ssids(
     if not section_xiq_radio_information:
         return
 
-    ssids: Set[str] = set()
-
-    # 1) SSIDs from summarized active-client frequency map
-    ssid_freq_map = section_xiq_radio_information.get("_ssid_freq") or {}
-    for ssid in ssid_freq_map.keys():
-        if ssid:
-            ssids.add(str(ssid))
-
-    # 2) SSIDs from per-radio WLANs (to also include SSIDs with zero clients)
-    radios = (
-        section_xiq_radio_information.get("radios")
-        or section_xiq_radio_information.get("_radios")
-        or []
-    )
-    for r in radios:
-        for wlan in r.get("wlans", []):
-            name = (wlan.get("ssid") or "").strip()
-            if name:
-                ssids.add(name)
-
-    # Emit one service per SSID (sorted for stability)
-    for ssid in sorted(ssids):
+    # Union of both sources, sorted by the parser
+    for ssid in section_xiq_radio_information.ssids:
         yield Service(item=ssid)
 
 
@@ -82,7 +58,7 @@ def discover_xiq_ssids(
 def check_xiq_ssid_clients(
     item: str,
     params: Mapping[str, Any],
-    section_xiq_radio_information: Optional[Mapping[str, Any]],
+    section_xiq_radio_information: Optional[RadioInformation],
     section_extreme_ap_status: Optional[Mapping[str, Any]],
     section_extreme_ap_clients: Optional[Mapping[str, int]],
 ) -> Iterable[CheckResult]:
@@ -109,12 +85,10 @@ def check_xiq_ssid_clients(
     # -------------------------------------------------------------------------
     # Client counts per band from summary map (_ssid_freq)
     # -------------------------------------------------------------------------
-    ssid_freq_map = section_xiq_radio_information.get("_ssid_freq") or {}
-    raw_counts = ssid_freq_map.get(ssid, {})
-    counts = {
-        "2.4GHz": int(raw_counts.get("2.4GHz", 0) or 0),
-        "5GHz":  int(raw_counts.get("5GHz",  0) or 0),
-        "6GHz":  int(raw_counts.get("6GHz",  0) or 0),
+    counts = section_xiq_radio_information.ssid_freq.get(ssid) or {
+        "2.4GHz": 0,
+        "5GHz":  0,
+        "6GHz":  0,
     }
     total = counts["2.4GHz"] + counts["5GHz"] + counts["6GHz"]
 
@@ -147,30 +121,14 @@ def check_xiq_ssid_clients(
     # -------------------------------------------------------------------------
     # Details: collect BSSIDs and policy per band from per-radio 'wlans'
     # -------------------------------------------------------------------------
-    radios = (
-        section_xiq_radio_information.get("radios")
-        or section_xiq_radio_information.get("_radios")
-        or []
-    )
-
     bssids = {"2.4GHz": "", "5GHz": "", "6GHz": ""}
     policy = ""
 
-    for r in radios:
-        freq = r.get("frequency", "")
-        if freq not in bssids:
-            continue
-
-        for wlan in r.get("wlans", []):
-            if (wlan.get("ssid") or "").strip() == ssid:
-                bssids[freq] = format_mac(wlan.get("bssid", ""))
-                # Use the first policy we find for this SSID
-                if not policy:
-                    policy = (
-                        wlan.get("network_policy_name", "")
-                        or wlan.get("policy", "")
-                        or ""
-                    )
+    for wlan in section_xiq_radio_information.by_ssid.get(ssid) or []:
+        bssids[wlan.frequency] = wlan.bssid
+        # Use the first policy we find for this SSID
+        if not policy:
+            policy = wlan.policy
 
     details = (
         "**Radios**\n"
@@ -200,7 +158,7 @@ check_plugin_xiq_ssid_clients = CheckPlugin(
     name="xiq_ssid_clients",
     service_name="XIQ SSID %s",
     sections=[
-        "xiq_radio_information",  # provides _ssid_freq and per-radio 'wlans'
+        "xiq_radio_information",  # provides ssid_freq and the per-SSID WLAN index
         "extreme_ap_status",      # optional: AP hostname
         "extreme_ap_clients",     # optional: not used directly, but kept for future extension
     ],
@@ -15,7 +15,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterable, List, Set, Tuple
+from typing import Any, Iterable, List, Tuple
 import re
 
 from cmk.agent_based.v2 import (
@@ -28,7 +28,7 @@ from cmk.agent_based.v2 import (
     Metric,
 )
 
-from .common import _shorten_location_to_loc_leaf, _clean_text
+from .common import RadioInformation, _shorten_location_to_loc_leaf, _clean_text
 
 
 # ---------------------------------------------------------------------
@@ -96,15 +96,10 @@ def _neighbors_detailed_lines(nei: Any) -> List[str]:
 # POLICY EXTRACTION
 # ---------------------------------------------------------------------
 def _extract_policies(radio_info: Any) -> List[str]:
-    policies: Set[str] = set()
-    if isinstance(radio_info, dict):
-        for r in radio_info.get("_radios", []) or []:
-            wlans = (r or {}).get("wlans") or []
-            for w in wlans:
-                p = (w or {}).get("policy")
-                if p:
-                    policies.add(str(p).strip())
-    return sorted(policies)
+    # Collected (sorted, unique) by the radio-information parser
+    if isinstance(radio_info, RadioInformation):
+        return radio_info.policies
+    return []
 
 
 # ---------------------------------------------------------------------
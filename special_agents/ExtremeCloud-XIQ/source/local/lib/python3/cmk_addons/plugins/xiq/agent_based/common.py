@@ -11,10 +11,15 @@
 #   Shared utility functions for ExtremeCloudIQ agent-based plugins in Checkmk.
 #   Includes normalization helpers for MAC addresses, text cleaning,
 #   band selection, uptime calculations, integer safety, location parsing,
-#   and connectivity flags.
+#   connectivity flags, the columnar encoding of large JSON sections and
+#   the compact device-inventory and radio-information models, and the
+#   client selection for the bounded active-client inventory.
 # =============================================================================
 
-from typing import Any
+from typing import Any, Dict, List, Mapping, Optional
+import hashlib
+import hmac
+import re
 import time
 
 
@@ -35,6 +40,9 @@ def _clean_text(v: str) -> str:
 # ---------------------------------------------------------------------
 # MAC NORMALIZATION  robust fix-ups for API irregularities
 # ---------------------------------------------------------------------
+_NON_HEX = re.compile(r"[^0-9A-F]")
+
+
 def format_mac(raw: str) -> str:
     """
     Normalize MAC addresses to AA:BB:CC:DD:EE:FF.
@@ -51,11 +59,11 @@ def format_mac(raw: str) -> str:
     if not raw:
         return ""
 
-    cleaned = "".join(c for c in raw.upper() if c in "0123456789ABCDEF")
+    cleaned = _NON_HEX.sub("", raw.upper())
     if len(cleaned) < 12:
         return raw
-    cleaned = cleaned[:12]
-    return ":".join(cleaned[i:i+2] for i in range(0, 12, 2))
+    c = cleaned
+    return f"{c[0:2]}:{c[2:4]}:{c[4:6]}:{c[6:8]}:{c[8:10]}:{c[10:12]}"
 
 
 # ---------------------------------------------------------------------
@@ -201,4 +209,313 @@ def norm_connected(val: Any) -> bool:
     try:
         return bool(int(v))
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+
+# ---------------------------------------------------------------------
+# COLUMNAR ENCODING  compact record lists for large JSON sections
+# ---------------------------------------------------------------------
+# Section payload version that carries record lists in columnar form.
+# Payloads without a "format" key (or format 1) use plain lists of dicts.
+COLUMNAR_FORMAT = 2
+
+_MISSING = object()
+
+
+def columnar_encode(records: List[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Encode a list of flat dicts as:
+
+        {"cols": [...], "const": {...}, "rows": [[...], ...]}
+
+    Column names are written once. Columns that hold the same value in
+    every record (e.g. ap_name/ap_id on a per-AP client list) are moved
+    to "const" and dropped from the rows. Keys missing in a record are
+    written as null.
+    """
+    cols: List[str] = []
+    seen = set()
+    for rec in records:
+        for k in rec:
+            if k not in seen:
+                seen.add(k)
+                cols.append(k)
+
+    const: Dict[str, Any] = {}
+    if records:
+        for k in cols:
+            first = records[0].get(k, _MISSING)
+            if first is _MISSING:
+                continue
+            if all(
+                type(rec.get(k, _MISSING)) is type(first) and rec.get(k) == first
+                for rec in records[1:]
+            ):
+                const[k] = first
+
+    row_cols = [k for k in cols if k not in const]
+    return {
+        "cols": row_cols,
+        "const": const,
+        "rows": [[rec.get(k) for k in row_cols] for rec in records],
+    }
+
+
+def columnar_decode(block: Any) -> List[Dict[str, Any]]:
+    """
+    Inverse of columnar_encode(). Plain lists (legacy payloads) are
+    returned unchanged, anything else yields an empty list.
+    """
+    if isinstance(block, list):
+        return block
+    if not isinstance(block, Mapping):
+        return []
+
+    cols = block.get("cols") or []
+    const = block.get("const") or {}
+    out: List[Dict[str, Any]] = []
+    for row in block.get("rows") or []:
+        rec = dict(const)
+        rec.update(zip(cols, row))
+        out.append(rec)
+    return out
+
+
+# ---------------------------------------------------------------------
+# DEVICE INVENTORY MODEL  parsed extreme_device_inventory
+# ---------------------------------------------------------------------
+def device_class(dev_fun: str) -> str:
+    """Map XIQ device_function to AP / SW / MISC."""
+    dev_fun_u = (dev_fun or "").upper()
+    if "AP" in dev_fun_u:
+        return "AP"
+    if "SW" in dev_fun_u:
+        return "SW"
+    return "MISC"
+
+
+class DeviceRecord:
+    """One row of extreme_device_inventory (connected is None if not sent)."""
+
+    __slots__ = (
+        "dev_id", "hostname", "serial", "mac", "ip", "model", "software",
+        "location_full", "device_function", "managed_by", "connected",
+        "dev_class",
+    )
+
+    def __init__(self, row: List[str]) -> None:
+        (
+            self.dev_id, self.hostname, self.serial, self.mac, self.ip,
+            self.model, self.software, self.location_full,
+            self.device_function, self.managed_by,
+        ) = row[:10]
+        self.device_function = self.device_function.upper()
+        self.connected: Optional[bool] = norm_connected(row[10]) if len(row) > 10 else None
+        self.dev_class = device_class(self.device_function)
+
+
+class DeviceInventory:
+    """
+    Device records plus aggregates computed once at parse time:
+
+      by_function      AP / SW / MISC / TOTAL counts
+      ap_connected     connected APs
+      ap_disconnected  disconnected APs, None if unknown
+      models           {model: count}
+      firmware         {device class: {software version: count}}
+    """
+
+    __slots__ = (
+        "devices", "by_function", "ap_connected", "ap_disconnected",
+        "models", "firmware",
+    )
+
+    def __init__(self, devices: List[DeviceRecord]) -> None:
+        self.devices = devices
+        self.by_function: Dict[str, int] = {"AP": 0, "SW": 0, "MISC": 0, "TOTAL": len(devices)}
+        self.models: Dict[str, int] = {}
+        self.firmware: Dict[str, Dict[str, int]] = {}
+
+        ap_connected = 0
+        any_conn_field = False
+        for dev in devices:
+            self.by_function[dev.dev_class] += 1
+            model = dev.model or "unknown"
+            self.models[model] = self.models.get(model, 0) + 1
+            fw = self.firmware.setdefault(dev.dev_class, {})
+            version = dev.software or "unknown"
+            fw[version] = fw.get(version, 0) + 1
+            if dev.dev_class == "AP" and dev.connected is not None:
+                any_conn_field = True
+                ap_connected += dev.connected
+
+        ap_total = self.by_function["AP"]
+        if ap_total and any_conn_field:
+            self.ap_connected = ap_connected
+            self.ap_disconnected: Optional[int] = ap_total - ap_connected
+        else:
+            self.ap_connected = 0
+            self.ap_disconnected = None
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    def __iter__(self):
+        return iter(self.devices)
+
+
+# ---------------------------------------------------------------------
+# RADIO INFORMATION MODEL  parsed xiq_radio_information
+# ---------------------------------------------------------------------
+BANDS = ("2.4GHz", "5GHz", "6GHz")
+
+
+class Wlan:
+    """One SSID/BSSID on a radio (frequency copied from the radio)."""
+
+    __slots__ = ("ssid", "bssid", "policy", "frequency", "radio_name")
+
+    def __init__(self, ssid: str, bssid: str, policy: str, frequency: str, radio_name: str) -> None:
+        self.ssid = ssid
+        self.bssid = bssid
+        self.policy = policy
+        self.frequency = frequency
+        self.radio_name = radio_name
+
+
+class Radio:
+    """One AP radio with its WLANs."""
+
+    __slots__ = (
+        "name", "mac", "frequency", "channel_number", "channel_width",
+        "mode", "power", "client_count", "wlans",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        mac: str,
+        frequency: str,
+        channel_number: int,
+        channel_width: str,
+        mode: str,
+        power: int,
+        client_count: int,
+        wlans: List[Wlan],
+    ) -> None:
+        self.name = name
+        self.mac = mac
+        self.frequency = frequency
+        self.channel_number = channel_number
+        self.channel_width = channel_width
+        self.mode = mode
+        self.power = power
+        self.client_count = client_count
+        self.wlans = wlans
+
+
+class RadioInformation:
+    """
+    Radios of one AP plus indexes built once at parse time:
+
+      by_band       {band: [Radio]}
+      by_ssid       {ssid: [Wlan]} (radio order)
+      ssid_freq     {ssid: {band: clients}} from the agent
+      band_clients  {band: clients} summed over all SSIDs
+      ssids         sorted SSIDs from ssid_freq and the radio WLANs
+      policies      sorted network policy names
+    """
+
+    __slots__ = (
+        "device_id", "hostname", "radios", "ssid_freq", "by_band", "by_ssid",
+        "band_clients", "ssids", "policies",
+    )
+
+    def __init__(self, device_id: Any, hostname: str, radios: List[Radio], ssid_freq: Mapping[str, Any]) -> None:
+        self.device_id = device_id
+        self.hostname = hostname
+        self.radios = radios
+        self.ssid_freq: Dict[str, Dict[str, int]] = {}
+        self.band_clients: Dict[str, int] = dict.fromkeys(BANDS, 0)
+        for ssid, counts in ssid_freq.items():
+            if not isinstance(counts, Mapping):
+                continue
+            per_band = {band: _to_int_safe(counts.get(band)) for band in BANDS}
+            self.ssid_freq[str(ssid)] = per_band
+            for band, n in per_band.items():
+                self.band_clients[band] += n
+
+        self.by_band: Dict[str, List[Radio]] = {}
+        self.by_ssid: Dict[str, List[Wlan]] = {}
+        policies = set()
+        for radio in radios:
+            self.by_band.setdefault(radio.frequency, []).append(radio)
+            for w in radio.wlans:
+                if w.ssid:
+                    self.by_ssid.setdefault(w.ssid, []).append(w)
+                if w.policy:
+                    policies.add(w.policy)
+
+        self.ssids = sorted(s for s in set(self.ssid_freq).union(self.by_ssid) if s)
+        self.policies = sorted(policies)
+
+
+# ---------------------------------------------------------------------
+# CLIENT INVENTORY LIMITS  ruleset xiq_active_clients_inventory
+# ---------------------------------------------------------------------
+CLIENT_INVENTORY_DEFAULTS: Dict[str, Any] = {
+    "mode": "all",
+    "max_clients": 10,
+    "hash_macs": False,
+    "hash_salt": "",
+}
+
+
+def hash_mac(mac: str, salt: str = "") -> str:
+    """
+    Stable pseudonym for a client MAC (case/format independent).
+
+    Without a salt this is only a stable row key: with a known vendor
+    prefix (OUI) an unsalted hash can be reversed by brute force. With a
+    site-specific salt the HMAC-SHA256 cannot be recomputed without it.
+    """
+    norm = format_mac(mac or "").lower().encode("utf-8")
+    if salt:
+        digest = hmac.new(salt.encode("utf-8"), norm, hashlib.sha256).hexdigest()
+    else:
+        digest = hashlib.sha256(norm).hexdigest()
+    return "h-" + digest[:16]
+
+
+def _client_rank(client: Mapping[str, Any], key: str) -> int:
+    # Missing/0 values are "unknown" and sort behind real measurements
+    v = _to_int_safe(client.get(key))
+    return v if v else 10**6
+
+
+def select_inventory_clients(
+    clients: List[Mapping[str, Any]],
+    params: Optional[Mapping[str, Any]],
+) -> List[Mapping[str, Any]]:
+    """
+    Apply the client-table mode to the decoded client list:
+
+      all           unchanged
+      summary       no clients
+      weakest_rssi  N clients with the lowest RSSI
+      weakest_snr   N clients with the lowest SNR
+      sample        N clients, chosen by MAC hash (stable between runs)
+    """
+    p = dict(CLIENT_INVENTORY_DEFAULTS, **(params or {}))
+    mode = p["mode"]
+    limit = max(0, _to_int_safe(p["max_clients"]))
+
+    if mode == "summary":
+        return []
+    if mode == "weakest_rssi":
+        return sorted(clients, key=lambda c: _client_rank(c, "rssi"))[:limit]
+    if mode == "weakest_snr":
+        return sorted(clients, key=lambda c: _client_rank(c, "snr"))[:limit]
+    if mode == "sample":
+        return sorted(clients, key=lambda c: hash_mac(str(c.get("mac") or "")))[:limit]
+    return list(clients)
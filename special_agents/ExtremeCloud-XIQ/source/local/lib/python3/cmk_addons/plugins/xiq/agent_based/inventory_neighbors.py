@@ -9,8 +9,9 @@
 #
 # Description:
 #   Checkmk Inventory plugin for ExtremeCloudIQ LLDP/CDP neighbors.
-#   Consumes the section "extreme_device_neighbors" (parsed list of dicts)
-#   and writes one inventory row per local-port neighbor under:
+#   Consumes the section "extreme_device_neighbors" (parsed as dict
+#   hostname -> list of neighbor dicts) and writes one inventory row per
+#   local-port neighbor under:
 #       networking.lldp_infos
 # =============================================================================
 
@@ -28,7 +29,7 @@ def inventory_xiq_neighbors(section):
         mac_address, remote_device
     The key uses "<device_id>_<local_port>" for stable uniqueness.
     """
-    for e in section:
+    for e in [e for rows in section.values() for e in rows]:
         key = f"{e.get('device_id', '')}_{e.get('local_port', '')}"
 
         yield TableRow(
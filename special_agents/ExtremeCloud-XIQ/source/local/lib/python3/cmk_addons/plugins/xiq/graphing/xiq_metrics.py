@@ -81,6 +81,20 @@ metric_xiq_clients_6 = metrics.Metric(
     color=color.RED,
 )
 
+metric_xiq_firmware_versions_ap = metrics.Metric(
+    name="xiq_firmware_versions_ap",
+    title=metrics.Title("Firmware versions in use (APs)"),
+    unit=UNIT_COUNTER,
+    color=color.PURPLE,
+)
+
+metric_xiq_firmware_versions_sw = metrics.Metric(
+    name="xiq_firmware_versions_sw",
+    title=metrics.Title("Firmware versions in use (switches)"),
+    unit=UNIT_COUNTER,
+    color=color.BROWN,
+)
+
 # ---------------------------------------------------------------------
 # API RATE LIMIT / REMAINING QUOTA
 # ---------------------------------------------------------------------
@@ -91,6 +105,20 @@ metric_xiq_api_remaining = metrics.Metric(
     color=color.DARK_BLUE,
 )
 
+metric_xiq_api_hedges_sent = metrics.Metric(
+    name="xiq_api_hedges_sent",
+    title=metrics.Title("API hedged requests sent"),
+    unit=UNIT_COUNTER,
+    color=color.ORANGE,
+)
+
+metric_xiq_api_hedges_won = metrics.Metric(
+    name="xiq_api_hedges_won",
+    title=metrics.Title("API hedged requests won"),
+    unit=UNIT_COUNTER,
+    color=color.GREEN,
+)
+
 # ---------------------------------------------------------------------
 # UPTIME METRICS
 # ---------------------------------------------------------------------
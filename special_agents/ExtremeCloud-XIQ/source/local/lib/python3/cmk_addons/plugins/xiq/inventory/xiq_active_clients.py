@@ -10,6 +10,13 @@ from cmk.agent_based.v2 import (
     get_value_store,
 )
 
+from cmk_addons.plugins.xiq.agent_based.common import (
+    CLIENT_INVENTORY_DEFAULTS,
+    columnar_decode,
+    hash_mac,
+    select_inventory_clients,
+)
+
 SECTION_NAME = "xiq_active_clients"
 
 def parse_xiq_active_clients(string_table):
@@ -20,13 +27,16 @@ def parse_xiq_active_clients(string_table):
         return string_table
     return {}
 
-def inventory_xiq_active_clients(section):
+def inventory_xiq_active_clients(params, section):
     """
     Build inventory tree under:
       ExtremeCloudIQ
         Clients (active)
           Summary
           Clients [table rows]
+
+    The client table is limited by the ruleset xiq_active_clients_inventory
+    (same options as the agent_based plugin, see common.select_inventory_clients).
     """
     if not section or not isinstance(section, dict):
         return
@@ -70,14 +80,36 @@ def inventory_xiq_active_clients(section):
             continue
 
     # Clients table (optional, if agent delivered details)
-    clients = section.get("clients") or []
+    # list of dicts (legacy) or columnar table (format 2)
+    # limited by mode (all / summary / weakest_rssi / weakest_snr / sample)
+    all_clients = columnar_decode(section.get("clients"))
+    clients = select_inventory_clients(all_clients, params)
+    hash_macs = bool((params or {}).get("hash_macs"))
+    hash_salt = str((params or {}).get("hash_salt") or "")
+    mode = (params or {}).get("mode") or "all"
+    # same attribute names as agent_based/inventory_active_clients.py
+    if mode != "all":
+        inv.append(
+            Attributes(
+                path=["ExtremeCloudIQ", "Clients (active)", "Summary"],
+                attributes={
+                    "clients_total": len(all_clients),
+                    "clients_listed": len(clients),
+                    "client_table_mode": mode,
+                },
+            )
+        )
+
     for c in clients:
+        mac = c.get("mac") or ""
+        if mac and hash_macs:
+            mac = hash_mac(mac, hash_salt)
         try:
             inv.append(
                 TableRow(
                     path=["ExtremeCloudIQ", "Clients (active)", "Clients"],
                     key_columns={
-                        "mac": c.get("mac") or "",
+                        "mac": mac,
                     },
                     inventory_columns={
                         "hostname": c.get("hostname") or "",
@@ -106,4 +138,6 @@ register.inventory_plugin(
     sections=[SECTION_NAME],
     parse_function=parse_xiq_active_clients,
     inventory_function=inventory_xiq_active_clients,
+    inventory_default_parameters=CLIENT_INVENTORY_DEFAULTS,
+    inventory_ruleset_name="xiq_active_clients_inventory",
 )
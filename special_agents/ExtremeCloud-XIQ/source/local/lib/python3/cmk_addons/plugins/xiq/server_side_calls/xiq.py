@@ -31,6 +31,8 @@ class XIQParams(BaseModel):
     verify_tls: bool = True
     timeout: int = 30
     proxy_url: str | None = None
+    hedging: bool = False
+    hedge_max_percent: int = 10
 
 
 # ---------------------------------------------------------------------
@@ -56,6 +58,9 @@ def _commands(params: XIQParams, host_config: HostConfig) -> Iterator[SpecialAge
     if params.proxy_url:
         args += ["--proxy", params.proxy_url]
 
+    if params.hedging:
+        args += ["--hedge", "--hedge-max-ratio", str(max(0, params.hedge_max_percent) / 100.0)]
+
     yield SpecialAgentCommand(command_arguments=args)
 
 